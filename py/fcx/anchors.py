@@ -0,0 +1,85 @@
+"""Stable document anchors for frame nodes.
+
+anchor(id) = slugify(id) + "-" + sha256(id)[:8]  (readable, collision-resistant)
+
+Anchors are a pure function of the node id, so they are
+- memoized in-process (`stable_anchor`, including pseudo anchors such as
+  `kind:<kind>` and `refs`),
+- computed for a whole frame in one pass (`anchor_table`),
+- persisted per frame in the content-addressed cache, keyed by the frame's
+  sorted node-id set, so edits that do not add/remove/rename nodes reuse them
+  (`anchor_table_cached`).
+
+`ANCHOR_SCHEME` must change whenever the derivation changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from fcx.cache import ContentCache, cache_key
+from fcx.util import sha256_text, stable_json
+
+
+ANCHOR_SCHEME = "slugify-sha256_8@0.1.0"
+
+# Runs of non [a-z0-9] collapse to one "-" (so no "--" can remain).
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+REFS_ANCHOR_ID = "refs"
+
+
+def slugify(s: str) -> str:
+    s = _SLUG_RE.sub("-", s.strip().lower()).strip("-")
+    return s or "x"
+
+
+@lru_cache(maxsize=1 << 16)
+def stable_anchor(node_id: str) -> str:
+    # Anchor should be readable but collision-resistant.
+    return f"{slugify(node_id)}-{hashlib.sha256(node_id.encode('utf-8')).hexdigest()[:8]}"
+
+
+def kind_anchor_id(kind: str) -> str:
+    """Pseudo-anchor id for a synthetic per-kind section."""
+
+    return f"kind:{kind}"
+
+
+def anchor_table(ids: Iterable[str]) -> Dict[str, str]:
+    """Anchors for every id of a frame in one pass, keyed in sorted id order."""
+
+    anchor = stable_anchor
+    return {nid: anchor(nid) for nid in sorted(set(ids))}
+
+
+def anchor_cache(root: Path) -> ContentCache:
+    """The anchors namespace of the cache rooted at `root` (see `fcx.cache.cache_root`)."""
+
+    return ContentCache(root, "anchors")
+
+
+def anchor_table_key(ids: List[str]) -> str:
+    return cache_key({"scheme": ANCHOR_SCHEME, "ids_sha256": sha256_text("\0".join(ids))})
+
+
+def anchor_table_cached(ids: Iterable[str], cache: Optional[ContentCache]) -> Dict[str, str]:
+    """`anchor_table`, persisted per node-id set in `cache` (None: compute only)."""
+
+    sorted_ids = sorted(set(ids))
+    if cache is None:
+        return anchor_table(sorted_ids)
+    key = anchor_table_key(sorted_ids)
+    hit = cache.get(key)
+    if hit is not None:
+        table = json.loads(hit.decode("utf-8"))
+        if isinstance(table, dict) and len(table) == len(sorted_ids):
+            return {nid: table[nid] for nid in sorted_ids}
+    table = anchor_table(sorted_ids)
+    cache.put(key, stable_json(table).encode("utf-8"))
+    return table
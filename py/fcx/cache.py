@@ -0,0 +1,147 @@
+"""Content-addressed build cache and output stamps.
+
+Layout (under the cache root, default `<repo>/out/cache`, override with
+`FCX_CACHE_DIR`):
+- `<namespace>/<key[:2]>/<key>`: immutable blobs addressed by a sha256 key
+- `stamps/<key[:2]>/<key>`: what a tool last wrote for a set of outputs
+- `hashes/index.json`: file sha256s by (path, size, mtime_ns, inode)
+
+Keys are derived from content and tool/format versions only, so a cache
+restored from any earlier run (e.g. CI `actions/cache` with a prefix
+restore key) is always safe to reuse. Writes are atomic.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fcx.util import sha256_file, sha256_text, stable_json, write_bytes_if_changed
+
+
+def cache_root(repo_root: Path) -> Path:
+    env = os.environ.get("FCX_CACHE_DIR")
+    return Path(env) if env else repo_root / "out" / "cache"
+
+
+def cache_key(parts: Dict[str, str]) -> str:
+    """sha256 over the canonical JSON of the key parts."""
+
+    return sha256_text(stable_json(parts))
+
+
+class ContentCache:
+    def __init__(self, root: Path, namespace: str) -> None:
+        self.dir = root / namespace
+
+    def path(self, key: str) -> Path:
+        return self.dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.path(key).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        write_bytes_if_changed(self.path(key), data)
+
+
+def _stamp_key(tool: str, outputs: List[Path]) -> str:
+    return sha256_text(tool + "\0" + "\0".join(sorted(str(p.resolve()) for p in outputs)))
+
+
+def _digest_outputs(outputs: List[Path]) -> Optional[Dict[str, str]]:
+    """Output path -> sha256, or None if any output is missing or unreadable."""
+
+    out: Dict[str, str] = {}
+    for p in outputs:
+        try:
+            out[str(p.resolve())] = sha256_file(p)
+        except OSError:
+            return None
+    return out
+
+
+def is_fresh(root: Path, tool: str, version: str, input_sha256: str, outputs: List[Path]) -> bool:
+    """True if tool@version last produced exactly these outputs from this input.
+
+    Never true while an output is missing.
+    """
+
+    raw = ContentCache(root, "stamps").get(_stamp_key(tool, outputs))
+    if raw is None:
+        return False
+    try:
+        stamp = json.loads(raw.decode("utf-8"))
+    except ValueError:
+        return False
+    if stamp.get("version") != version or stamp.get("input_sha256") != input_sha256:
+        return False
+    digest = _digest_outputs(outputs)
+    return digest is not None and stamp.get("outputs") == digest
+
+
+def record_stamp(root: Path, tool: str, version: str, input_sha256: str, outputs: List[Path]) -> None:
+    """Record that tool@version produced these outputs; nothing is recorded if one is missing."""
+
+    digest = _digest_outputs(outputs)
+    if digest is None:
+        return
+    stamp = {
+        "tool": tool,
+        "version": version,
+        "input_sha256": input_sha256,
+        "outputs": digest,
+    }
+    ContentCache(root, "stamps").put(_stamp_key(tool, outputs), stable_json(stamp).encode("utf-8"))
+
+
+class FileHashCache:
+    """sha256 of files, reused while (path, size, mtime_ns, inode) is unchanged.
+
+    Safe to share between threads. With a cache root, entries are loaded from
+    and saved to `hashes/index.json` (`save()`); without one, it only
+    deduplicates within the process. A stat key from another checkout would
+    have to match size, nanosecond mtime and inode to be reused.
+    """
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.path = root / "hashes" / "index.json" if root is not None else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List] = {}
+        self._dirty = False
+        if self.path is not None:
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = None
+            if isinstance(raw, dict):
+                self._entries = {k: v for k, v in raw.items() if isinstance(v, list) and len(v) == 4}
+
+    def sha256(self, path: Path) -> str:
+        st = path.stat()
+        key = str(path.resolve())
+        stat = [st.st_size, st.st_mtime_ns, st.st_ino]
+        with self._lock:
+            e = self._entries.get(key)
+        if e is not None and e[:3] == stat:
+            return e[3]
+        digest = sha256_file(path)
+        with self._lock:
+            self._entries[key] = stat + [digest]
+            self._dirty = True
+        return digest
+
+    def save(self) -> None:
+        """Persist new entries (dropping files that no longer exist)."""
+
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            live = {k: v for k, v in self._entries.items() if os.path.exists(k)}
+            self._dirty = False
+        write_bytes_if_changed(self.path, stable_json(live).encode("utf-8"))
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import Any, Dict, Optional, Sequence
 
 from fcx import __version__
+from fcx.deps import DEP_KINDS, dependency_graph, query_to_dot
 from fcx.gf0 import load_frame_yaml, validate_gf0_struct
+from fcx.index import open_index
+from fcx.cache import cache_root
 from fcx.kernel import Budget, Kernel, KernelCtx
 from fcx.profiles.specframe_k1 import PROFILE_VALIDATORS, infer_profile
-from fcx.util import read_text, sha256_text, stable_json, write_text_deterministic
+from fcx.resolve import Resolver
+from fcx.structure import cached_structural_digest, structural_digest, structure_cache
+from fcx.util import read_text, semantic_sha256, sha256_bytes, sha256_text, stable_json, write_text_deterministic
+from fcx.validators.anchors import validate_anchors
 from fcx.validators.inline_markup_k1 import validate_inline_markup_k1
 from fcx.validators.pub_tex_inline_v0 import validate_pub_tex_inline_v0
 from fcx.validators.references import validate_references
@@ -22,6 +29,7 @@ def _k_validate_gf0(ctx: KernelCtx, args: Dict[str, Any]):
     violations = validate_gf0_struct(raw, frame_path=str(frame), budget=ctx.budget, meta_depth=0)
     receipts = {
         "input.frame_sha256": sha256_text(read_text(frame)),
+        "input.frame_semantic_sha256": semantic_sha256(raw),
         "kernel": sha256_text("validate_gf0@0.1.0"),
     }
     out = {
@@ -37,7 +45,11 @@ def _k_validate_frame(ctx: KernelCtx, args: Dict[str, Any]):
 
     v = validate_gf0_struct(raw, frame_path=str(frame), budget=ctx.budget, meta_depth=0)
     if v:
-        return {"phase": "gf0"}, v, [], {"input.frame_sha256": sha256_text(read_text(frame))}
+        receipts = {
+            "input.frame_sha256": sha256_text(read_text(frame)),
+            "input.frame_semantic_sha256": semantic_sha256(raw),
+        }
+        return {"phase": "gf0"}, v, [], receipts
 
     profile = infer_profile(raw)
     pv = PROFILE_VALIDATORS.get(profile)
@@ -46,9 +58,13 @@ def _k_validate_frame(ctx: KernelCtx, args: Dict[str, Any]):
 
     receipts = {
         "input.frame_sha256": sha256_text(read_text(frame)),
+        "input.frame_semantic_sha256": semantic_sha256(raw),
         "kernel": sha256_text("validate_frame@0.1.0"),
         "profile": profile,
     }
+    digest = structural_digest(raw)
+    if digest is not None:
+        receipts["structure.root"] = digest.root
     out = {
         "graph_id": raw.get("graph_id") if isinstance(raw, dict) else "",
         "version": raw.get("version") if isinstance(raw, dict) else "",
@@ -57,6 +73,25 @@ def _k_validate_frame(ctx: KernelCtx, args: Dict[str, Any]):
     return out, v, [], receipts
 
 
+def _k_structural_digest(ctx: KernelCtx, args: Dict[str, Any]):
+    frame = Path(args["frame"])
+    src = frame.read_bytes()
+    cache = None if args.get("no_cache") else structure_cache(cache_root(Path(ctx.repo_root)))
+    digest, raw = cached_structural_digest(src, cache)
+    if raw is None:
+        raw = load_frame_yaml(frame)
+    receipts = {
+        "input.frame_sha256": sha256_bytes(src),
+        "input.frame_semantic_sha256": semantic_sha256(raw),
+        "kernel": sha256_text("structural_digest@0.1.0"),
+    }
+    if digest is None:
+        v = [Violation(code="FCX.E.NOT_MAPPING", path=str(frame), message="frame is not a YAML mapping")]
+        return {}, v, [], receipts
+    receipts["structure.root"] = digest.root
+    return digest.to_obj(), [], [], receipts
+
+
 def _k_validate_inline_markup(ctx: KernelCtx, args: Dict[str, Any]):
     v, w = validate_inline_markup_k1(ctx)
     receipts = {"kernel": sha256_text("validate_inline_markup@0.1.0")}
@@ -75,6 +110,12 @@ def _k_validate_references(ctx: KernelCtx, args: Dict[str, Any]):
     return {}, v, w, receipts
 
 
+def _k_validate_anchors(ctx: KernelCtx, args: Dict[str, Any]):
+    v, w = validate_anchors(ctx, strict=bool(args.get("strict")))
+    receipts = {"kernel": sha256_text("validate_anchors@0.1.0")}
+    return {}, v, w, receipts
+
+
 def _k_gate_enforce_repo_law(ctx: KernelCtx, args: Dict[str, Any]):
     v, w = gate_enforce_repo_law(ctx)
     receipts = {"kernel": sha256_text("gate_enforce_repo_law@0.1.0")}
@@ -84,9 +125,11 @@ def _k_gate_enforce_repo_law(ctx: KernelCtx, args: Dict[str, Any]):
 KERNELS: Dict[str, Kernel] = {
     "validate_gf0": Kernel(kid="validate_gf0", version="0.1.0", run=_k_validate_gf0),
     "validate_frame": Kernel(kid="validate_frame", version="0.1.0", run=_k_validate_frame),
+    "structural_digest": Kernel(kid="structural_digest", version="0.1.0", run=_k_structural_digest),
     "validate_inline_markup": Kernel(kid="validate_inline_markup", version="0.1.0", run=_k_validate_inline_markup),
     "validate_pub_tex": Kernel(kid="validate_pub_tex", version="0.1.0", run=_k_validate_pub_tex),
     "validate_references": Kernel(kid="validate_references", version="0.1.0", run=_k_validate_references),
+    "validate_anchors": Kernel(kid="validate_anchors", version="0.1.0", run=_k_validate_anchors),
     "gate_enforce_repo_law": Kernel(kid="gate_enforce_repo_law", version="0.1.0", run=_k_gate_enforce_repo_law),
 }
 
@@ -108,6 +151,74 @@ def run_kernel(ctx: KernelCtx, kernel_id: str, args: Dict[str, Any]) -> Report:
     return rep
 
 
+def _deps_query(args: argparse.Namespace) -> int:
+    """`fcx deps` / `fcx rdeps`: transitive (reverse) dependencies of one graph_id."""
+
+    with open_index(Path(args.repo_root), use_cache=not args.no_cache) as idx:
+        graph = dependency_graph(idx)
+    if args.graph_id not in graph:
+        print(f"fcx {args.cmd}: unknown graph_id: {args.graph_id}", file=sys.stderr)
+        return 1
+
+    result = graph.query(args.graph_id, reverse=args.cmd == "rdeps", max_depth=args.depth)
+    payload = query_to_dot(result) if args.dot else stable_json(result)
+    if args.out:
+        write_text_deterministic(Path(args.out), payload)
+    else:
+        print(payload, end="")
+    return 0
+
+
+def _build_order(args: argparse.Namespace) -> int:
+    """`fcx build-order`: cross-frame dependency cycles and build waves (exit 1 on cycles with --strict)."""
+
+    with open_index(Path(args.repo_root), use_cache=not args.no_cache) as idx:
+        graph = dependency_graph(idx)
+    result = graph.build_order(args.kind or None)
+
+    text = stable_json(result)
+    if args.out:
+        write_text_deterministic(Path(args.out), text)
+    else:
+        print(text, end="")
+    for c in result["cycles"]:
+        print(f"fcx build-order: cycle: {' -> '.join(c['cycle'] + c['cycle'][:1])}", file=sys.stderr)
+    return 1 if args.strict and result["cycles"] else 0
+
+
+def _resolve_refs(args: argparse.Namespace) -> int:
+    """`fcx resolve`: resolve `graph_id[@spec]` references against the corpus.
+
+    With --ref, prints each resolution (exit 1 if any is unresolved or
+    invalid); without, prints every corpus dependency reference that is not
+    `ok` (external targets included), sorted by (frame, kind, ref).
+    """
+
+    with open_index(Path(args.repo_root), use_cache=not args.no_cache) as idx:
+        resolver = Resolver.from_index(idx)
+        corpus_refs = [] if args.ref else sorted(set(idx.refs_of_kinds(DEP_KINDS)))
+
+    if args.ref:
+        results = [resolver.resolve(r) for r in args.ref]
+        payload: Dict[str, Any] = {"resolutions": [r.to_obj() for r in results]}
+        rc = 1 if any(r.status in ("unresolved", "invalid") for r in results) else 0
+    else:
+        problems = []
+        for path, kind, ref in corpus_refs:
+            res = resolver.resolve(ref)
+            if res.status != "ok":
+                problems.append({"frame": path, "kind": kind, **res.to_obj()})
+        payload = {"references": len(corpus_refs), "problems": problems}
+        rc = 0
+
+    text = stable_json(payload)
+    if args.out:
+        write_text_deterministic(Path(args.out), text)
+    else:
+        print(text, end="")
+    return rc
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     ap = argparse.ArgumentParser(prog="fcx", description="framecodex tool-of-tools (kernelized)")
     ap.add_argument("--repo-root", default=str(Path(".").resolve()))
@@ -122,28 +233,67 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     vfr = sub.add_parser("validate-frame")
     vfr.add_argument("--frame", required=True)
 
+    dig = sub.add_parser("digest", help="structural (Merkle) digest of a frame")
+    dig.add_argument("--frame", required=True)
+    dig.add_argument("--no-cache", action="store_true", help="do not read or write the digest cache")
+
     vim = sub.add_parser("validate-inline-markup")
     
     vpt = sub.add_parser("validate-pub-tex")
     
     vref = sub.add_parser("validate-references")
 
+    vanc = sub.add_parser("validate-anchors")
+    vanc.add_argument("--strict", action="store_true", help="corpus-wide duplicate anchors are violations")
+
     glaw = sub.add_parser("gate-enforce-repo-law")
 
+    for name, what in (("deps", "what a graph_id depends on"), ("rdeps", "what depends on a graph_id")):
+        dq = sub.add_parser(name, help=f"{what}, transitively (JSON or DOT)")
+        dq.add_argument("--graph-id", required=True)
+        dq.add_argument("--depth", type=int, default=None, help="stop after N hops (default: full closure)")
+        dq.add_argument("--dot", action="store_true", help="emit Graphviz DOT instead of JSON")
+        dq.add_argument("--no-cache", action="store_true", help="build the frame index in memory")
+
+    bo = sub.add_parser("build-order", help="cross-frame dependency cycles and build waves (JSON)")
+    bo.add_argument(
+        "--kind", action="append", default=[], choices=sorted(set(DEP_KINDS.values())),
+        help="only follow these dependency kinds (repeatable; default: all)",
+    )
+    bo.add_argument("--strict", action="store_true", help="exit 1 if frames depend on each other in a cycle")
+    bo.add_argument("--no-cache", action="store_true", help="build the frame index in memory")
+
+    res = sub.add_parser("resolve", help="resolve graph_id[@version|range] references (JSON)")
+    res.add_argument("--ref", action="append", default=[], help="reference to resolve (repeatable; default: whole corpus)")
+    res.add_argument("--no-cache", action="store_true", help="build the frame index in memory")
+
     args = ap.parse_args(list(argv) if argv is not None else None)
 
+    if args.cmd in ("deps", "rdeps"):
+        if args.depth is not None and args.depth < 0:
+            ap.error("--depth must be >= 0")
+        return _deps_query(args)
+    if args.cmd == "build-order":
+        return _build_order(args)
+    if args.cmd == "resolve":
+        return _resolve_refs(args)
+
     ctx = KernelCtx(repo_root=args.repo_root, budget=Budget(max_meta_depth=args.max_meta_depth), gamma={})
 
     if args.cmd == "validate-gf0":
         rep = run_kernel(ctx, "validate_gf0", {"frame": args.frame})
     elif args.cmd == "validate-frame":
         rep = run_kernel(ctx, "validate_frame", {"frame": args.frame})
+    elif args.cmd == "digest":
+        rep = run_kernel(ctx, "structural_digest", {"frame": args.frame, "no_cache": args.no_cache})
     elif args.cmd == "validate-inline-markup":
         rep = run_kernel(ctx, "validate_inline_markup", {})
     elif args.cmd == "validate-pub-tex":
         rep = run_kernel(ctx, "validate_pub_tex", {})
     elif args.cmd == "validate-references":
         rep = run_kernel(ctx, "validate_references", {})
+    elif args.cmd == "validate-anchors":
+        rep = run_kernel(ctx, "validate_anchors", {"strict": args.strict})
     elif args.cmd == "gate-enforce-repo-law":
         rep = run_kernel(ctx, "gate_enforce_repo_law", {})
     else:
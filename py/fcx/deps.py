@@ -0,0 +1,186 @@
+"""Corpus dependency graph between frames, at graph_id level.
+
+A frame depends on a graph_id when it names it through
+- `depends_on` (frame `attrs`, or `properties` as read by validate_references)
+- the frame-level `target_graph_id`
+- a `spec_ref` node's `target_graph_id`
+- a `refers_to` edge (to a FrameURL, or to a `spec_ref` node)
+
+References come from the corpus index (`fcx.index`), so building the graph
+only parses frames whose bytes changed since the last run. Targets without
+a frame in the repo stay in the graph as external nodes (no frames).
+Version pins (`<graph_id>@<spec>`, see `fcx.resolve`) are dropped: the graph
+is between graph_ids.
+
+`fcx deps` / `fcx rdeps` print `DepGraph.query` as stable JSON or DOT;
+`fcx build-order` prints `DepGraph.build_order`: every dependency cycle
+between frames (strongly connected components, `fcx.graph`) and the frames
+in dependency waves for render and publication schedules.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fcx.graph import component_levels, is_cyclic, shortest_cycle, strongly_connected_components
+from fcx.index import FrameIndex
+from fcx.resolve import split_ref
+
+
+# Index reference kind -> dependency edge label.
+DEP_KINDS = {
+    "depends_on": "depends_on",
+    "attr.depends_on": "depends_on",
+    "target_graph_id": "target_graph_id",
+    "spec_ref": "spec_ref",
+    "refers_to": "refers_to",
+}
+
+
+class DepGraph:
+    def __init__(self, frames: Dict[str, List[str]], edges: Dict[Tuple[str, str], Set[str]]) -> None:
+        self.frames = frames  # graph_id -> frame paths (empty for external targets)
+        self.forward: Dict[str, Dict[str, List[str]]] = {}
+        self.reverse: Dict[str, Dict[str, List[str]]] = {}
+        for (src, dst), kinds in sorted(edges.items()):
+            self.forward.setdefault(src, {})[dst] = sorted(kinds)
+            self.reverse.setdefault(dst, {})[src] = sorted(kinds)
+
+    def __contains__(self, graph_id: str) -> bool:
+        return graph_id in self.frames or graph_id in self.forward or graph_id in self.reverse
+
+    def closure(self, graph_id: str, *, reverse: bool = False, max_depth: Optional[int] = None) -> Dict[str, int]:
+        """graph_id -> BFS depth of everything reachable (start at depth 0)."""
+
+        adj = self.reverse if reverse else self.forward
+        depth = {graph_id: 0}
+        queue = deque([graph_id])
+        while queue:
+            cur = queue.popleft()
+            d = depth[cur]
+            if max_depth is not None and d >= max_depth:
+                continue
+            for nxt in adj.get(cur, {}):
+                if nxt not in depth:
+                    depth[nxt] = d + 1
+                    queue.append(nxt)
+        return depth
+
+    def query(self, graph_id: str, *, reverse: bool = False, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Transitive (reverse) dependencies of graph_id with the edges among them.
+
+        Edges always point from dependent to dependency; nodes are sorted by
+        (depth, graph_id), edges by (from, to).
+        """
+
+        depth = self.closure(graph_id, reverse=reverse, max_depth=max_depth)
+        nodes = [
+            {"graph_id": g, "depth": d, "frames": self.frames.get(g, [])}
+            for g, d in sorted(depth.items(), key=lambda kv: (kv[1], kv[0]))
+        ]
+        edges = [
+            {"from": src, "to": dst, "kinds": kinds}
+            for src in sorted(depth)
+            for dst, kinds in self.forward.get(src, {}).items()
+            if dst in depth
+        ]
+        return {
+            "query": {"graph_id": graph_id, "direction": "rdeps" if reverse else "deps", "max_depth": max_depth},
+            "nodes": nodes,
+            "edges": edges,
+        }
+
+    def build_order(self, kinds: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Dependency cycles and build waves among the repo's frames.
+
+        Only edges of `kinds` (edge labels of DEP_KINDS; default all) between
+        graph_ids with frames count. Each cycle is a strongly connected
+        component: its graph_ids, the edges inside it and a shortest cycle
+        through its first graph_id. Wave 0 holds frames depending on no
+        other frame, wave k+1 frames whose dependencies are all in waves <= k;
+        members of a cycle share one wave. Everything is sorted, so the result
+        depends only on the corpus.
+        """
+
+        want = set(DEP_KINDS.values()) if kinds is None else set(kinds)
+        nodes = sorted(self.frames)
+        adj: Dict[str, List[str]] = {}
+        for src in nodes:
+            adj[src] = [
+                dst
+                for dst, ks in self.forward.get(src, {}).items()
+                if dst in self.frames and want.intersection(ks)
+            ]
+
+        comps = strongly_connected_components(nodes, adj)
+        levels = component_levels(comps, adj)
+
+        cycles: List[Dict[str, Any]] = []
+        cycle_of: Dict[str, int] = {}
+        for comp in sorted((sorted(c) for c in comps if is_cyclic(c, adj)), key=lambda c: c[0]):
+            members = set(comp)
+            for g in comp:
+                cycle_of[g] = len(cycles)
+            cycles.append(
+                {
+                    "graph_ids": comp,
+                    "cycle": shortest_cycle(comp[0], adj, members),
+                    "edges": [
+                        {"from": src, "to": dst, "kinds": sorted(want.intersection(self.forward[src][dst]))}
+                        for src in comp
+                        for dst in adj[src]
+                        if dst in members
+                    ],
+                }
+            )
+
+        waves: List[List[Dict[str, Any]]] = [[] for _ in range(max(levels, default=-1) + 1)]
+        for comp, lvl in zip(comps, levels):
+            for g in comp:
+                waves[lvl].append({"graph_id": g, "frames": self.frames[g], "cycle": cycle_of.get(g)})
+        for wave in waves:
+            wave.sort(key=lambda e: e["graph_id"])
+        return {"kinds": sorted(want), "cycles": cycles, "waves": waves}
+
+
+def dependency_graph(idx: FrameIndex) -> DepGraph:
+    """The dependency graph of an (already refreshed) index."""
+
+    gid_of: Dict[str, str] = {}
+    frames: Dict[str, List[str]] = {}
+    for rec in idx.records():
+        if rec.status == "ok" and rec.graph_id:
+            gid_of[rec.path] = rec.graph_id
+            frames.setdefault(rec.graph_id, []).append(rec.path)
+
+    edges: Dict[Tuple[str, str], Set[str]] = {}
+    for path, kind, ref in idx.refs_of_kinds(DEP_KINDS):
+        src = gid_of.get(path)
+        ref = split_ref(ref)[0]
+        if src is None or ref == src:
+            continue
+        edges.setdefault((src, ref), set()).add(DEP_KINDS[kind])
+    return DepGraph(frames, edges)
+
+
+def _dot_id(s: str) -> str:
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def query_to_dot(result: Dict[str, Any]) -> str:
+    """Graphviz DOT of a `DepGraph.query` result (external nodes dashed)."""
+
+    q = result["query"]
+    lines = [f"digraph {_dot_id(q['direction'] + ':' + q['graph_id'])} {{", "  rankdir=LR;"]
+    for n in result["nodes"]:
+        attrs = [f"label={_dot_id(n['graph_id'])}"]
+        if n["depth"] == 0:
+            attrs.append("penwidth=2")
+        if not n["frames"]:
+            attrs.append("style=dashed")
+        lines.append(f"  {_dot_id(n['graph_id'])} [{', '.join(attrs)}];")
+    for e in result["edges"]:
+        lines.append(f"  {_dot_id(e['from'])} -> {_dot_id(e['to'])} [label={_dot_id(','.join(e['kinds']))}];")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
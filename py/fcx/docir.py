@@ -0,0 +1,763 @@
+"""DocIR: deterministic linear IR for human-doc projections of GF0/SpecFrame frames.
+
+DocIR is a linear intermediate representation intended for human-doc projections.
+Target renderers (Markdown/LaTeX/plaintext) are pure printers over DocIR
+(see `fcx.render`).
+
+Determinism:
+- stable ordering (order -> id)
+- no timestamps
+- stable anchor derivation (`fcx.anchors`)
+
+This supports the SpecFrame-ish subset used in this repo. The InlineMarkup-K1
+and PubTeX parsers are imported from `tools.markup` (repo root on sys.path).
+
+CLI: `tools/render_docir/run`.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+
+from fcx.anchors import REFS_ANCHOR_ID, anchor_cache, anchor_table_cached, kind_anchor_id
+from fcx.anchors import slugify, stable_anchor  # noqa: F401  (re-exported)
+from fcx.cache import ContentCache, cache_key
+from fcx.util import semantic_sha256, sha256_bytes
+
+
+# Bump whenever to_docir output changes for the same frame; keys the DocIR cache.
+DOCIR_VERSION = "0.2.0"
+
+# InlineMarkup-K1 (deterministic tiny markup subset)
+try:
+    from tools.markup.inline_markup_k1 import PARSER_VERSION as INLINE_MARKUP_VERSION  # type: ignore
+    from tools.markup.inline_markup_k1 import markup_json_default, parse_compact as parse_inline_markup  # type: ignore
+except Exception:  # pragma: no cover
+    parse_inline_markup = None  # type: ignore
+    markup_json_default = None  # type: ignore
+    INLINE_MARKUP_VERSION = "unavailable"
+
+# PubTeX authoring shortcut (tex-inline-v0 -> pub-tex-inline-v0 IR)
+try:
+    from tools.markup.pub_tex_inline_v0 import PARSER_VERSION as PUB_TEX_VERSION  # type: ignore
+    from tools.markup.pub_tex_inline_v0 import parse_tex_inline_v0, to_ir as pub_tex_to_ir  # type: ignore
+except Exception:  # pragma: no cover
+    parse_tex_inline_v0 = None  # type: ignore
+    pub_tex_to_ir = None  # type: ignore
+    PUB_TEX_VERSION = "unavailable"
+
+
+def read_bytes(p: Path) -> bytes:
+    return p.read_bytes()
+
+
+def norm_text(s: str) -> str:
+    # Preserve newlines as paragraph boundaries; normalize CRLF.
+    s = s.replace("\r\n", "\n").replace("\r", "\n")
+    # Trim trailing whitespace per line.
+    s = "\n".join(ln.rstrip() for ln in s.split("\n"))
+    return s.strip("\n")
+
+
+def find_attr(attrs: Any, key: str) -> Optional[str]:
+    if not isinstance(attrs, list):
+        return None
+    for a in attrs:
+        if isinstance(a, dict) and a.get("key") == key:
+            v = a.get("value")
+            return v if isinstance(v, str) else None
+    return None
+
+
+def find_attr_json(attrs: Any, key: str) -> Optional[Any]:
+    v = find_attr(attrs, key)
+    if v is None:
+        return None
+    try:
+        return json.loads(v)
+    except Exception:
+        return None
+
+
+def find_attr_json_strict(attrs: Any, key: str) -> Optional[Any]:
+    """Parse JSON from an attr value. Returns None on any failure."""
+
+    v = find_attr(attrs, key)
+    if v is None:
+        return None
+    try:
+        return json.loads(v)
+    except Exception:
+        return None
+
+
+@dataclass(frozen=True)
+class Node:
+    id: str
+    kind: str
+    status: str
+    title: Optional[str] = None
+    label: Optional[str] = None
+    order: Optional[int] = None
+    text: Optional[str] = None
+    summary: Optional[str] = None
+    symbols: Optional[List[Dict[str, str]]] = None
+    attrs: Optional[List[Dict[str, Any]]] = None
+    target: Optional[str] = None  # for reference nodes
+
+
+def parse_nodes(g: Dict[str, Any]) -> Dict[str, Node]:
+    out: Dict[str, Node] = {}
+    for raw in g.get("nodes", []):
+        if not isinstance(raw, dict) or "id" not in raw:
+            continue
+        out[str(raw["id"])] = Node(
+            id=str(raw["id"]),
+            kind=str(raw.get("kind", "")),
+            status=str(raw.get("status", "")),
+            title=raw.get("title"),
+            label=raw.get("label"),
+            order=raw.get("order"),
+            text=raw.get("text"),
+            summary=raw.get("summary"),
+            symbols=raw.get("symbols"),
+            attrs=raw.get("attrs"),
+            target=raw.get("target"),
+        )
+    return out
+
+
+def edges_of_type(edges: Any, edge_type: str) -> List[Dict[str, Any]]:
+    if not isinstance(edges, list):
+        return []
+    out = [e for e in edges if isinstance(e, dict) and e.get("type") == edge_type]
+    # stable
+    out.sort(key=lambda e: (str(e.get("from", "")), str(e.get("to", "")), str(e.get("type", ""))))
+    return out
+
+
+def contains_children(edges: List[Dict[str, Any]], parent_id: str) -> List[str]:
+    kids = [str(e.get("to")) for e in edges if e.get("from") == parent_id]
+    # stable order by (node.order, node.id) applied later
+    return sorted(set(kids))
+
+
+_KIND_PRECEDENCE = {
+    "section": 10,
+    "term": 20,
+    "clause": 30,
+    "property": 40,
+    "example": 50,
+    "spec_ref": 60,
+}
+
+
+def kind_rank(kind: str) -> int:
+    return _KIND_PRECEDENCE.get(kind, 999)
+
+
+def _node_sort_key(nodes: Dict[str, Node]) -> Callable[[str], Tuple[int, int, str]]:
+    def key(nid: str) -> Tuple[int, int, str]:
+        n = nodes.get(nid)
+        if n is None:
+            return (999, 10**9, nid)
+        order = n.order if isinstance(n.order, int) else 10**9
+        return (kind_rank(n.kind), order, n.id)
+
+    return key
+
+
+def stable_node_sort(nodes: Dict[str, Node], ids: List[str]) -> List[str]:
+    return sorted(ids, key=_node_sort_key(nodes))
+
+
+def build_spine(g: Dict[str, Any], nodes: Dict[str, Node]) -> Tuple[str, Dict[str, List[str]]]:
+    """Return (root_id, children_map) for the spine.
+
+    Prefer explicit `contains` edges: children_map maps each parent to its
+    children in `stable_node_sort` order, built once per frame in one pass over
+    the edges. If no `contains` edges exist, children_map is empty and the
+    spine is synthesized with pseudo-sections by node kind.
+    """
+
+    root_id = str(g.get("graph_id") or "")
+    if not root_id or root_id not in nodes:
+        raise SystemExit(f"Root node not found: {root_id}")
+
+    children_map: Dict[str, List[str]] = {}
+    edges = g.get("edges")
+    for e in edges if isinstance(edges, list) else []:
+        if isinstance(e, dict) and e.get("type") == "contains":
+            children_map.setdefault(str(e.get("from")), []).append(str(e.get("to")))
+    key = _node_sort_key(nodes)
+    for kids in children_map.values():
+        kids.sort(key=key)
+    return root_id, children_map
+
+
+def to_markup(value: str, *, text_format: str) -> Optional[Any]:
+    """Parse value into MarkupIR if enabled.
+
+    Returns a compact MarkupIR document (`MarkupDoc`), or None if parsing is
+    unavailable. Renderers walk it directly; `dump_docir` projects it to the
+    JSON MarkupIR shape, with parsing errors embedded as `errors` for
+    downstream validation/reporting.
+    """
+
+    if parse_inline_markup is None:
+        return None
+    return parse_inline_markup(value, mode=text_format)
+
+
+def _pub_tex_inline_from_node(n: Node, *, field: str) -> Optional[Dict[str, Any]]:
+    """Return publication TeX inline IR attached to a node.
+
+    Supported forms:
+
+    (A) Canonical JSON IR (preferred storage):
+      - attr key: `pub.tex.<field>` where field in {"summary","text","body"}
+      - value: JSON encoding of {"kind":"pub-tex-inline-v0","nodes":[...]}
+
+    (B) Authoring shortcut (compiled deterministically at render time):
+      - attr key: `pub.tex.<field>.format` == "tex-inline-v0"
+      - attr key: `pub.tex.<field>` is a string containing typed segments:
+          {{m:...}} for math, {{c:...}} for code, everything else is text.
+        Escapes: \\{{ and \\}} for literal delimiters.
+
+    We do not deeply validate here; gates + renderer validate further.
+    """
+
+    if not n.attrs:
+        return None
+
+    k = f"pub.tex.{field}"
+
+    # (A) canonical JSON form
+    v = find_attr_json_strict(n.attrs, k)
+    if isinstance(v, dict) and v.get("kind") == "pub-tex-inline-v0":
+        return v
+
+    # (B) authoring shortcut
+    fmt = find_attr(n.attrs, f"pub.tex.{field}.format")
+    if fmt != "tex-inline-v0":
+        return None
+
+    if parse_tex_inline_v0 is None or pub_tex_to_ir is None:
+        raise SystemExit("PubTeX tex-inline-v0 parsing unavailable (import failed)")
+
+    raw = find_attr(n.attrs, k)
+    if raw is None:
+        raise SystemExit(f"Missing required attr: {k} (pub.tex.{field}.format=tex-inline-v0)")
+
+    nodes, errs = parse_tex_inline_v0(raw)
+    if errs:
+        # Fail hard with deterministic error text.
+        head = errs[0]
+        raise SystemExit(f"pub.tex.{field} parse error {head.code} at pos {head.pos}: {head.message} (node={n.id})")
+
+    return pub_tex_to_ir(nodes)  # kind=pub-tex-inline-v0
+
+
+def anchor_ids(g: Dict[str, Any], nodes: Dict[str, Node]) -> List[str]:
+    """Every id the DocIR of this frame derives an anchor from, sorted.
+
+    Node ids plus the pseudo ids of synthetic headings: `kind:<kind>` (frames
+    without `contains` edges) and `refs` (frames with spec_ref nodes).
+    """
+
+    root_id = str(g.get("graph_id") or "")
+    ids = set(nodes.keys())
+    edges = g.get("edges")
+    synthetic = not any(isinstance(e, dict) and e.get("type") == "contains" for e in (edges if isinstance(edges, list) else ()))
+    for nid, n in nodes.items():
+        if n.kind == "spec_ref":
+            ids.add(REFS_ANCHOR_ID)
+        elif synthetic and nid != root_id:
+            ids.add(kind_anchor_id(n.kind or "other"))
+    return sorted(ids)
+
+
+def iter_docir_records(
+    g: Dict[str, Any], src_bytes: bytes, *, anchors_cache: Optional[ContentCache] = None
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream DocIR as records: ("front", head), ("block", b) per block, ("back", tail).
+
+    Blocks are produced lazily by the spine walk, so consumers that print or
+    write each block as it arrives never hold the whole block list.
+    The frame's anchor table (node and pseudo anchors) is computed in one
+    batch, or read from `anchors_cache` when the node-id set is unchanged.
+    """
+
+    nodes = parse_nodes(g)
+    root_id, children_map = build_spine(g, nodes)
+    root = nodes[root_id]
+
+    # Deterministic lookup table for raw node mappings (needed for fields not
+    # included in the Node dataclass, e.g. spec_ref.target_graph_id).
+    raw_nodes_list = g.get("nodes") if isinstance(g.get("nodes"), list) else []
+    raw_nodes: Dict[str, Dict[str, Any]] = {
+        str(r.get("id")): r for r in raw_nodes_list if isinstance(r, dict) and isinstance(r.get("id"), str)
+    }
+
+    table = anchor_table_cached(anchor_ids(g, nodes), anchors_cache)
+    anchors: Dict[str, str] = {nid: table[nid] for nid in sorted(nodes.keys())}
+
+    front = {
+        "graph_id": root_id,
+        "frame_version": str(g.get("version") or ""),
+        "title": root.title or root_id,
+        "authors": find_attr_json(root.attrs, "doc.authors") or [],
+        "created": find_attr(root.attrs, "doc.created") or "",
+        "updated": find_attr(root.attrs, "doc.updated") or "",
+        "license": find_attr(root.attrs, "doc.license") or "",
+        "profile": str(root.profile) if hasattr(root, "profile") else "",
+    }
+
+    yield "front", {"docir_version": DOCIR_VERSION, "front_matter": front, "sha256": sha256_bytes(src_bytes)}
+    for b in _iter_blocks(g, nodes, root_id, children_map, table, front, raw_nodes):
+        yield "block", b
+    yield "back", {"anchors": anchors}
+
+
+def _spine_block(n: Node, depth: int, anchors: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """The DocIR block of a spine node at `depth` (None for kinds without one)."""
+
+    # Determine desired text.format for this node.
+    # Defaults are conservative: inline for summaries, block for clause.text.
+    node_fmt = find_attr(n.attrs, "text.format") or "plain"
+
+    if n.kind == "section":
+        return {
+            "type": "heading",
+            "level": min(6, depth + 1),
+            "title": n.title or n.label or n.id,
+            "anchor": anchors[n.id],
+            "text_format": node_fmt,
+        }
+    elif n.kind == "title":
+        # Title nodes are typically already represented by the root heading; preserve as a subheading
+        # only when explicitly included in the contains spine.
+        return {
+            "type": "heading",
+            "level": min(6, depth + 1),
+            "title": n.text or n.title or n.label or n.id,
+            "anchor": anchors[n.id],
+            "text_format": node_fmt,
+        }
+    elif n.kind == "paragraph":
+        body = norm_text(n.text or "")
+        fmt = node_fmt if node_fmt != "plain" else "md-block"
+        pub_tex = _pub_tex_inline_from_node(n, field="text")
+        return {
+            "type": "paragraph",
+            "anchor": anchors[n.id],
+            "text_format": fmt,
+            "text": body,
+            "body_markup": to_markup(body, text_format=fmt) if body else None,
+            "pub_tex_inline": pub_tex,
+        }
+    elif n.kind == "reference":
+        # Render references as a simple paragraph link line.
+        label = n.label or n.title or n.id
+        target = n.target or ""
+        body = f"{label}: {target}" if target else label
+        return {
+            "type": "paragraph",
+            "anchor": anchors[n.id],
+            "text_format": "md-inline",
+            "text": body,
+            "body_markup": to_markup(body, text_format="md-inline") if body else None,
+        }
+    elif n.kind == "term":
+        body = norm_text(n.summary or "")
+        pub_tex = _pub_tex_inline_from_node(n, field="summary")
+        return {
+            "type": "definition",
+            "label": n.label or n.id,
+            "status": n.status,
+            "anchor": anchors[n.id],
+            "text_format": node_fmt or "plain",
+            "body": body,
+            "body_markup": to_markup(body, text_format=node_fmt or "plain") if body else None,
+            "pub_tex_inline": pub_tex,
+        }
+    elif n.kind == "clause":
+        body = norm_text(n.text or "")
+        # Default clauses to md-block unless explicit override.
+        fmt = node_fmt if node_fmt != "plain" else "md-block"
+        pub_tex = _pub_tex_inline_from_node(n, field="text")
+        return {
+            "type": "clause",
+            "label": n.label or n.id,
+            "status": n.status,
+            "anchor": anchors[n.id],
+            "text_format": fmt,
+            "body": body,
+            "body_markup": (to_markup(body, text_format=fmt) if (body and fmt.startswith("md-")) else None),
+            "pub_tex_inline": pub_tex,
+        }
+    elif n.kind == "property":
+        return {
+            "type": "property",
+            "label": n.label or n.id,
+            "status": n.status,
+            "anchor": anchors[n.id],
+            "text_format": node_fmt,
+            "symbols": n.symbols or [],
+        }
+    # spec_ref is folded into references section
+    return None
+
+
+def _walk_spine(
+    nodes: Dict[str, Node], root_id: str, children_map: Dict[str, List[str]], anchors: Dict[str, str]
+) -> Iterator[Dict[str, Any]]:
+    """Pre-order walk of the `contains` spine below the root, with an explicit stack.
+
+    Depth is bounded only by memory (no recursion limit). Nodes reachable via
+    several parents are emitted once per path; a cycle raises SystemExit.
+    """
+
+    # (node id, iterator over its sorted children, depth); path holds the ids on the stack.
+    stack: List[Tuple[str, Iterator[str], int]] = [(root_id, iter(children_map.get(root_id, ())), 0)]
+    path = {root_id}
+    while stack:
+        nid, kids, depth = stack[-1]
+        kid = next(kids, None)
+        if kid is None:
+            stack.pop()
+            path.discard(nid)
+            continue
+        if kid in path:
+            raise SystemExit(f"contains cycle through node: {kid}")
+        n = nodes.get(kid)
+        if n is None:
+            continue
+        b = _spine_block(n, depth + 1, anchors)
+        if b is not None:
+            yield b
+        stack.append((kid, iter(children_map.get(kid, ())), depth + 1))
+        path.add(kid)
+
+
+def _iter_blocks(
+    g: Dict[str, Any],
+    nodes: Dict[str, Node],
+    root_id: str,
+    children_map: Dict[str, List[str]],
+    anchors: Dict[str, str],
+    front: Dict[str, Any],
+    raw_nodes: Dict[str, Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    # References from spec_ref nodes
+    refs: List[Dict[str, str]] = []
+    for n in sorted(nodes.values(), key=lambda x: (x.kind, x.label or "", x.id)):
+        if n.kind != "spec_ref":
+            continue
+        label = n.label or n.id
+        target = ""
+        # spec_ref in current frames uses `target_graph_id` on node.
+        # The Node model used by this tool does not currently include it, so we
+        # read it from the raw mapping deterministically.
+        raw = raw_nodes.get(n.id) if isinstance(raw_nodes, dict) else None
+        if isinstance(raw, dict):
+            tgid = raw.get("target_graph_id")
+            if isinstance(tgid, str):
+                target = tgid
+        refs.append({"label": label, "target": target})
+
+    # Emit title heading
+    yield {"type": "heading", "level": 1, "title": front["title"], "anchor": anchors[root_id]}
+
+    if children_map:
+        yield from _walk_spine(nodes, root_id, children_map, anchors)
+    else:
+        # Synthetic spine: emit grouped sections by kind
+        groups: Dict[str, List[str]] = {}
+        for nid, n in nodes.items():
+            if nid == root_id:
+                continue
+            if n.kind == "spec_ref":
+                continue
+            groups.setdefault(n.kind or "other", []).append(nid)
+
+        for kind in sorted(groups.keys(), key=lambda k: (kind_rank(k), k)):
+            yield {
+                "type": "heading",
+                "level": 2,
+                "title": f"{kind}" if kind != "other" else "Other",
+                "anchor": anchors[kind_anchor_id(kind)],
+            }
+            for nid in stable_node_sort(nodes, groups[kind]):
+                n = nodes[nid]
+                node_fmt = find_attr(n.attrs, "text.format") or "plain"
+                if n.kind == "term":
+                    body = norm_text(n.summary or "")
+                    yield {
+                        "type": "definition",
+                        "label": n.label or n.id,
+                        "status": n.status,
+                        "anchor": anchors[n.id],
+                        "text_format": node_fmt or "plain",
+                        "body": body,
+                        "body_markup": (to_markup(body, text_format=node_fmt or "plain") if (body and (node_fmt or "plain").startswith("md-")) else None),
+                    }
+                elif n.kind == "clause":
+                    body = norm_text(n.text or "")
+                    fmt = node_fmt if node_fmt != "plain" else "md-block"
+                    yield {
+                        "type": "clause",
+                        "label": n.label or n.id,
+                        "status": n.status,
+                        "anchor": anchors[n.id],
+                        "text_format": fmt,
+                        "body": body,
+                        "body_markup": (to_markup(body, text_format=fmt) if (body and fmt.startswith("md-")) else None),
+                    }
+                elif n.kind == "paragraph":
+                    body = norm_text(n.text or "")
+                    fmt = node_fmt if node_fmt != "plain" else "md-block"
+                    yield {
+                        "type": "paragraph",
+                        "anchor": anchors[n.id],
+                        "text_format": fmt,
+                        "text": body,
+                        "body_markup": (to_markup(body, text_format=fmt) if (body and fmt.startswith("md-")) else None),
+                    }
+                elif n.kind == "reference":
+                    label = n.label or n.title or n.id
+                    target = n.target or ""
+                    body = f"{label}: {target}" if target else label
+                    yield {
+                        "type": "paragraph",
+                        "anchor": anchors[n.id],
+                        "text_format": "md-inline",
+                        "text": body,
+                        "body_markup": to_markup(body, text_format="md-inline") if body else None,
+                    }
+                elif n.kind == "title":
+                    yield {
+                        "type": "heading",
+                        "level": 3,
+                        "title": n.text or n.title or n.label or n.id,
+                        "anchor": anchors[n.id],
+                        "text_format": node_fmt,
+                    }
+                elif n.kind == "property":
+                    yield {
+                        "type": "property",
+                        "label": n.label or n.id,
+                        "status": n.status,
+                        "anchor": anchors[n.id],
+                        "text_format": node_fmt,
+                        "symbols": n.symbols or [],
+                    }
+                else:
+                    yield {
+                        "type": "note",
+                        "kind": "unhandled-node",
+                        "anchor": anchors[n.id],
+                        "text": f"{n.kind} {n.id}",
+                    }
+
+    # Back matter: references + graph appendix-ish
+    if refs:
+        yield {"type": "heading", "level": 2, "title": "References", "anchor": anchors[REFS_ANCHOR_ID]}
+        for r in refs:
+            label = (r.get("label") or "").strip()
+            target = (r.get("target") or "").strip()
+            text = f"{label} ({target})" if target else label
+            if text:
+                yield {"type": "list_item", "text": text}
+
+
+def docir_from_records(records: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Assemble streamed records into the single-document DocIR mapping."""
+
+    docir: Dict[str, Any] = {}
+    blocks: List[Dict[str, Any]] = []
+    for tag, rec in records:
+        if tag == "block":
+            blocks.append(rec)
+        else:
+            docir.update(rec)
+    docir["blocks"] = blocks
+    return docir
+
+
+def to_docir(
+    g: Dict[str, Any], src_bytes: bytes, *, anchors_cache: Optional[ContentCache] = None
+) -> Dict[str, Any]:
+    return docir_from_records(iter_docir_records(g, src_bytes, anchors_cache=anchors_cache))
+
+
+def dump_docir(docir: Dict[str, Any]) -> str:
+    """Serialize DocIR to its canonical JSON text (compact MarkupIR included)."""
+
+    return json.dumps(docir, indent=2, sort_keys=True, default=markup_json_default) + "\n"
+
+
+# -------------------------
+# Streaming DocIR (JSON Lines)
+# -------------------------
+#
+# One record per line, each a single-key object:
+#   {"front": {"docir_version", "front_matter", "sha256"}}
+#   {"block": {...}}            (one per block, in document order)
+#   {"back": {"anchors": {...}}}
+# Lines are compact, key-sorted JSON; assembling the records yields exactly
+# the mapping serialized by `dump_docir`.
+
+
+def dump_docir_record(tag: str, rec: Dict[str, Any]) -> str:
+    return json.dumps({tag: rec}, sort_keys=True, separators=(",", ":"), default=markup_json_default) + "\n"
+
+
+def write_docir_jsonl(records: Iterable[Tuple[str, Dict[str, Any]]], fh: IO[str]) -> None:
+    for tag, rec in records:
+        fh.write(dump_docir_record(tag, rec))
+
+
+def read_docir_jsonl(fh: IO[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Parse a DocIR JSON Lines stream lazily into (tag, record) pairs."""
+
+    for lineno, line in enumerate(fh, start=1):
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        if not isinstance(obj, dict) or len(obj) != 1:
+            raise ValueError(f"DocIR JSONL line {lineno}: expected a single-key record")
+        (tag, rec), = obj.items()
+        if tag not in ("front", "block", "back"):
+            raise ValueError(f"DocIR JSONL line {lineno}: unknown record {tag!r}")
+        yield tag, rec
+
+
+def split_docir_records(
+    records: Iterable[Tuple[str, Dict[str, Any]]]
+) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """Return (front record, lazy block iterator); the front record must come first."""
+
+    it = iter(records)
+    tag, front = next(it, ("", {}))
+    if tag != "front":
+        raise ValueError("DocIR stream must start with a front record")
+
+    def blocks() -> Iterator[Dict[str, Any]]:
+        for tag, rec in it:
+            if tag == "block":
+                yield rec
+
+    return front, blocks()
+
+
+def load_frame(src: bytes) -> Dict[str, Any]:
+    """Parse frame YAML bytes; the frame must be a mapping."""
+
+    g = yaml.safe_load(src.decode("utf-8"))
+    if not isinstance(g, dict):
+        raise SystemExit("Input frame must be a YAML mapping")
+    return g
+
+
+def frame_to_docir(path: Path) -> Dict[str, Any]:
+    """Read a frame.yml and build its DocIR."""
+
+    src = read_bytes(path)
+    return to_docir(load_frame(src), src)
+
+
+# -------------------------
+# Content-addressed DocIR cache
+# -------------------------
+
+
+def docir_cache_key(src_bytes: bytes) -> str:
+    """Cache key: (frame sha256, DocIR version, InlineMarkup-K1 / PubTeX parser versions)."""
+
+    return cache_key(
+        {
+            "frame_sha256": sha256_bytes(src_bytes),
+            "docir_version": DOCIR_VERSION,
+            "inline_markup_k1": INLINE_MARKUP_VERSION,
+            "pub_tex_inline_v0": PUB_TEX_VERSION,
+        }
+    )
+
+
+def docir_semantic_cache_key(g: Dict[str, Any]) -> str:
+    """Cache key: (semantic sha256 of the parsed frame, DocIR version, parser versions)."""
+
+    return cache_key(
+        {
+            "frame_semantic_sha256": semantic_sha256(g),
+            "docir_version": DOCIR_VERSION,
+            "inline_markup_k1": INLINE_MARKUP_VERSION,
+            "pub_tex_inline_v0": PUB_TEX_VERSION,
+        }
+    )
+
+
+def with_frame_sha256(docir_text: str, sha: str) -> str:
+    """Canonical DocIR text with its `sha256` (frame bytes) replaced by `sha`."""
+
+    docir = json.loads(docir_text)
+    if docir.get("sha256") == sha:
+        return docir_text
+    docir["sha256"] = sha
+    return dump_docir(docir)
+
+
+def docir_cache(root: Path) -> ContentCache:
+    """The DocIR namespace of the cache rooted at `root` (see `fcx.cache.cache_root`)."""
+
+    return ContentCache(root, "docir")
+
+
+def cached_docir_text(
+    src_bytes: bytes,
+    cache: Optional[ContentCache],
+    *,
+    g: Optional[Dict[str, Any]] = None,
+    semantic: bool = False,
+) -> Tuple[str, bool]:
+    """Canonical DocIR JSON text for frame bytes, via the cache. Returns (text, hit).
+
+    `g` may pass the already-parsed frame to avoid a second YAML load on a miss.
+    On a miss the anchor table comes from the sibling `anchors` namespace, so
+    edits that keep the node-id set reuse it.
+
+    With `semantic`, a byte-key miss falls back to the semantic key
+    (`docir_semantic_cache_key`): a reformatted frame (whitespace, comments,
+    quoting, key order) reuses the cached DocIR with only its `sha256`
+    rewritten. This costs a YAML parse per byte-key miss.
+    """
+
+    key = docir_cache_key(src_bytes)
+    sem_key = None
+    anchors = None
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit.decode("utf-8"), True
+        if semantic:
+            if g is None:
+                g = load_frame(src_bytes)
+            sem_key = docir_semantic_cache_key(g)
+            hit = cache.get(sem_key)
+            if hit is not None:
+                text = with_frame_sha256(hit.decode("utf-8"), sha256_bytes(src_bytes))
+                cache.put(key, text.encode("utf-8"))
+                return text, True
+        anchors = anchor_cache(cache.dir.parent)
+    text = dump_docir(to_docir(g if g is not None else load_frame(src_bytes), src_bytes, anchors_cache=anchors))
+    if cache is not None:
+        cache.put(key, text.encode("utf-8"))
+        if sem_key is not None:
+            cache.put(sem_key, text.encode("utf-8"))
+    return text, False
@@ -0,0 +1,193 @@
+"""Shared text escaping for the TeX and Markdown printers.
+
+How each escaper is built:
+- Per-character specials tables are compiled once at import time by
+  `compile_escaper` into an ordered plan of
+  `str.replace` calls, ordered so that no replacement is re-escaped by a
+  later step. When no such order exists, as with the TeX backslash and
+  braces, the text is split on the backslash and joined back with its
+  replacement. Each step is a C-level scan, which is much faster than a
+  per-character dict lookup.
+- Escapers that were already `str.replace` chains (`tex_escape_doc`,
+  `md_escape`) stay unrolled.
+- The Unicode glyph table is a `str.translate` table. Pure-ASCII text is
+  returned unchanged without being scanned.
+
+`str.translate` is not used for the specials. CPython translates
+multi-character replacements one character at a time, which measured slower
+than the code it would replace (see `tools/bench_escape/run`).
+
+Variants (byte-for-byte equal to the implementations they replaced; checked
+by `tools/bench_escape/run`):
+- `tex_escape`: LaTeX specials (InlineMarkup-K1 LaTeX, PubTeX printer)
+- `tex_escape_doc`: generic LaTeX printer; its chained `.replace` escaped the
+  braces of `\\textbackslash{}`, which is kept for stable output
+- `tex_escape_keep_math`: `tools/render_latex_spec`; leaves `$` alone
+- `md_escape`: Markdown printer
+- `normalize_tex_unicode`: Unicode math glyphs -> TeX macros
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List, Tuple
+
+
+TEX_SPECIALS: Dict[str, str] = {
+    "\\": r"\textbackslash{}",
+    "{": r"\{",
+    "}": r"\}",
+    "$": r"\$",
+    "&": r"\&",
+    "#": r"\#",
+    "%": r"\%",
+    "_": r"\_",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+
+
+def _replace_plan(table: Dict[str, str]) -> List[Tuple[str, str]]:
+    """Order (key, replacement) so that no replacement is rewritten by a later step."""
+
+    todo = sorted(table)
+    plan: List[Tuple[str, str]] = []
+    while todo:
+        # A key may run once no pending key occurs in its replacement.
+        ready = [k for k in todo if not any(o != k and o in table[k] for o in todo)]
+        if not ready:
+            raise ValueError(f"escape table has a replacement cycle among: {todo}")
+        plan.extend((k, table[k]) for k in ready)
+        todo = [k for k in todo if k not in ready]
+    return plan
+
+
+def _chain(plan: Tuple[Tuple[str, str], ...]) -> Callable[[str], str]:
+    def escape(s: str) -> str:
+        for k, v in plan:
+            s = s.replace(k, v)
+        return s
+
+    return escape
+
+
+def compile_escaper(table: Dict[str, str]) -> Callable[[str], str]:
+    """Compile a single-character replacement table into an escaping function.
+
+    Equivalent to `"".join(table.get(ch, ch) for ch in s)`. If no replace
+    order avoids rewriting earlier output (TeX: the backslash and the braces
+    appear in each other's replacements), the text is split on the backslash
+    and joined back with its replacement.
+    """
+
+    try:
+        return _chain(tuple(_replace_plan(table)))
+    except ValueError:
+        if "\\" not in table:
+            raise
+    backslash = table["\\"]
+    chain = _chain(tuple(_replace_plan({k: v for k, v in table.items() if k != "\\"})))
+
+    def escape(s: str) -> str:
+        if "\\" not in s:
+            return chain(s)
+        return backslash.join([chain(part) for part in s.split("\\")])
+
+    return escape
+
+
+tex_escape = compile_escaper(TEX_SPECIALS)
+
+# Preserve unicode math-ish symbols (Σ, χ, ⪯, →, ×) and `$`. Escape only LaTeX specials.
+tex_escape_keep_math = compile_escaper({k: v for k, v in TEX_SPECIALS.items() if k != "$"})
+
+
+# The two chained printers below are already a minimal sequence of C-level
+# scans; they are kept unrolled (no per-call loop) for short-string speed.
+
+
+def tex_escape_doc(s: str) -> str:
+    # Minimal escaping for plain text fields (generic LaTeX printer).
+    # IMPORTANT: do not inject TeX macros here; escaping will corrupt them.
+    # Replacing in this order also escapes the braces of \textbackslash{}.
+    return (
+        s.replace("\\", r"\textbackslash{}")
+        .replace("{", r"\{")
+        .replace("}", r"\}")
+        .replace("$", r"\$")
+        .replace("&", r"\&")
+        .replace("#", r"\#")
+        .replace("%", r"\%")
+        .replace("_", r"\_")
+        .replace("~", r"\textasciitilde{}")
+        .replace("^", r"\textasciicircum{}")
+    )
+
+
+def md_escape(s: str) -> str:
+    # Conservative escaping for plain-text fields.
+    # Avoid changing unicode.
+    return (
+        s.replace("\\", "\\\\")
+        .replace("`", "\\`")
+        .replace("*", "\\*")
+        .replace("_", "\\_")
+        .replace("[", "\\[")
+        .replace("]", "\\]")
+    )
+
+
+# Deterministic normalization for common unicode math symbols to TeX.
+# This is intentionally small and conservative (repo determinism + stability).
+UNICODE_TO_TEX: Dict[str, str] = {
+    # Greek (uppercase)
+    "Σ": r"\Sigma",
+    "Π": r"\Pi",
+    "Θ": r"\Theta",
+    "Γ": r"\Gamma",
+    "Δ": r"\Delta",
+    "Λ": r"\Lambda",
+    "Ω": r"\Omega",
+    # Greek (lowercase)
+    "β": r"\beta",
+    "χ": r"\chi",
+    "π": r"\pi",
+    "θ": r"\theta",
+    "γ": r"\gamma",
+    "δ": r"\delta",
+    "λ": r"\lambda",
+    "ω": r"\omega",
+    # Operators / relations
+    "→": r"\to",
+    "↦": r"\mapsto",
+    "×": r"\times",
+    "∘": r"\circ",
+    "≤": r"\le",
+    "≥": r"\ge",
+    "≼": r"\preceq",
+    "⪯": r"\preceq",
+    "∈": r"\in",
+}
+
+_UNICODE = str.maketrans(UNICODE_TO_TEX)
+
+# Minimal pattern lift for R_{≥0} -> \mathbb{R}_{\ge 0}.
+# Keep this tight to avoid surprising conversions.
+_R_GE0_RE = re.compile(r"R_\{\s*≥\s*0\s*\}")
+
+
+def normalize_tex_unicode(s: str) -> str:
+    """Normalize common Unicode math glyphs into TeX macros.
+
+    NOTE: This does not add math-mode delimiters; callers decide whether
+    the string is emitted into text mode or math mode.
+    """
+
+    if not s or s.isascii():
+        return s
+
+    # Specific, deterministic rewrite(s) first.
+    # Use escaped backslashes in the replacement so `re` doesn't treat `\m` as an escape.
+    if "≥" in s:
+        s = _R_GE0_RE.sub(r"\\mathbb{R}_{\\ge 0}", s)
+    return s.translate(_UNICODE)
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import subprocess
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+from fcx.cache import cache_root
 from fcx.kernel import KernelCtx
 from fcx.util import read_text, sha256_text
 from fcx.validators.inline_markup_k1 import validate_inline_markup_k1
@@ -60,57 +60,28 @@ def gate_enforce_repo_law(ctx: KernelCtx) -> Tuple[List[Violation], List[Violati
     violations.extend(v_pt)
     warnings.extend(w_pt)
 
-    # 5. Copilot instructions freshness check
+    # 5. Copilot instructions freshness check: generate in-process (text reused
+    # from out/cache/copilot while the generator's input fingerprint matches)
+    # and compare with the tracked file in memory.
     copilot_path = root / ".github" / "copilot-instructions.md"
     if copilot_path.exists():
+        rel = str(copilot_path.relative_to(root))
         try:
-            # Run gen_copilot_instructions to regenerate
-            gen_script = root / "tools" / "gen_copilot_instructions" / "run"
-            if gen_script.exists():
-                result = subprocess.run(
-                    [str(gen_script)],
-                    cwd=str(root),
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                )
-                if result.returncode != 0:
-                    violations.append(
-                        Violation(
-                            code="LAW.E.COPILOT_GEN_FAILED",
-                            path=str(copilot_path.relative_to(root)),
-                            message="gen_copilot_instructions failed",
-                        )
-                    )
-                else:
-                    # Check if it differs from tracked version (naive: read both and compare)
-                    try:
-                        tracked = read_text(copilot_path)
-                        # Simple check: if generator succeeded, assume it's correct
-                        # (in a real gate, you'd git diff and fail if modified)
-                    except Exception as e:
-                        violations.append(
-                            Violation(
-                                code="LAW.E.COPILOT_CHECK_FAILED",
-                                path=str(copilot_path.relative_to(root)),
-                                message=f"failed to check copilot instructions: {str(e)}",
-                            )
-                        )
-        except subprocess.TimeoutExpired:
-            violations.append(
-                Violation(
-                    code="LAW.E.COPILOT_TIMEOUT",
-                    path=str(copilot_path.relative_to(root)),
-                    message="gen_copilot_instructions timed out",
-                )
-            )
+            from tools.gen_copilot_instructions.run import generate_cached
+
+            expected, _ = generate_cached(root, cache=cache_root(root))
         except Exception as e:
             violations.append(
-                Violation(
-                    code="LAW.E.COPILOT_ERROR",
-                    path=str(copilot_path.relative_to(root)),
-                    message=f"unexpected error in copilot check: {str(e)}",
-                )
+                Violation(code="LAW.E.COPILOT_GEN_FAILED", path=rel, message=f"gen_copilot_instructions failed: {e}")
             )
+        else:
+            if read_text(copilot_path) != expected:
+                violations.append(
+                    Violation(
+                        code="LAW.E.COPILOT_STALE",
+                        path=rel,
+                        message="out of date; run tools/gen_copilot_instructions/run and commit the result",
+                    )
+                )
 
     return violations, warnings
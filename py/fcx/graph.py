@@ -0,0 +1,201 @@
+"""Iterative graph algorithms over adjacency mappings.
+
+Graphs are `adj: Mapping[node, Sequence[node]]` (nodes absent from `adj`
+have no successors). Nothing here recurses, so depth is bounded by memory,
+not by the interpreter stack, and results depend only on the order of the
+given nodes and adjacency lists.
+
+`contains_forest` is the `contains` tree analysis shared by the
+specframe-k1 profile validator and tools/render_simple_md (checked against
+the recursive code it replaced and timed on million-edge frames by
+`tools/bench_contains/run`).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+N = TypeVar("N", bound=Hashable)
+
+
+def strongly_connected_components(nodes: Iterable[N], adj: Mapping[N, Sequence[N]]) -> List[List[N]]:
+    """Tarjan's SCCs, iteratively, in reverse topological order.
+
+    Every component comes after each component it has an edge to, so the
+    list is a dependency-first order when edges point at dependencies.
+    Linear in nodes + edges.
+    """
+
+    index: Dict[N, int] = {}
+    low: Dict[N, int] = {}
+    on_stack: set = set()
+    stack: List[N] = []
+    out: List[List[N]] = []
+    empty: Sequence[N] = ()
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adj.get(root, empty)))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(adj.get(w, empty))))
+                    break
+                if w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                if low[v] == index[v]:
+                    comp: List[N] = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        comp.append(w)
+                        if w == v:
+                            break
+                    out.append(comp)
+    return out
+
+
+def is_cyclic(component: Sequence[N], adj: Mapping[N, Sequence[N]]) -> bool:
+    """Whether a strongly connected component contains a cycle (size > 1 or a self-loop)."""
+
+    return len(component) > 1 or component[0] in adj.get(component[0], ())
+
+
+def component_levels(components: Sequence[Sequence[N]], adj: Mapping[N, Sequence[N]]) -> List[int]:
+    """Level of each component of `strongly_connected_components`.
+
+    0 for components with no edge to another component, else one more than
+    the highest level they have an edge to. Components of one level do not
+    reach each other, so levels are build waves (dependencies first).
+    """
+
+    comp_of: Dict[N, int] = {v: i for i, comp in enumerate(components) for v in comp}
+    levels: List[int] = []
+    for i, comp in enumerate(components):
+        lvl = 0
+        for v in comp:
+            for w in adj.get(v, ()):
+                j = comp_of.get(w)
+                if j is not None and j != i and levels[j] >= lvl:
+                    lvl = levels[j] + 1
+        levels.append(lvl)
+    return levels
+
+
+def shortest_cycle(start: N, adj: Mapping[N, Sequence[N]], within: Optional[set] = None) -> List[N]:
+    """Nodes of a shortest cycle through `start` (BFS), `[start]` for a self-loop, [] if none.
+
+    `within` restricts the search to these nodes (e.g. start's component).
+    """
+
+    parent: Dict[N, N] = {}
+    queue = deque([start])
+    while queue:
+        v = queue.popleft()
+        for w in adj.get(v, ()):
+            if within is not None and w not in within:
+                continue
+            if w == start:
+                path = [v]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            if w not in parent:
+                parent[w] = v
+                queue.append(w)
+    return []
+
+
+@dataclass(frozen=True)
+class ForestAnalysis:
+    children: Dict[str, List[str]]  # distinct children, sorted
+    parents: Dict[str, List[str]]  # distinct parents, in edge order
+    multi_parent: List[str]  # nodes with more than one parent, sorted
+    cycles: List[List[str]]  # a shortest cycle per cyclic component, from its smallest node; sorted
+
+    def roots(self) -> List[str]:
+        """Nodes with children and no parent, sorted."""
+
+        return sorted(n for n in self.children if n not in self.parents)
+
+
+def contains_forest(edges: Iterable[Tuple[str, str]]) -> ForestAnalysis:
+    """Check that (parent, child) edges form a forest, in one pass.
+
+    Reports every node with several distinct parents and every cycle, as
+    one shortest cycle per strongly connected component (a tangle of
+    cycles is one entry, its members all cyclic). Nodes that cannot be on
+    a cycle (reachable only from sources, or reaching only sinks) are
+    peeled off first, so SCCs run on what is left; a forest has nothing
+    left. Linear in the edges apart from sorting.
+    """
+
+    children: Dict[str, List[str]] = {}
+    parents: Dict[str, List[str]] = {}
+    for frm, to in edges:
+        ch = children.get(frm)
+        if ch is None:
+            children[frm] = [to]
+        else:
+            ch.append(to)
+        ps = parents.get(to)
+        if ps is None:
+            parents[to] = [frm]
+        else:
+            ps.append(frm)
+    for nid, ch in children.items():
+        if len(ch) > 1:
+            children[nid] = sorted(set(ch))
+    multi_parent: List[str] = []
+    for nid, ps in parents.items():
+        if len(ps) > 1:
+            ps = parents[nid] = list(dict.fromkeys(ps))
+            if len(ps) > 1:
+                multi_parent.append(nid)
+    multi_parent.sort()
+
+    # Peel sources (Kahn), then sinks of what remains.
+    indeg = {nid: len(ps) for nid, ps in parents.items()}
+    queue = [nid for nid in children if nid not in indeg]
+    while queue:
+        for c in children.get(queue.pop(), ()):
+            indeg[c] -= 1
+            if indeg[c] == 0:
+                queue.append(c)
+    rest = {nid for nid, d in indeg.items() if d}
+    outdeg = {nid: sum(1 for c in children.get(nid, ()) if c in rest) for nid in rest}
+    queue = [nid for nid, d in outdeg.items() if d == 0]
+    while queue:
+        nid = queue.pop()
+        rest.discard(nid)
+        for p in parents[nid]:
+            if p in rest:
+                outdeg[p] -= 1
+                if outdeg[p] == 0:
+                    queue.append(p)
+
+    cycles: List[List[str]] = []
+    if rest:
+        adj = {nid: [c for c in children.get(nid, ()) if c in rest] for nid in rest}
+        for comp in strongly_connected_components(sorted(rest), adj):
+            if is_cyclic(comp, adj):
+                cycles.append(shortest_cycle(min(comp), adj, set(comp)))
+        cycles.sort()
+
+    return ForestAnalysis(children=children, parents=parents, multi_parent=multi_parent, cycles=cycles)
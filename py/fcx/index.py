@@ -0,0 +1,325 @@
+"""Corpus index: graph_id -> frame, kept in SQLite.
+
+One row per `frames/**/v*/frame.yml` with its path, byte sha256, graph_id,
+version, root node (kind, title), profile and the root node's `pub.*`
+attrs, plus the FrameURL references the validators need (`refs`). The
+index lives at `index/frames.sqlite3` in the shared cache (`fcx.cache`)
+and is refreshed incrementally:
+- a file whose (size, mtime_ns, inode) is unchanged is not read
+- a file whose bytes hash to the stored sha256 is not parsed
+- rows of deleted frames are dropped
+
+Validators, indexers and renderers read the corpus through `open_index`
+instead of globbing and parsing frames themselves.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+from fcx.cache import cache_root
+from fcx.profiles.specframe_k1 import infer_profile
+from fcx.util import sha256_bytes
+
+
+# Bump whenever the schema or the extracted fields change; the index is rebuilt.
+INDEX_VERSION = "0.2.0"
+
+FRAME_GLOB = "frames/**/v*/frame.yml"
+
+# One statement each, so they can run inside an explicit transaction
+# (`executescript` would commit first).
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    """CREATE TABLE IF NOT EXISTS frames (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    graph_id TEXT,
+    version TEXT,
+    title TEXT,
+    root_kind TEXT,
+    profile TEXT NOT NULL,
+    has_root INTEGER NOT NULL,
+    pub TEXT NOT NULL
+)""",
+    "CREATE INDEX IF NOT EXISTS frames_graph_id ON frames (graph_id, version)",
+    """CREATE TABLE IF NOT EXISTS refs (
+    path TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    PRIMARY KEY (path, seq)
+)""",
+)
+
+_COLUMNS = "path, sha256, status, error, graph_id, version, title, root_kind, profile, has_root, pub"
+
+
+def frameurl_path(graph_id: str) -> str:
+    """Docs path of a graph_id: <scheme>://<scope>/<segments...> -> <scope>/<scheme>/<segments...>."""
+
+    if "://" not in graph_id:
+        return graph_id
+    scheme, rest = graph_id.split("://", 1)
+    scope = rest.split("/", 1)[0]
+    tail = rest.split("/", 1)[1] if "/" in rest else ""
+    return f"{scope}/{scheme}/{tail}".rstrip("/")
+
+
+@dataclass(frozen=True)
+class FrameRecord:
+    path: str  # repo-relative, posix
+    sha256: str
+    status: str  # ok | not_mapping | parse_error
+    error: Optional[str] = None
+    graph_id: Optional[str] = None
+    version: Optional[str] = None
+    title: Optional[str] = None
+    root_kind: Optional[str] = None  # kind of the first node whose id is graph_id
+    profile: str = ""
+    has_root: bool = False
+    pub: Dict[str, str] = field(default_factory=dict)  # root node pub.* attrs
+
+
+def _str(x: Any) -> Optional[str]:
+    return x if isinstance(x, str) and x else None
+
+
+def scan_frame(path: str, src: bytes) -> Tuple[FrameRecord, List[Tuple[str, str]]]:
+    """(record, references) of one frame's bytes.
+
+    References are (kind, value) in document order, for string values only:
+    - `depends_on`: frame `properties` entries (as validate_references reads them)
+    - `attr.depends_on`: frame `attrs` entries
+    - `target_graph_id`: the frame-level field
+    - `spec_ref`: target_graph_id of `spec_ref` nodes
+    - `refers_to`: targets of `refers_to` edges (a FrameURL, or the
+      target_graph_id of the `spec_ref` node the edge points at)
+    - `edge_from`: every edge's `from`
+    """
+
+    sha = sha256_bytes(src)
+    try:
+        data = yaml.safe_load(src.decode("utf-8"))
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        return FrameRecord(path=path, sha256=sha, status="parse_error", error=str(e)), []
+    if not isinstance(data, dict):
+        return FrameRecord(path=path, sha256=sha, status="not_mapping"), []
+
+    gid = _str(data.get("graph_id"))
+    nodes = data.get("nodes") if isinstance(data.get("nodes"), list) else []
+    root = next((n for n in nodes if isinstance(n, dict) and gid is not None and n.get("id") == gid), None)
+    pub: Dict[str, str] = {}
+    if root is not None and isinstance(root.get("attrs"), list):
+        for a in root["attrs"]:
+            if isinstance(a, dict) and isinstance(a.get("key"), str) and a["key"].startswith("pub."):
+                if isinstance(a.get("value"), str) and a["key"] not in pub:
+                    pub[a["key"]] = a["value"]
+
+    refs: List[Tuple[str, str]] = []
+    for prop in data.get("properties") or []:
+        if isinstance(prop, dict) and prop.get("key") == "depends_on" and _str(prop.get("value")):
+            refs.append(("depends_on", prop["value"]))
+    for a in data.get("attrs") if isinstance(data.get("attrs"), list) else []:
+        if isinstance(a, dict) and a.get("key") == "depends_on" and _str(a.get("value")):
+            refs.append(("attr.depends_on", a["value"]))
+    if _str(data.get("target_graph_id")):
+        refs.append(("target_graph_id", data["target_graph_id"]))
+    spec_refs: Dict[str, str] = {}
+    for n in nodes:
+        if isinstance(n, dict) and n.get("kind") == "spec_ref" and _str(n.get("target_graph_id")):
+            refs.append(("spec_ref", n["target_graph_id"]))
+            if _str(n.get("id")):
+                spec_refs.setdefault(n["id"], n["target_graph_id"])
+    edges = data.get("edges") or []
+    for e in edges:
+        if isinstance(e, dict) and e.get("type") == "refers_to" and _str(e.get("to")):
+            target = spec_refs.get(e["to"]) or (e["to"] if "://" in e["to"] else None)
+            if target is not None:
+                refs.append(("refers_to", target))
+    for e in edges:
+        if isinstance(e, dict) and _str(e.get("from")):
+            refs.append(("edge_from", e["from"]))
+
+    rec = FrameRecord(
+        path=path,
+        sha256=sha,
+        status="ok",
+        graph_id=gid,
+        version=_str(data.get("version")),
+        title=_str(root.get("title")) if root is not None else None,
+        root_kind=_str(root.get("kind")) if root is not None else None,
+        profile=infer_profile(data),
+        has_root=root is not None,
+        pub=pub,
+    )
+    return rec, refs
+
+
+def _path_key(rec: FrameRecord) -> Tuple[str, ...]:
+    # Same order as sorted(root.glob(...)): by path components, not by string.
+    return tuple(rec.path.split("/"))
+
+
+def _record(row: Tuple[Any, ...]) -> FrameRecord:
+    path, sha, status, error, gid, ver, title, kind, profile, has_root, pub = row
+    return FrameRecord(path, sha, status, error, gid, ver, title, kind, profile, bool(has_root), json.loads(pub))
+
+
+class FrameIndex:
+    """SQLite-backed frame index of a repo; call `refresh()` before querying."""
+
+    def __init__(self, repo_root: Path, db_path: Optional[Path] = None) -> None:
+        self.repo_root = repo_root
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(db_path) if db_path is not None else ":memory:", timeout=60)
+        self._ensure_schema()
+
+    def _schema_version(self) -> Optional[str]:
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        return row[0] if row is not None else None
+
+    def _ensure_schema(self) -> None:
+        if self._schema_version() == INDEX_VERSION:
+            return
+        # Processes starting on a cold cache race here: take the write lock
+        # first and re-check, so only one of them rebuilds the schema.
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if self._schema_version() != INDEX_VERSION:
+                for (name,) in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                    self.db.execute(f'DROP TABLE IF EXISTS "{name}"')
+                for stmt in _SCHEMA:
+                    self.db.execute(stmt)
+                self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (INDEX_VERSION,))
+            self.db.commit()
+        except BaseException:
+            self.db.rollback()
+            raise
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "FrameIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the working tree; returns the number of frames (re)parsed."""
+
+        root = self.repo_root
+        paths = {p.relative_to(root).as_posix(): p for p in root.glob(FRAME_GLOB)}
+        known = {r[0]: r[1:] for r in self.db.execute("SELECT path, size, mtime_ns, inode, sha256 FROM frames")}
+        parsed = 0
+        with self.db:
+            for rel in sorted(set(known) - set(paths)):
+                self.db.execute("DELETE FROM frames WHERE path = ?", (rel,))
+                self.db.execute("DELETE FROM refs WHERE path = ?", (rel,))
+            for rel in sorted(paths):
+                st = paths[rel].stat()
+                stat = (st.st_size, st.st_mtime_ns, st.st_ino)
+                old = known.get(rel)
+                if old is not None and tuple(old[:3]) == stat:
+                    continue
+                src = paths[rel].read_bytes()
+                if old is not None and old[3] == sha256_bytes(src):
+                    self.db.execute(
+                        "UPDATE frames SET size = ?, mtime_ns = ?, inode = ? WHERE path = ?", (*stat, rel)
+                    )
+                    continue
+                rec, refs = scan_frame(rel, src)
+                parsed += 1
+                self.db.execute(
+                    f"INSERT OR REPLACE INTO frames (size, mtime_ns, inode, {_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        *stat,
+                        rec.path,
+                        rec.sha256,
+                        rec.status,
+                        rec.error,
+                        rec.graph_id,
+                        rec.version,
+                        rec.title,
+                        rec.root_kind,
+                        rec.profile,
+                        int(rec.has_root),
+                        json.dumps(rec.pub, sort_keys=True),
+                    ),
+                )
+                self.db.execute("DELETE FROM refs WHERE path = ?", (rel,))
+                self.db.executemany(
+                    "INSERT INTO refs (path, seq, kind, ref) VALUES (?, ?, ?, ?)",
+                    [(rel, i, kind, ref) for i, (kind, ref) in enumerate(refs)],
+                )
+        return parsed
+
+    def records(self) -> List[FrameRecord]:
+        """Every indexed frame, in path order."""
+
+        return sorted((_record(r) for r in self.db.execute(f"SELECT {_COLUMNS} FROM frames")), key=_path_key)
+
+    def get(self, path: str) -> Optional[FrameRecord]:
+        row = self.db.execute(f"SELECT {_COLUMNS} FROM frames WHERE path = ?", (path,)).fetchone()
+        return _record(row) if row is not None else None
+
+    def by_graph_id(self, graph_id: str) -> List[FrameRecord]:
+        """Frames declaring this graph_id, in path order."""
+
+        rows = self.db.execute(f"SELECT {_COLUMNS} FROM frames WHERE graph_id = ?", (graph_id,))
+        return sorted((_record(r) for r in rows), key=_path_key)
+
+    def path_for(self, graph_id: str, version: str) -> Optional[str]:
+        """Path of the frame with this graph_id and version (first by path), or None."""
+
+        recs = [r for r in self.by_graph_id(graph_id) if r.version == version]
+        return recs[0].path if recs else None
+
+    def graph_ids(self) -> Set[str]:
+        return {r[0] for r in self.db.execute("SELECT DISTINCT graph_id FROM frames WHERE graph_id IS NOT NULL")}
+
+    def refs(self, path: str) -> List[Tuple[str, str]]:
+        """(kind, value) references of one frame in document order (see `scan_frame`)."""
+
+        return [(k, v) for k, v in self.db.execute("SELECT kind, ref FROM refs WHERE path = ? ORDER BY seq", (path,))]
+
+    def refs_of_kinds(self, kinds: Iterable[str]) -> List[Tuple[str, str, str]]:
+        """(path, kind, value) of every reference of these kinds, by path and document order."""
+
+        kinds = sorted(set(kinds))
+        rows = self.db.execute(
+            f"SELECT path, kind, ref FROM refs WHERE kind IN ({', '.join('?' * len(kinds))}) ORDER BY path, seq",
+            kinds,
+        )
+        return [(p, k, v) for p, k, v in rows]
+
+
+def index_path(croot: Path) -> Path:
+    """The index database in the cache rooted at `croot` (see `fcx.cache.cache_root`)."""
+
+    return croot / "index" / "frames.sqlite3"
+
+
+def open_index(repo_root: Path, *, use_cache: bool = True) -> FrameIndex:
+    """The refreshed frame index of `repo_root` (in memory when `use_cache` is False)."""
+
+    idx = FrameIndex(repo_root, index_path(cache_root(repo_root)) if use_cache else None)
+    idx.refresh()
+    return idx
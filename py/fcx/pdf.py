@@ -0,0 +1,209 @@
+"""Content-addressed PDF builds for LaTeX bundles.
+
+A bundle is a directory with `main.tex` (plus any files it includes). A PDF
+is a function of (bundle bytes, engine, engine version), so it is cached
+under `pdf/<key>` in the shared cache (`fcx.cache`) and rebuilt only on a
+miss. Misses run on a bounded worker pool; identical bundles are built once.
+
+Engines:
+- `tectonic` (preferred) and `latexmk`, found on PATH
+- any other executable (e.g. a stub script in tests) given explicitly; it is
+  run as `<engine> main.tex` in a scratch copy of the bundle, must write
+  `main.pdf`, and should answer `<engine> --version`
+
+CLI: `tools/pub_build/run` (and `tools/pub_build_pdf/run`).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fcx.cache import ContentCache, cache_key
+from fcx.util import sha256_bytes, sha256_file, sha256_text
+
+
+# Bump whenever the build procedure (copy, invocation, outputs) changes.
+PDF_BUILDER_VERSION = "0.1.0"
+
+_ENGINE_ARGV = {
+    "tectonic": ["tectonic", "--print", "--synctex", "-Z", "shell-escape", "main.tex"],
+    "latexmk": ["latexmk", "-pdf", "-interaction=nonstopmode", "-halt-on-error", "-file-line-error", "main.tex"],
+}
+
+
+@dataclass(frozen=True)
+class Engine:
+    name: str
+    argv: Tuple[str, ...]
+    version: str
+
+
+@dataclass(frozen=True)
+class PdfJob:
+    src: Path
+    out: Path
+    name: str
+    frame: Optional[Path] = None
+    manifest: Optional[Path] = None
+
+    @property
+    def pdf(self) -> Path:
+        return self.out / f"{self.name}.pdf"
+
+
+def _engine_version(exe: str) -> str:
+    try:
+        out = subprocess.run([exe, "--version"], capture_output=True, text=True, timeout=60).stdout
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    lines = out.strip().splitlines()
+    return lines[0].strip() if lines else "unknown"
+
+
+def detect_engine(explicit: Optional[str] = None) -> Engine:
+    """Resolve the engine: explicit path/name, else tectonic, else latexmk.
+
+    Raises SystemExit if none is available.
+    """
+
+    if explicit:
+        name = Path(explicit).name
+        exe = shutil.which(explicit) or explicit
+        if not os.access(exe, os.X_OK):
+            raise SystemExit(f"PDF engine not executable: {explicit}")
+        argv = [exe] + _ENGINE_ARGV[name][1:] if name in _ENGINE_ARGV else [exe, "main.tex"]
+        return Engine(name=name, argv=tuple(argv), version=_engine_version(exe))
+
+    for name, argv in _ENGINE_ARGV.items():
+        exe = shutil.which(name)
+        if exe is not None:
+            return Engine(name=name, argv=tuple([exe] + argv[1:]), version=_engine_version(exe))
+    raise SystemExit("Neither tectonic nor latexmk found. In CI install tectonic (recommended).")
+
+
+def bundle_files(src: Path) -> List[Path]:
+    """Files of a bundle, sorted (top-level dotfiles excluded, as `cp -R src/*`)."""
+
+    out: List[Path] = []
+    for top in sorted(src.iterdir()):
+        if top.name.startswith("."):
+            continue
+        if top.is_dir():
+            out.extend(p for p in sorted(top.rglob("*")) if p.is_file())
+        elif top.is_file():
+            out.append(top)
+    return out
+
+
+def bundle_sha256(src: Path) -> str:
+    """sha256 over the sorted (relative path, file sha256) list of a bundle."""
+
+    lines = [f"{p.relative_to(src).as_posix()}\0{sha256_file(p)}\n" for p in bundle_files(src)]
+    return sha256_text("".join(lines))
+
+
+def pdf_cache_key(bundle: str, engine: Engine) -> str:
+    return cache_key(
+        {
+            "bundle_sha256": bundle,
+            "engine": engine.name,
+            "engine_argv": " ".join(engine.argv[1:]),
+            "engine_version": engine.version,
+            "builder": PDF_BUILDER_VERSION,
+        }
+    )
+
+
+def pdf_cache(root: Path) -> ContentCache:
+    """The PDF namespace of the cache rooted at `root` (see `fcx.cache.cache_root`)."""
+
+    return ContentCache(root, "pdf")
+
+
+def build_pdf(src: Path, engine: Engine) -> bytes:
+    """Build main.pdf from a scratch copy of the bundle; raises RuntimeError on failure."""
+
+    if not (src / "main.tex").is_file():
+        raise RuntimeError(f"missing {src / 'main.tex'}")
+    with tempfile.TemporaryDirectory(prefix="fcx-pdf-") as tmp:
+        work = Path(tmp)
+        for p in bundle_files(src):
+            dst = work / p.relative_to(src)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(p, dst)
+        proc = subprocess.run(list(engine.argv), cwd=str(work), capture_output=True, text=True)
+        pdf = work / "main.pdf"
+        if proc.returncode != 0 or not pdf.is_file():
+            tail = "\n".join((proc.stderr or proc.stdout or "").strip().splitlines()[-20:])
+            raise RuntimeError(f"{engine.name} failed (exit {proc.returncode}) for {src}: {tail}")
+        return pdf.read_bytes()
+
+
+def run_pdf_jobs(
+    jobs: List[PdfJob], engine: Engine, cache: Optional[ContentCache], *, workers: int = 1
+) -> Tuple[Dict[PdfJob, Tuple[str, bytes]], Dict[PdfJob, str], int]:
+    """Produce the PDF bytes of every job.
+
+    Returns ({job: (bundle sha256, pdf bytes)}, {job: error}, number of builds run).
+    Cache hits are served without building; distinct missing keys are built
+    once each on a pool of `workers` threads (the engines are subprocesses).
+    """
+
+    keyed: Dict[PdfJob, Tuple[str, str]] = {}
+    errors: Dict[PdfJob, str] = {}
+    for job in jobs:
+        try:
+            bundle = bundle_sha256(job.src)
+        except OSError as e:
+            errors[job] = str(e)
+            continue
+        keyed[job] = (bundle, pdf_cache_key(bundle, engine))
+
+    pdfs: Dict[str, bytes] = {}
+    todo: Dict[str, Path] = {}
+    for job, (_, key) in keyed.items():
+        if key in pdfs or key in todo:
+            continue
+        hit = cache.get(key) if cache is not None else None
+        if hit is not None:
+            pdfs[key] = hit
+        else:
+            todo[key] = job.src
+
+    failed: Dict[str, str] = {}
+
+    def _build(key: str) -> Tuple[str, Optional[bytes], Optional[str]]:
+        try:
+            return key, build_pdf(todo[key], engine), None
+        except (OSError, RuntimeError) as e:
+            return key, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        for key, data, err in ex.map(_build, sorted(todo)):
+            if data is None:
+                failed[key] = err or "build failed"
+                continue
+            pdfs[key] = data
+            if cache is not None:
+                cache.put(key, data)
+
+    out: Dict[PdfJob, Tuple[str, bytes]] = {}
+    for job, (bundle, key) in keyed.items():
+        if key in pdfs:
+            out[job] = (bundle, pdfs[key])
+        else:
+            errors[job] = failed[key]
+    return out, errors, len(todo)
+
+
+def sha256sums(pdfs: Dict[str, bytes]) -> str:
+    """`shasum -a 256` format for {file name: bytes}, sorted by name."""
+
+    return "".join(f"{sha256_bytes(data)}  {name}\n" for name, data in sorted(pdfs.items()))
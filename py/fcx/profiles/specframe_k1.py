@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional
 
+from fcx.graph import contains_forest
 from fcx.kernel import KernelCtx
 from fcx.violations import Violation
 
@@ -123,8 +124,13 @@ def validate_specframe_k1(ctx: KernelCtx, g: Any, frame_path: str) -> List[Viola
                     )
                 )
 
-    contains_edges: List[tuple[str, str]] = []
-    parent_of: Dict[str, str] = {}
+    def contains_pair(e: Any) -> Optional[tuple[str, str]]:
+        if isinstance(e, dict) and e.get("type") == "contains" and _is_str(e.get("from")) and _is_str(e.get("to")):
+            return e["from"], e["to"]
+        return None
+
+    # One iterative pass over the contains edges finds every multi-parent node and every cycle.
+    forest = contains_forest(p for p in map(contains_pair, edges) if p is not None)
 
     for e in edges:
         if not isinstance(e, dict):
@@ -134,48 +140,29 @@ def validate_specframe_k1(ctx: KernelCtx, g: Any, frame_path: str) -> List[Viola
             violations.append(Violation(code=SPEC_E["BAD_EDGE_TYPE"], path=frame_path, message=f"unknown edge type: {et}"))
             continue
 
-        frm, to = e.get("from"), e.get("to")
-        if et == "contains" and _is_str(frm) and _is_str(to):
-            contains_edges.append((frm, to))
-            if to in parent_of and parent_of[to] != frm:
+        pair = contains_pair(e)
+        if pair is not None:
+            frm, to = pair
+            first = forest.parents[to][0]
+            if frm != first:
                 violations.append(
                     Violation(
                         code=SPEC_E["MULTI_PARENT"],
                         path=frame_path,
                         node_id=to,
-                        message=f"node has multiple parents via contains: {parent_of[to]} and {frm}",
+                        message=f"node has multiple parents via contains: {first} and {frm}",
                     )
                 )
-            else:
-                parent_of[to] = frm
-
-    children: Dict[str, List[str]] = {}
-    for frm, to in contains_edges:
-        children.setdefault(frm, []).append(to)
-    for k in children:
-        children[k] = sorted(children[k])
-
-    visiting: set[str] = set()
-    visited: set[str] = set()
-
-    def dfs(nid: str) -> Optional[str]:
-        if nid in visiting:
-            return nid
-        if nid in visited:
-            return None
-        visiting.add(nid)
-        for ch in children.get(nid, []):
-            cyc = dfs(ch)
-            if cyc:
-                return cyc
-        visiting.remove(nid)
-        visited.add(nid)
-        return None
 
-    root_id = str(root.get("id") or "")
-    cyc = dfs(root_id)
-    if cyc:
-        violations.append(Violation(code=SPEC_E["CONTAINS_CYCLE"], path=frame_path, node_id=cyc, message="contains cycle detected"))
+    for cyc in forest.cycles:
+        violations.append(
+            Violation(
+                code=SPEC_E["CONTAINS_CYCLE"],
+                path=frame_path,
+                node_id=cyc[0],
+                message=f"contains cycle detected: {' -> '.join(cyc + cyc[:1])}",
+            )
+        )
 
     return violations
 
@@ -0,0 +1,112 @@
+"""PubTeX Inline IR forbidden control-sequence scanner.
+
+One engine shared by the PubTeX validator and the publication renderer.
+
+Policy (unchanged from the per-segment regexes it replaces):
+- math segments: forbid `\\input`, `\\include`, `\\write`, `\\openout`, `\\read`,
+  `\\usepackage`, `\\catcode`, `\\def`, `\\edef`, `\\gdef` (word-bounded)
+- code segments: forbid any backslash control sequence (`\\[A-Za-z@]+`)
+
+Both rules are evaluated by a single compiled pattern in one left-to-right
+pass per distinct segment string. Results are memoized in memory, so a segment
+that is checked by the validator and again by the renderer in the same process
+is only scanned once. The memo does not outlive the process: separate
+validator and renderer runs (e.g. separate CI gates) each scan the segment.
+That is deliberate, since looking up a persisted result in the content cache
+costs more than the scan (about 22us vs 15us for a typical math segment).
+
+Segments are enumerated in pre-order over the IR node list (children of
+strong/emph/link included, as the renderer visits them); for the flat lists
+produced by tex-inline-v0 the segment index is the list index.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Hashable, Iterable, Iterator, List, Tuple
+
+
+FORBIDDEN_MATH_NAMES = ("input", "include", "write", "openout", "read", "usepackage", "catcode", "def", "edef", "gdef")
+
+# Group 1 is set iff the math rule matches at this backslash; every match is a
+# code-rule hit.
+_SCAN_RE = re.compile(r"\\(?:(" + "|".join(FORBIDDEN_MATH_NAMES) + r")\b|[A-Za-z@]+)")
+
+_SCANNED_KINDS = ("math", "code")
+_CONTAINER_KINDS = ("strong", "emph", "link")
+
+_END = object()
+
+
+@dataclass(frozen=True)
+class ForbiddenHit:
+    seg: int
+    pos: int
+    kind: str
+    seq: str
+
+
+@lru_cache(maxsize=65536)
+def _scan_text(s: str) -> Tuple[Tuple[int, str, bool], ...]:
+    """Return (offset, control_sequence, math_forbidden) for each match in s.
+
+    Memoized per process only (see the module docstring).
+    """
+
+    return tuple((m.start(), m.group(0), m.group(1) is not None) for m in _SCAN_RE.finditer(s))
+
+
+def scan_segment(kind: str, s: str) -> List[Tuple[int, str]]:
+    """Return (offset, control_sequence) hits for one math/code segment."""
+
+    if kind not in _SCANNED_KINDS or not s:
+        return []
+    hits = _scan_text(s)
+    if kind == "code":
+        return [(pos, seq) for pos, seq, _ in hits]
+    return [(pos, seq) for pos, seq, math_hit in hits if math_hit]
+
+
+def iter_segments(nodes: Any) -> Iterator[Tuple[int, str, str]]:
+    """Yield (segment_index, t, s) in pre-order over an IR node list."""
+
+    idx = 0
+    stack: List[Iterator[Any]] = [iter(nodes or [])]
+    while stack:
+        n = next(stack[-1], _END)
+        if n is _END:
+            stack.pop()
+            continue
+        if not isinstance(n, dict):
+            continue
+        t = str(n.get("t"))
+        yield idx, t, str(n.get("s", ""))
+        idx += 1
+        kids = n.get("c")
+        if t in _CONTAINER_KINDS and isinstance(kids, list) and kids:
+            stack.append(iter(kids))
+
+
+def scan_nodes(nodes: Any) -> List[ForbiddenHit]:
+    """Scan every math and code segment of an IR node list in one pass."""
+
+    out: List[ForbiddenHit] = []
+    for idx, t, s in iter_segments(nodes):
+        for pos, seq in scan_segment(t, s):
+            out.append(ForbiddenHit(seg=idx, pos=pos, kind=t, seq=seq))
+    return out
+
+
+def scan_frame_irs(irs: Iterable[Tuple[Hashable, Any]]) -> List[Tuple[Hashable, ForbiddenHit]]:
+    """Scan many IR node lists (e.g. every pub.tex.* value of a frame) in one pass.
+
+    `irs` yields (tag, nodes); each hit is returned with the tag of its list.
+    """
+
+    out: List[Tuple[Hashable, ForbiddenHit]] = []
+    for tag, nodes in irs:
+        for hit in scan_nodes(nodes):
+            out.append((tag, hit))
+    return out
@@ -0,0 +1,57 @@
+"""Pure printers over DocIR (see `fcx.docir`).
+
+Targets:
+- `md`: Markdown (`fcx.render.md`)
+- `tex`: generic LaTeX main.tex (`fcx.render.tex`)
+- `pub_tex`: publication LaTeX main.tex over PubTeX Inline IR (`fcx.render.pub_tex`)
+
+`render_all` runs several printers over one in-memory DocIR.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from .md import RENDERER_VERSION as MD_VERSION
+from .md import render as render_markdown
+from .pub_tex import RENDERER_VERSION as PUB_TEX_VERSION
+from .pub_tex import render_tex as render_pub_tex
+from .tex import RENDERER_VERSION as TEX_VERSION
+from .tex import render_tex
+
+# target -> (printer, renderer version); iteration order is the render order.
+TARGETS: Dict[str, Tuple[Callable[[Dict[str, Any]], str], str]] = {
+    "md": (render_markdown, MD_VERSION),
+    "tex": (render_tex, TEX_VERSION),
+    "pub_tex": (render_pub_tex, PUB_TEX_VERSION),
+}
+
+
+def render_all(docir: Dict[str, Any], targets: Iterable[str] = tuple(TARGETS)) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Render targets from one DocIR; returns ({target: text}, {target: error}).
+
+    A failing printer (e.g. PubTeX rejecting a forbidden control sequence) does
+    not prevent the other targets from rendering.
+    """
+
+    out: Dict[str, str] = {}
+    errors: Dict[str, str] = {}
+    for t in targets:
+        printer, _ = TARGETS[t]
+        try:
+            out[t] = printer(docir)
+        except Exception as e:
+            errors[t] = str(e)
+    return out, errors
+
+
+__all__ = [
+    "MD_VERSION",
+    "PUB_TEX_VERSION",
+    "TARGETS",
+    "TEX_VERSION",
+    "render_all",
+    "render_markdown",
+    "render_pub_tex",
+    "render_tex",
+]
@@ -0,0 +1,30 @@
+"""Line assembly shared by the DocIR printers.
+
+Printers produce a sequence of lines; the document is
+`"\n".join(ln.rstrip() for ln in lines).rstrip() + "\n"`. `write_lines`
+produces the same bytes incrementally, holding back only trailing blank lines.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+
+def join_lines(lines: Iterable[str]) -> str:
+    return "\n".join(ln.rstrip() for ln in lines).rstrip() + "\n"
+
+
+def write_lines(lines: Iterable[str], write: Callable[[str], Any]) -> None:
+    """Stream `join_lines(lines)` through `write` without building the document."""
+
+    pending = 0  # blank lines not yet written (dropped if nothing follows)
+    started = False
+    for ln in lines:
+        ln = ln.rstrip()
+        if not ln:
+            pending += 1
+            continue
+        write("\n" * (pending + 1 if started else pending) + ln)
+        started = True
+        pending = 0
+    write("\n")
@@ -0,0 +1,173 @@
+"""Markdown printer over DocIR.
+
+- This is a pure pretty-printer over DocIR.
+- Deterministic ordering comes from DocIR (already ordered blocks).
+
+CLI: `tools/render_md_doc/run`.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from tools.markup.inline_markup_k1 import (
+    B_CODE_FENCE,
+    B_PARAGRAPH,
+    T_CODE,
+    T_EMPH,
+    T_LINK,
+    T_MATH,
+    T_STRONG,
+    T_TEXT,
+    MarkupDoc,
+    as_markup_doc,
+)
+
+from fcx.escape import md_escape
+
+from .lines import join_lines, write_lines
+
+
+# Bump whenever rendered bytes change for the same DocIR.
+RENDERER_VERSION = "0.1.0"
+
+
+def read_json(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def render_inline_markup_k1(doc: MarkupDoc) -> str:
+    # InlineMarkup-K1 blocks -> Markdown
+    # We render paragraphs separated by blank lines and code fences verbatim.
+    out: List[str] = []
+    for b in doc.blocks:
+        tag = b[0]
+        if tag == B_CODE_FENCE:
+            out.append(f"```{b[1].strip()}".rstrip())
+            out.extend(b[2].split("\n"))
+            out.append("```")
+            out.append("")
+        elif tag == B_PARAGRAPH:
+            out.append(render_inline_nodes_md(b[1]))
+            out.append("")
+        else:
+            out.append(f"[unhandled:{b[1].get('t')}]")
+            out.append("")
+    return "\n".join(out).rstrip("\n")
+
+
+def render_inline_nodes_md(nodes: Tuple[Any, ...]) -> str:
+    out: List[str] = []
+    for n in nodes:
+        tag = n[0]
+        if tag == T_TEXT:
+            out.append(n[1])
+        elif tag == T_EMPH:
+            out.append("*" + render_inline_nodes_md(n[1]) + "*")
+        elif tag == T_STRONG:
+            out.append("**" + render_inline_nodes_md(n[1]) + "**")
+        elif tag == T_CODE:
+            out.append("`" + n[1] + "`")
+        elif tag == T_MATH:
+            out.append("$" + n[1] + "$")
+        elif tag == T_LINK:
+            out.append("[" + render_inline_nodes_md(n[1]) + "](" + n[2] + ")")
+        else:
+            out.append(str(n[1].get("s", "")))
+    return "".join(out)
+
+
+def render_body(docir_block: Dict[str, Any], field: str) -> List[str]:
+    # Prefer structured markup if present; otherwise treat as plain text.
+    # field is informational (may inform escaping later).
+    # Markup errors do not fail rendering here; validators are responsible for enforcing.
+    doc = as_markup_doc(docir_block.get("body_markup"))
+    if doc is not None:
+        return [render_inline_markup_k1(doc), ""]
+
+    body = md_escape(str(docir_block.get("body", "")))
+    return [body, ""] if body else [""]
+
+
+def render_block(b: Dict[str, Any]) -> List[str]:
+    t = b.get("type")
+    if t == "heading":
+        level = int(b.get("level", 1))
+        title = md_escape(str(b.get("title", "")))
+        anchor = str(b.get("anchor", ""))
+        # GitHub MD headings autogenerate ids; keep explicit anchor as HTML.
+        out = [f"{'#' * max(1, min(6, level))} {title}"]
+        if anchor:
+            out.append(f"<a id=\"{anchor}\"></a>")
+        out.append("")
+        return out
+
+    if t == "paragraph":
+        # Prefer MarkupIR in paragraphs too (not only clause/definition bodies).
+        doc = as_markup_doc(b.get("body_markup"))
+        if doc is not None:
+            return [render_inline_markup_k1(doc), ""]
+        txt = md_escape(str(b.get("text", "")))
+        return [txt, ""] if txt else [""]
+
+    if t == "definition":
+        label = md_escape(str(b.get("label", "")))
+        status = md_escape(str(b.get("status", "")))
+        head = f"**{label}**" + (f" _({status})_" if status else "")
+        out = [head, ""]
+        out.extend(render_body(b, "body"))
+        return out
+
+    if t == "clause":
+        label = md_escape(str(b.get("label", "")))
+        status = md_escape(str(b.get("status", "")))
+        head = f"**{label}**" + (f" _({status})_" if status else "")
+        out = [head, ""]
+        out.extend(render_body(b, "body"))
+        return out
+
+    if t == "property":
+        label = md_escape(str(b.get("label", "")))
+        status = md_escape(str(b.get("status", "")))
+        symbols = b.get("symbols") or []
+        head = f"**{label}**" + (f" _({status})_" if status else "")
+        out = [head, ""]
+        if symbols:
+            for s in symbols:
+                sym = md_escape(str(s.get("sym", "")))
+                desc = md_escape(str(s.get("desc", "")))
+                out.append(f"- `{sym}`: {desc}")
+            out.append("")
+        return out
+
+    if t == "list_item":
+        txt = md_escape(str(b.get("text", "")))
+        return [f"- {txt}"]
+
+    if t == "note":
+        kind = md_escape(str(b.get("kind", "note")))
+        txt = md_escape(str(b.get("text", "")))
+        return [f"> **{kind}**: {txt}", ""]
+
+    return [f"> **unhandled block**: `{t}`", ""]
+
+
+def iter_lines(blocks: Iterable[Any]) -> Iterator[str]:
+    # The title is carried by the first heading block; front matter is unused.
+    for b in blocks:
+        if not isinstance(b, dict):
+            continue
+        yield from render_block(b)
+
+
+def render(docir: Dict[str, Any]) -> str:
+    # Normalize trailing whitespace and ensure newline at EOF.
+    return join_lines(iter_lines(docir.get("blocks", [])))
+
+
+def render_stream(front_matter: Dict[str, Any], blocks: Iterable[Any], write: Callable[[str], Any]) -> None:
+    """Print blocks as they arrive (e.g. from a DocIR JSON Lines stream); same bytes as `render`."""
+
+    write_lines(iter_lines(blocks), write)
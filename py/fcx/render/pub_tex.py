@@ -0,0 +1,293 @@
+"""Publication LaTeX printer over DocIR using PubTeX Inline IR.
+
+This renderer is intended for publication-grade TeX output.
+
+Key idea (Option A): frames may attach a publication-specific inline IR via attrs
+(e.g. `pub.tex.summary`, `pub.tex.text`) that is carried into DocIR as
+`pub_tex_inline` and preferred over InlineMarkup-K1.
+
+TeX passthrough (opt-in):
+- If a DocIR block has `text_format == 'tex-inline'` or `text_format == 'tex-block'`,
+  the corresponding string payload is emitted **verbatim** (no escaping).
+- This is intentionally unsafe unless paired with a dedicated validator gate.
+  For now we keep this mode opt-in and leave enforcement to future tooling.
+
+Input:
+- DocIR JSON (tools/render_docir/run.py output)
+
+Output:
+- the text of `main.tex`
+
+Determinism:
+- stable ordering (comes from DocIR)
+- no timestamps
+- conservative escaping (except for explicit tex-* passthrough)
+
+Security/safety:
+- PubTeX IR is treated as *data*, not raw TeX injection. We only accept a
+  constrained set of inline nodes.
+
+CLI: `tools/render_pub_tex/run`.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from fcx.escape import tex_escape
+from fcx.pubtex import scan_nodes
+
+from .lines import join_lines, write_lines
+
+
+# Bump whenever rendered bytes change for the same DocIR.
+RENDERER_VERSION = "0.1.0"
+
+
+# Forbidden control sequences are detected by the shared scanner in `fcx.pubtex`
+# (the same engine the PubTeX validator gate uses):
+# - math: obvious raw-TeX injection (\input, \def, ...)
+# - code: any backslash control sequence (extra-conservative)
+
+
+def validate_tex_inline(nodes: List[Dict[str, Any]]) -> None:
+    """Reject the first forbidden control sequence in any math/code segment."""
+
+    hits = scan_nodes(nodes)
+    if hits:
+        h = hits[0]
+        raise ValueError(
+            f"PubTeXIR: forbidden control sequence in {h.kind} segment ({h.seq} at segment {h.seg} offset {h.pos})"
+        )
+
+
+def read_json(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _is_tex_passthrough(text_format: Any) -> bool:
+    return text_format in ("tex-inline", "tex-block")
+
+
+def _read_passthrough_block_text(b: Dict[str, Any]) -> str:
+    """Pick the correct string payload for passthrough blocks."""
+
+    # DocIR uses:
+    # - paragraph: `text`
+    # - clause/definition: `body`
+    # Keep this deterministic and explicit.
+    t = b.get("type")
+    if t == "paragraph":
+        return str(b.get("text", ""))
+    if t in ("clause", "definition"):
+        return str(b.get("body", ""))
+    return str(b.get("text", "") or b.get("body", ""))
+
+
+def _read_passthrough_heading_title(b: Dict[str, Any]) -> str:
+    return str(b.get("title", ""))
+
+
+def render_tex_inline(nodes: List[Dict[str, Any]]) -> str:
+    """Render constrained publication inline nodes.
+
+    All math/code segments are checked in a single scan before any output is
+    produced.
+    """
+
+    validate_tex_inline(nodes)
+    return _render_tex_inline(nodes)
+
+
+def _render_tex_inline(nodes: List[Dict[str, Any]]) -> str:
+    out: List[str] = []
+    for n in nodes:
+        if not isinstance(n, dict):
+            continue
+        t = n.get("t")
+        if t == "text":
+            out.append(tex_escape(str(n.get("s", ""))))
+        elif t == "math":
+            out.append(r"\\(" + str(n.get("s", "")) + r"\\)")
+        elif t == "code":
+            # Inline code (not block). Keep it simple and deterministic.
+            out.append(r"\\texttt{" + tex_escape(str(n.get("s", ""))) + "}")
+        elif t == "strong":
+            out.append(r"\textbf{" + _render_tex_inline(n.get("c") or []) + "}")
+        elif t == "emph":
+            out.append(r"\emph{" + _render_tex_inline(n.get("c") or []) + "}")
+        elif t == "link":
+            url = tex_escape(str(n.get("url", "")))
+            label = _render_tex_inline(n.get("c") or [])
+            out.append(r"\href{" + url + "}{" + label + "}")
+        else:
+            # Unknown nodes are rendered as escaped text for robustness.
+            out.append(tex_escape(str(n.get("s", ""))))
+    return "".join(out)
+
+
+def render_preamble(title: str) -> List[str]:
+    # NOTE: Title may contain TeX. For now we treat it as plain text and escape.
+    # If you want TeX titles, add an explicit, validated passthrough profile.
+    t = tex_escape(title or "Document")
+    return [
+        r"\documentclass[11pt]{article}",
+        r"\usepackage[T1]{fontenc}",
+        r"\usepackage[utf8]{inputenc}",
+        r"\usepackage{lmodern}",
+        r"\usepackage{hyperref}",
+        r"\usepackage{geometry}",
+        r"\usepackage{amsmath}",
+        r"\usepackage{amssymb}",
+        r"\usepackage{fancyvrb}",
+        r"\geometry{margin=1in}",
+        "",
+        rf"\title{{{t}}}",
+        r"\author{}",
+        r"\date{}",
+        "",
+        r"\begin{document}",
+        r"\maketitle",
+        "",
+    ]
+
+
+def render_block(b: Dict[str, Any]) -> List[str]:
+    t = b.get("type")
+
+    if t == "heading":
+        level = int(b.get("level", 1))
+
+        if _is_tex_passthrough(b.get("text_format")):
+            title = _read_passthrough_heading_title(b).strip()
+        else:
+            title = tex_escape(str(b.get("title", "")))
+
+        if level <= 1:
+            return [rf"\section*{{{title}}}", ""]
+        if level == 2:
+            return [rf"\subsection*{{{title}}}", ""]
+        if level == 3:
+            return [rf"\subsubsection*{{{title}}}", ""]
+        return [rf"\paragraph*{{{title}}}", ""]
+
+    if t == "paragraph":
+        if _is_tex_passthrough(b.get("text_format")):
+            raw = _read_passthrough_block_text(b).rstrip()
+            return [raw, ""] if raw else [""]
+
+        pub = b.get("pub_tex_inline")
+        if isinstance(pub, dict) and pub.get("kind") == "pub-tex-inline-v0":
+            return [render_tex_inline(pub.get("nodes") or []), ""]
+        txt = str(b.get("text", "")).strip()
+        return [tex_escape(txt), ""] if txt else [""]
+
+    if t in ("definition", "clause"):
+        # Allow TeX-capable labels via explicit passthrough.
+        if _is_tex_passthrough(b.get("text_format")):
+            label = str(b.get("label", ""))
+        else:
+            label = tex_escape(str(b.get("label", "")))
+
+        status = tex_escape(str(b.get("status", "")))
+        head = rf"\textbf{{{label}}}" + (rf" \emph{{({status})}}" if status else "")
+        out: List[str] = [head, ""]
+
+        if _is_tex_passthrough(b.get("text_format")):
+            raw = _read_passthrough_block_text(b).rstrip()
+            out.extend([raw, ""] if raw else [""])
+            return out
+
+        pub = b.get("pub_tex_inline")
+        if isinstance(pub, dict) and pub.get("kind") == "pub-tex-inline-v0":
+            out.append(render_tex_inline(pub.get("nodes") or []))
+            out.append("")
+            return out
+
+        body = str(b.get("body", "")).strip()
+        out.extend([tex_escape(body), ""] if body else [""])
+        return out
+
+    if t == "property":
+        label = tex_escape(str(b.get("label", "")))
+        status = tex_escape(str(b.get("status", "")))
+        head = rf"\textbf{{{label}}}" + (rf" \emph{{({status})}}" if status else "")
+        out: List[str] = [head, ""]
+
+        symbols = b.get("symbols") or []
+        if symbols:
+            out.append(r"\begin{itemize}")
+            for s in symbols:
+                sym_raw = str(s.get("sym", ""))
+                desc_raw = str(s.get("desc", ""))
+
+                # Symbols/descriptions are part of the TeX output; treat as plain text
+                # unless explicitly marked by the frame as TeX passthrough.
+                sym = sym_raw
+                desc = desc_raw
+                if not _is_tex_passthrough(b.get("text_format")):
+                    sym = tex_escape(sym_raw)
+                    desc = tex_escape(desc_raw)
+
+                if sym:
+                    out.append(rf"  \item \({sym}\): {desc}")
+                else:
+                    out.append(rf"  \item {desc}")
+            out.append(r"\end{itemize}")
+            out.append("")
+        return out
+
+    return [rf"\begin{{quote}}\textbf{{unhandled block}}: {tex_escape(str(t))}\end{{quote}}", ""]
+
+
+def iter_lines(front_matter: Dict[str, Any], blocks: Iterable[Any]) -> Iterator[str]:
+    title = str(front_matter.get("title", ""))
+
+    yield from render_preamble(title)
+
+    in_itemize = False
+    skipped_title_heading = False
+
+    for b in blocks:
+        if not isinstance(b, dict):
+            continue
+
+        if not skipped_title_heading and b.get("type") == "heading":
+            try:
+                level = int(b.get("level", 1))
+            except Exception:
+                level = 1
+            if level <= 1:
+                htitle = str(b.get("title", ""))
+                if title and htitle.strip() == title.strip():
+                    skipped_title_heading = True
+                    continue
+
+        if b.get("type") == "list_item" and not in_itemize:
+            yield r"\begin{itemize}"
+            in_itemize = True
+
+        if b.get("type") != "list_item" and in_itemize:
+            yield r"\end{itemize}"
+            yield ""
+            in_itemize = False
+
+        yield from render_block(b)
+
+    if in_itemize:
+        yield r"\end{itemize}"
+        yield ""
+
+    yield r"\end{document}"
+
+
+def render_tex(docir: Dict[str, Any]) -> str:
+    return join_lines(iter_lines(docir.get("front_matter", {}), docir.get("blocks", [])))
+
+
+def render_tex_stream(front_matter: Dict[str, Any], blocks: Iterable[Any], write: Callable[[str], Any]) -> None:
+    """Print blocks as they arrive (e.g. from a DocIR JSON Lines stream); same bytes as `render_tex`."""
+
+    write_lines(iter_lines(front_matter, blocks), write)
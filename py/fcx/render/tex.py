@@ -0,0 +1,349 @@
+"""Generic LaTeX printer over DocIR (a `main.tex` bundle).
+
+Notes:
+- Pure pretty-printer over DocIR.
+- Designed to be consumed by tools/pub_build_pdf/run.
+
+TeX passthrough (repo-local, opt-in):
+- If a DocIR block has `text_format` set to `tex-inline` or `tex-block`, the
+  corresponding string payload is emitted verbatim (no escaping / markup parsing).
+- This is intentionally unsafe unless paired with dedicated validation.
+  Enforcement is delegated to repo policy gates.
+
+CLI: `tools/render_tex_doc/run`.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from tools.markup.inline_markup_k1 import (
+    B_CODE_FENCE,
+    B_PARAGRAPH,
+    T_CODE,
+    T_EMPH,
+    T_LINK,
+    T_MATH,
+    T_STRONG,
+    T_TEXT,
+    MarkupDoc,
+    as_markup_doc,
+)
+
+from fcx.escape import normalize_tex_unicode
+from fcx.escape import tex_escape_doc as tex_escape
+
+from .lines import join_lines, write_lines
+
+
+# Bump whenever rendered bytes change for the same DocIR.
+RENDERER_VERSION = "0.1.0"
+
+
+def read_json(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def tex_escape_with_unicode_norm(s: str) -> str:
+    """Escape plain text after normalizing unicode into TeX macros.
+
+    This is ONLY safe when the resulting string is emitted into a TeX context
+    that expects commands (typically math mode), or when the caller trusts that
+    macros are desired.
+    """
+
+    return tex_escape(normalize_tex_unicode(s))
+
+
+def render_inline_nodes_tex(nodes: Tuple[Any, ...]) -> str:
+    out: List[str] = []
+    for n in nodes:
+        tag = n[0]
+        if tag == T_TEXT:
+            out.append(tex_escape(n[1]))
+        elif tag == T_EMPH:
+            out.append(r"\emph{" + render_inline_nodes_tex(n[1]) + "}")
+        elif tag == T_STRONG:
+            out.append(r"\textbf{" + render_inline_nodes_tex(n[1]) + "}")
+        elif tag == T_CODE:
+            out.append(r"\texttt{" + tex_escape(n[1]) + "}")
+        elif tag == T_MATH:
+            out.append("$" + normalize_tex_unicode(n[1]) + "$")
+        elif tag == T_LINK:
+            out.append(r"\href{" + tex_escape(n[2]) + "}{" + render_inline_nodes_tex(n[1]) + "}")
+        else:
+            out.append(tex_escape(str(n[1].get("s", ""))))
+    return "".join(out)
+
+
+def render_inline_markup_k1_tex(doc: MarkupDoc) -> List[str]:
+    out: List[str] = []
+    for b in doc.blocks:
+        tag = b[0]
+        if tag == B_CODE_FENCE:
+            # Use fancyvrb for better control and to avoid edge cases with verbatim.
+            out.append(r"\begin{Verbatim}[commandchars=\\\{\},fontsize=\small]")
+            out.extend(b[2].split("\n"))
+            out.append(r"\end{Verbatim}")
+            out.append("")
+        elif tag == B_PARAGRAPH:
+            out.append(render_inline_nodes_tex(b[1]))
+            out.append("")
+        else:
+            out.append(tex_escape(f"[unhandled:{b[1].get('t')}]"))
+            out.append("")
+    return out
+
+
+def render_body_tex(b: Dict[str, Any]) -> List[str]:
+    # TeX passthrough: emit body verbatim.
+    if _is_tex_passthrough(b.get("text_format")):
+        raw = _passthrough_block_text(b).rstrip()
+        return [raw, ""] if raw else [""]
+
+    doc = as_markup_doc(b.get("body_markup"))
+    if doc is not None:
+        return render_inline_markup_k1_tex(doc)
+
+    body = str(b.get("body", "")).strip()
+    return [tex_escape(body), ""] if body else [""]
+
+
+def render_preamble(title: str) -> List[str]:
+    # Title is mostly plain text, but this repo commonly uses simple $...$ math
+    # in titles (e.g. $\Sigma$). Escaping the whole title corrupts such math.
+    #
+    # Policy (minimal, deterministic):
+    # - Split on $...$ pairs (non-nested).
+    # - Outside math: escape as plain text.
+    # - Inside math: normalize unicode and emit inside $...$ without further escaping.
+    def render_title_mixed(s: str) -> str:
+        s = s or ""
+        parts: List[str] = []
+        buf: List[str] = []
+        in_math = False
+        for ch in s:
+            if ch == "$":
+                frag = "".join(buf)
+                buf = []
+                if in_math:
+                    # Emit as $...$ (standard LaTeX math mode)
+                    parts.append("$" + normalize_tex_unicode(frag) + "$")
+                else:
+                    parts.append(tex_escape(frag))
+                in_math = not in_math
+            else:
+                buf.append(ch)
+        # trailing
+        frag = "".join(buf)
+        if in_math:
+            # unmatched '$' -> treat literally as text
+            parts.append(tex_escape("$" + frag))
+        else:
+            parts.append(tex_escape(frag))
+        return "".join(parts)
+
+    t = render_title_mixed(title or "Document")
+    return [
+        r"\documentclass[11pt]{article}",
+        r"\usepackage[T1]{fontenc}",
+        r"\usepackage[utf8]{inputenc}",
+        r"\usepackage{lmodern}",
+        r"\usepackage{hyperref}",
+        r"\usepackage{geometry}",
+        r"\usepackage{amsmath}",
+        r"\usepackage{amssymb}",
+        r"\usepackage{fancyvrb}",
+        r"\geometry{margin=1in}",
+        "",
+        rf"\title{{{t}}}",
+        r"\author{}",
+        r"\date{}",
+        "",
+        r"\begin{document}",
+        r"\maketitle",
+        "",
+    ]
+
+
+def render_block(b: Dict[str, Any]) -> List[str]:
+    t = b.get("type")
+
+    if t == "heading":
+        level = int(b.get("level", 1))
+        if _is_tex_passthrough(b.get("text_format")):
+            title = _passthrough_block_text(b).strip()
+        else:
+            title = tex_escape(str(b.get("title", "")))
+
+        if level <= 1:
+            return [rf"\section*{{{title}}}", ""]
+        if level == 2:
+            return [rf"\subsection*{{{title}}}", ""]
+        if level == 3:
+            return [rf"\subsubsection*{{{title}}}", ""]
+        return [rf"\paragraph*{{{title}}}", ""]
+
+    if t == "paragraph":
+        if _is_tex_passthrough(b.get("text_format")):
+            raw = _passthrough_block_text(b).rstrip()
+            return [raw, ""] if raw else [""]
+
+        doc = as_markup_doc(b.get("body_markup"))
+        if doc is not None:
+            return render_inline_markup_k1_tex(doc)
+        txt = str(b.get("text", "")).strip()
+        return [tex_escape(txt), ""] if txt else [""]
+
+    if t in ("definition", "clause"):
+        # Allow labels to pass through in tex-* mode.
+        if _is_tex_passthrough(b.get("text_format")):
+            label = str(b.get("label", ""))
+        else:
+            label = tex_escape(str(b.get("label", "")))
+
+        status = tex_escape(str(b.get("status", "")))
+        head = rf"\textbf{{{label}}}" + (rf" \emph{{({status})}}" if status else "")
+        out: List[str] = [head, ""]
+        out.extend(render_body_tex(b))
+        return out
+
+    if t == "property":
+        label = tex_escape(str(b.get("label", "")))
+        status = tex_escape(str(b.get("status", "")))
+        head = rf"\textbf{{{label}}}" + (rf" \emph{{({status})}}" if status else "")
+        out: List[str] = [head, ""]
+
+        # Optional property body text (often present when symbols need context).
+        body = str(b.get("body", "")).strip()
+        if as_markup_doc(b.get("body_markup")) is not None or body:
+            out.extend(render_body_tex(b))
+
+        symbols = b.get("symbols") or []
+        if symbols:
+            out.append(r"\begin{itemize}")
+            for s in symbols:
+                sym_raw = str(s.get("sym", ""))
+
+                # In tex-* mode treat symbol fields as raw TeX.
+                if _is_tex_passthrough(b.get("text_format")):
+                    # YAML/JSON escaping can yield doubled backslashes; normalize for TeX output.
+                    sym_math = sym_raw.replace("\\\\", "\\")
+                    desc_rendered = str(s.get("desc", "") or "").replace("\\\\", "\\")
+                else:
+                    sym_math = normalize_tex_unicode(sym_raw)
+                    # Prefer markup-aware descriptions when present.
+                    desc_rendered = _render_inline_block_or_plain(s.get("desc_markup") or s.get("desc"))
+
+                if sym_math:
+                    out.append(rf"  \item \({sym_math}\): {desc_rendered}")
+                else:
+                    out.append(rf"  \item {desc_rendered}")
+            out.append(r"\end{itemize}")
+            out.append("")
+        return out
+
+    if t == "math_block":
+        # DocIR may emit display math explicitly.
+        expr = normalize_tex_unicode(str(b.get("text", "") or b.get("expr", "") or "").strip())
+        if not expr:
+            return [""]
+        return [r"\[", expr, r"\]", ""]
+
+    if t == "list_item":
+        txt = tex_escape(str(b.get("text", "")))
+        return [rf"\item {txt}"]
+
+    if t == "note":
+        kind = tex_escape(str(b.get("kind", "note")))
+        txt = tex_escape(str(b.get("text", "")))
+        return [rf"\begin{{quote}}\textbf{{{kind}}}: {txt}\end{{quote}}", ""]
+
+    return [
+        rf"\begin{{quote}}\textbf{{unhandled block}}: {tex_escape(str(t))}\end{{quote}}",
+        "",
+    ]
+
+
+def iter_lines(front_matter: Dict[str, Any], blocks: Iterable[Any]) -> Iterator[str]:
+    title = str(front_matter.get("title", ""))
+
+    yield from render_preamble(title)
+
+    in_itemize = False
+    skipped_title_heading = False
+
+    for b in blocks:
+        if not isinstance(b, dict):
+            continue
+
+        # Avoid duplicate top-level heading:
+        # DocIR commonly emits a first level-1 heading that equals the document title,
+        # but we already render `\title{...}` + `\maketitle` in the preamble.
+        if not skipped_title_heading and b.get("type") == "heading":
+            try:
+                level = int(b.get("level", 1))
+            except Exception:
+                level = 1
+            if level <= 1:
+                htitle = str(b.get("title", ""))
+                if title and htitle.strip() == title.strip():
+                    skipped_title_heading = True
+                    continue
+
+        # Ensure list items are wrapped in an itemize.
+        if b.get("type") == "list_item" and not in_itemize:
+            yield r"\begin{itemize}"
+            in_itemize = True
+
+        if b.get("type") != "list_item" and in_itemize:
+            yield r"\end{itemize}"
+            yield ""
+            in_itemize = False
+
+        yield from render_block(b)
+
+    if in_itemize:
+        yield r"\end{itemize}"
+        yield ""
+
+    yield r"\end{document}"
+
+
+def render_tex(docir: Dict[str, Any]) -> str:
+    # Deterministic whitespace.
+    return join_lines(iter_lines(docir.get("front_matter", {}), docir.get("blocks", [])))
+
+
+def render_tex_stream(front_matter: Dict[str, Any], blocks: Iterable[Any], write: Callable[[str], Any]) -> None:
+    """Print blocks as they arrive (e.g. from a DocIR JSON Lines stream); same bytes as `render_tex`."""
+
+    write_lines(iter_lines(front_matter, blocks), write)
+
+
+def _render_inline_block_or_plain(value: Any) -> str:
+    """Render a field that can be either plain text or InlineMarkup-K1 AST."""
+
+    doc = as_markup_doc(value)
+    if doc is not None:
+        return "\n".join(render_inline_markup_k1_tex(doc)).rstrip("\n")
+    if isinstance(value, str):
+        return tex_escape(value)
+    return ""
+
+
+def _is_tex_passthrough(fmt: Any) -> bool:
+    return fmt in ("tex-inline", "tex-block")
+
+
+def _passthrough_block_text(b: Dict[str, Any]) -> str:
+    t = b.get("type")
+    if t == "paragraph":
+        return str(b.get("text", ""))
+    if t in ("definition", "clause"):
+        return str(b.get("body", ""))
+    if t == "heading":
+        return str(b.get("title", ""))
+    return str(b.get("text", "") or b.get("body", "") or b.get("title", ""))
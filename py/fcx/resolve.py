@@ -0,0 +1,306 @@
+"""Version-aware FrameURL resolution.
+
+FrameURLs are versionless (FrameURL-K1); a reference may pin a version as
+`<graph_id>@<spec>`, where <spec> is
+- an exact version (`1.2.3`, or any version string a frame declares),
+- a range: comparators `>=1.0.0 <2.0.0`, `^1.2`, `~1.2.3`, x-ranges
+  `1.x` / `1.2.*` / `*`, alternatives joined with `||` (npm semantics;
+  prereleases only match ranges that mention a prerelease).
+
+A bare graph_id resolves to its highest version. Versions come from each
+frame's `version` (else its `v<version>` directory) via the corpus index.
+
+`Resolver` keeps, per graph_id, the versions sorted by SemVer precedence,
+so a lookup is two `bisect`s per range alternative. A reference is
+- `ok`: one best version, provided by one frame
+- `unresolved`: unknown graph_id, or no version matches
+- `ambiguous`: the best match ties with another version (build metadata
+  only) or is provided by several frames
+- `invalid`: the spec is not an exact version or a range
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fcx.index import FrameIndex, FrameRecord
+
+
+_SEMVER_RE = re.compile(
+    r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-((?:0|[1-9]\d*|\d*[A-Za-z-][0-9A-Za-z-]*)(?:\.(?:0|[1-9]\d*|\d*[A-Za-z-][0-9A-Za-z-]*))*))?"
+    r"(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$"
+)
+_PARTIAL_RE = re.compile(
+    r"^(?:v)?(\d+|[xX*])(?:\.(\d+|[xX*]))?(?:\.(\d+|[xX*]))?"
+    r"(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?$"
+)
+_COMPARATOR_RE = re.compile(r"^(>=|<=|>|<|=|\^|~)?\s*(\S*)$")
+
+# SemVer precedence key: (major, minor, patch, pre) with pre = (1,) for a
+# release, (0, ids...) for a prerelease and (0,) below every prerelease.
+VersionKey = Tuple[int, int, int, Tuple]
+_BELOW_PRE: Tuple = (0,)
+
+
+def _pre_key(pre: Optional[str]) -> Tuple:
+    if pre is None:
+        return (1,)
+    return (0,) + tuple((0, int(p)) if p.isdigit() else (1, p) for p in pre.split("."))
+
+
+def version_key(version: str) -> Optional[VersionKey]:
+    """SemVer 2.0 precedence key of a version string (None if not SemVer)."""
+
+    m = _SEMVER_RE.match(version)
+    if m is None:
+        return None
+    return (int(m.group(1)), int(m.group(2)), int(m.group(3)), _pre_key(m.group(4)))
+
+
+# A bound is (key, inclusive); None is unbounded.
+Bound = Optional[Tuple[VersionKey, bool]]
+Interval = Tuple[Bound, Bound]
+
+
+class RangeError(ValueError):
+    pass
+
+
+def _partial(text: str) -> Tuple[List[Optional[int]], Optional[str]]:
+    m = _PARTIAL_RE.match(text)
+    if m is None:
+        raise RangeError(f"bad version: {text!r}")
+    parts: List[Optional[int]] = []
+    for g in m.group(1, 2, 3):
+        if g is None or not g.isdigit():
+            break
+        parts.append(int(g))
+    pre = m.group(4) if len(parts) == 3 else None
+    return parts, pre
+
+
+def _floor(parts: List[Optional[int]], pre: Optional[str]) -> VersionKey:
+    p = (parts + [0, 0, 0])[:3]
+    return (p[0] or 0, p[1] or 0, p[2] or 0, _pre_key(pre) if len(parts) == 3 else (1,))
+
+
+def _bump(parts: List[Optional[int]], i: int) -> VersionKey:
+    """Lowest key above every version sharing parts[:i+1] (i = index bumped)."""
+
+    p = [x or 0 for x in parts[: i + 1]]
+    p[i] += 1
+    p = (p + [0, 0, 0])[:3]
+    return (p[0], p[1], p[2], _BELOW_PRE)
+
+
+def _comparator(token: str) -> Interval:
+    m = _COMPARATOR_RE.match(token)
+    if m is None:
+        raise RangeError(f"bad comparator: {token!r}")
+    op, ver = m.group(1) or "", m.group(2)
+    if ver in ("", "*", "x", "X"):
+        if op in ("", "=", ">=", "<=", "^", "~"):
+            return (None, None)
+        raise RangeError(f"bad comparator: {token!r}")
+    parts, pre = _partial(ver)
+    n = len(parts)
+    if n == 0:
+        return (None, None)
+    lo = _floor(parts, pre)
+
+    if op in ("", "="):
+        return ((lo, True), (lo, True)) if n == 3 else ((lo, True), (_bump(parts, n - 1), False))
+    if op == "^":
+        # Bump the first non-zero part (of those given); ^0.0 -> <0.1.0, ^0 -> <1.0.0.
+        i = next((k for k, x in enumerate(parts) if x), n - 1)
+        return ((lo, True), (_bump(parts, i), False))
+    if op == "~":
+        return ((lo, True), (_bump(parts, 1 if n >= 2 else 0), False))
+    if op == ">=":
+        return ((lo, True), None)
+    if op == ">":
+        return ((lo, False), None) if n == 3 else ((_bump(parts, n - 1), True), None)
+    if op == "<":
+        return (None, (lo if n == 3 else _floor(parts, None)[:3] + (_BELOW_PRE,), False))
+    # "<="
+    return (None, (lo, True)) if n == 3 else (None, (_bump(parts, n - 1), False))
+
+
+def _intersect(a: Interval, b: Interval) -> Interval:
+    lo = max((x for x in (a[0], b[0]) if x is not None), key=lambda x: (x[0], not x[1]), default=None)
+    hi = min((x for x in (a[1], b[1]) if x is not None), key=lambda x: (x[0], x[1]), default=None)
+    return (lo, hi)
+
+
+@dataclass(frozen=True)
+class VersionRange:
+    """A parsed range: alternatives (OR) of intervals; `prerelease` if any bound names one."""
+
+    intervals: Tuple[Interval, ...]
+    prerelease: bool
+
+
+@lru_cache(maxsize=4096)
+def parse_range(spec: str) -> VersionRange:
+    """Parse an npm-style range (see module doc); RangeError if malformed."""
+
+    alts: List[Interval] = []
+    pre = False
+    for alt in spec.split("||"):
+        # Allow `>= 1.0.0` as well as `>=1.0.0`.
+        tokens = re.sub(r"(>=|<=|>|<|=|\^|~)\s+", r"\1", alt.strip()).split()
+        iv: Interval = (None, None)
+        for t in tokens or ["*"]:
+            iv = _intersect(iv, _comparator(t))
+            pre = pre or "-" in t.lstrip("<>=^~v").split("+")[0]
+        alts.append(iv)
+    return VersionRange(tuple(alts), pre)
+
+
+@dataclass(frozen=True)
+class Resolution:
+    ref: str
+    graph_id: str
+    spec: str  # "" for a bare graph_id
+    status: str  # ok | unresolved | ambiguous | invalid
+    version: Optional[str] = None
+    path: Optional[str] = None
+    candidates: Tuple[str, ...] = ()  # tied versions or providing frames when ambiguous
+    message: str = ""
+
+    def to_obj(self) -> Dict[str, object]:
+        return {
+            "ref": self.ref,
+            "graph_id": self.graph_id,
+            "spec": self.spec,
+            "status": self.status,
+            "version": self.version,
+            "path": self.path,
+            "candidates": list(self.candidates),
+            "message": self.message,
+        }
+
+
+def split_ref(ref: str) -> Tuple[str, str]:
+    """(graph_id, version spec) of `graph_id[@spec]`."""
+
+    gid, sep, spec = ref.partition("@")
+    return gid, spec.strip() if sep else ""
+
+
+@dataclass
+class _Versions:
+    keys: List[VersionKey] = field(default_factory=list)  # SemVer versions, sorted
+    names: List[str] = field(default_factory=list)  # version strings, parallel to keys
+    release_keys: List[VersionKey] = field(default_factory=list)
+    release_names: List[str] = field(default_factory=list)
+    paths: Dict[str, List[str]] = field(default_factory=dict)  # version string -> frame paths
+
+
+class Resolver:
+    """graph_id -> sorted versions; resolves `graph_id[@spec]` references."""
+
+    def __init__(self, frames: Iterable[Tuple[str, str, str]]) -> None:
+        """`frames`: (graph_id, version, path) triples."""
+
+        by_gid: Dict[str, _Versions] = {}
+        for gid, ver, path in frames:
+            by_gid.setdefault(gid, _Versions()).paths.setdefault(ver, []).append(path)
+        for v in by_gid.values():
+            keyed = sorted((k, name) for name in v.paths if (k := version_key(name)) is not None)
+            v.keys = [k for k, _ in keyed]
+            v.names = [name for _, name in keyed]
+            v.release_keys = [k for k, _ in keyed if k[3] == (1,)]
+            v.release_names = [name for k, name in keyed if k[3] == (1,)]
+            for paths in v.paths.values():
+                paths.sort()
+        self._by_gid = by_gid
+        self._memo: Dict[str, Resolution] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[FrameRecord]) -> "Resolver":
+        triples = []
+        for rec in records:
+            if rec.status != "ok" or not rec.graph_id:
+                continue
+            ver = rec.version
+            if ver is None:
+                vdir = rec.path.rsplit("/", 2)[-2] if rec.path.count("/") >= 2 else ""
+                ver = vdir[1:] if vdir.startswith("v") else ""
+            triples.append((rec.graph_id, ver, rec.path))
+        return cls(triples)
+
+    @classmethod
+    def from_index(cls, idx: FrameIndex) -> "Resolver":
+        return cls.from_records(idx.records())
+
+    def graph_ids(self) -> List[str]:
+        return sorted(self._by_gid)
+
+    def versions(self, graph_id: str) -> List[str]:
+        """SemVer versions of graph_id, ascending (non-SemVer versions excluded)."""
+
+        v = self._by_gid.get(graph_id)
+        return list(v.names) if v is not None else []
+
+    def resolve(self, ref: str) -> Resolution:
+        hit = self._memo.get(ref)
+        if hit is None:
+            hit = self._memo[ref] = self._resolve(ref)
+        return hit
+
+    def _resolve(self, ref: str) -> Resolution:
+        gid, spec = split_ref(ref)
+        v = self._by_gid.get(gid)
+        if v is None:
+            return Resolution(ref, gid, spec, "unresolved", message=f"unknown graph_id: {gid}")
+
+        if not spec:
+            if not v.keys:
+                # Only non-SemVer versions: any frame of the graph_id will do.
+                name = sorted(v.paths)[-1]
+                return self._found(ref, gid, spec, v, name, ())
+            names, keys = (v.release_names, v.release_keys) if v.release_keys else (v.names, v.keys)
+            return self._found(ref, gid, spec, v, names[-1], self._ties(keys, names, len(keys) - 1))
+
+        if spec in v.paths:
+            return self._found(ref, gid, spec, v, spec, ())
+        try:
+            rng = parse_range(spec)
+        except RangeError as e:
+            return Resolution(ref, gid, spec, "invalid", message=str(e))
+
+        keys, names = (v.keys, v.names) if rng.prerelease else (v.release_keys, v.release_names)
+        best = -1
+        for lo, hi in rng.intervals:
+            i = 0 if lo is None else (bisect_left(keys, lo[0]) if lo[1] else bisect_right(keys, lo[0]))
+            j = len(keys) if hi is None else (bisect_right(keys, hi[0]) if hi[1] else bisect_left(keys, hi[0]))
+            if i < j:
+                best = max(best, j - 1)
+        if best < 0:
+            return Resolution(ref, gid, spec, "unresolved", message=f"no version of {gid} matches {spec!r}")
+        return self._found(ref, gid, spec, v, names[best], self._ties(keys, names, best))
+
+    @staticmethod
+    def _ties(keys: List[VersionKey], names: List[str], i: int) -> Tuple[str, ...]:
+        """Other versions with the same precedence as names[i] (differing in build metadata)."""
+
+        lo, hi = bisect_left(keys, keys[i]), bisect_right(keys, keys[i])
+        return tuple(names[k] for k in range(lo, hi) if k != i)
+
+    @staticmethod
+    def _found(ref: str, gid: str, spec: str, v: _Versions, name: str, ties: Tuple[str, ...]) -> Resolution:
+        paths = v.paths[name]
+        if ties:
+            cands = tuple(sorted((name,) + ties))
+            return Resolution(ref, gid, spec, "ambiguous", name, paths[0], cands, f"versions tie: {', '.join(cands)}")
+        if len(paths) > 1:
+            return Resolution(
+                ref, gid, spec, "ambiguous", name, paths[0], tuple(paths), f"{gid}@{name} is provided by {len(paths)} frames"
+            )
+        return Resolution(ref, gid, spec, "ok", name, paths[0])
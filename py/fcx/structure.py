@@ -0,0 +1,169 @@
+"""Merkle-style structural digests of frames.
+
+A frame's structure is what `tools/semantic_invariants` protects: the
+frame's graph_id and version, the set of node ids, each node's protected
+fields and attr keys, and the edge multiset. It is summarised as
+- one hash per node over its protected fields and sorted attr keys,
+- one hash over the sorted edge (from, to, type) list,
+- a root hash over graph_id, version, the sorted (node id, node hash) list
+  and the edge hash.
+
+Equal roots mean no structural change, so an unchanged frame is cleared by
+comparing one digest. `diff_digests` names the nodes whose hash changed
+without walking the YAML. Text fields (text, summary, title, ...) are not
+hashed.
+
+Digests are a function of the frame bytes and are cached as JSON under
+`structure/` in the shared cache (`fcx.cache`). `fcx digest --frame ...`
+prints one and `validate-frame` records the root as the `structure.root`
+receipt.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from fcx.cache import ContentCache, cache_key
+from fcx.util import canonical_json, sha256_bytes, sha256_text, stable_json
+
+
+# Bump whenever the hashed fields or the encoding change.
+STRUCTURE_DIGEST_VERSION = "0.3.0"
+
+# The node fields tools/semantic_invariants forbids changing (its PROTECTED_FIELDS).
+PROTECTED_NODE_FIELDS = ("graph_id", "version", "id", "kind", "status", "profile", "law_id", "law_version")
+PROTECTED_FRAME_FIELDS = ("graph_id", "version")
+
+
+@dataclass(frozen=True)
+class StructuralDigest:
+    root: str
+    header: str
+    edges: str
+    nodes: Dict[str, str] = field(default_factory=dict)
+
+    def to_obj(self) -> Dict[str, Any]:
+        return {
+            "version": STRUCTURE_DIGEST_VERSION,
+            "root": self.root,
+            "header": self.header,
+            "edges": self.edges,
+            "nodes": dict(sorted(self.nodes.items())),
+        }
+
+    @staticmethod
+    def from_obj(obj: Dict[str, Any]) -> "StructuralDigest":
+        return StructuralDigest(root=obj["root"], header=obj["header"], edges=obj["edges"], nodes=dict(obj["nodes"]))
+
+
+def _canon(obj: Any) -> str:
+    # canonical_json without the newline: mixed keys, dates and sets encode deterministically.
+    return canonical_json(obj)[:-1]
+
+
+def _attr_keys(node: Dict[str, Any]) -> List[Any]:
+    attrs = node.get("attrs", [])
+    if not isinstance(attrs, list):
+        return []
+    return sorted({a.get("key") for a in attrs if isinstance(a, dict)}, key=_canon)
+
+
+def node_hash(node: Dict[str, Any]) -> str:
+    """Hash of a node's protected fields and attr keys."""
+
+    obj = {f: node.get(f) for f in PROTECTED_NODE_FIELDS}
+    obj["attrs"] = _attr_keys(node)
+    return sha256_text(_canon(obj))
+
+
+def edge_hash(edges: Any) -> str:
+    """Hash of the sorted (from, to, type) multiset of a frame's edges."""
+
+    if not isinstance(edges, list):
+        edges = []
+    rows = sorted(_canon([e.get("from"), e.get("to"), e.get("type")]) for e in edges if isinstance(e, dict))
+    return sha256_text("".join(rows))
+
+
+def structural_digest(data: Any) -> Optional[StructuralDigest]:
+    """Digest of a parsed frame; None if it is not a mapping."""
+
+    if not isinstance(data, dict):
+        return None
+
+    nodes: Dict[str, str] = {}
+    raw_nodes = data.get("nodes", [])
+    for n in raw_nodes if isinstance(raw_nodes, list) else []:
+        if isinstance(n, dict):
+            nid = n.get("id")
+            # Last node wins for duplicate ids, as in semantic_invariants.
+            nodes[str(nid) if nid else ""] = node_hash(n)
+
+    header = sha256_text(_canon({f: data.get(f) for f in PROTECTED_FRAME_FIELDS}))
+    edges = edge_hash(data.get("edges", []))
+    node_rows = "".join(f"{nid}\0{h}\n" for nid, h in sorted(nodes.items()))
+    root = sha256_text(f"{STRUCTURE_DIGEST_VERSION}\0{header}\0{edges}\0{sha256_text(node_rows)}\n")
+    return StructuralDigest(root=root, header=header, edges=edges, nodes=nodes)
+
+
+@dataclass(frozen=True)
+class DigestDiff:
+    header_changed: bool
+    edges_changed: bool
+    nodes_added: Tuple[str, ...]
+    nodes_removed: Tuple[str, ...]
+    nodes_changed: Tuple[str, ...]
+
+    @property
+    def unchanged(self) -> bool:
+        return not (
+            self.header_changed or self.edges_changed or self.nodes_added or self.nodes_removed or self.nodes_changed
+        )
+
+
+def diff_digests(a: StructuralDigest, b: StructuralDigest) -> DigestDiff:
+    """Localize structural changes from two digests (node ids sorted)."""
+
+    if a.root == b.root:
+        return DigestDiff(False, False, (), (), ())
+    return DigestDiff(
+        header_changed=a.header != b.header,
+        edges_changed=a.edges != b.edges,
+        nodes_added=tuple(sorted(set(b.nodes) - set(a.nodes))),
+        nodes_removed=tuple(sorted(set(a.nodes) - set(b.nodes))),
+        nodes_changed=tuple(sorted(nid for nid in a.nodes if nid in b.nodes and a.nodes[nid] != b.nodes[nid])),
+    )
+
+
+def structure_cache(root: Path) -> ContentCache:
+    """The structural digest namespace of the cache rooted at `root` (see `fcx.cache.cache_root`)."""
+
+    return ContentCache(root, "structure")
+
+
+def cached_structural_digest(
+    src: bytes, cache: Optional[ContentCache] = None
+) -> Tuple[Optional[StructuralDigest], Any]:
+    """(digest of frame bytes, parsed frame or None when served from cache).
+
+    Raises yaml.YAMLError (or UnicodeDecodeError) if the frame must be
+    parsed and cannot be.
+    """
+
+    key = cache_key({"frame_sha256": sha256_bytes(src), "structure": STRUCTURE_DIGEST_VERSION})
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            obj = json.loads(hit.decode("utf-8"))
+            return (StructuralDigest.from_obj(obj) if obj else None), None
+
+    data = yaml.safe_load(src.decode("utf-8"))
+    digest = structural_digest(data)
+    if cache is not None:
+        cache.put(key, stable_json(digest.to_obj() if digest is not None else None).encode("utf-8"))
+    return digest, data
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import filecmp
+import base64
+import datetime
 import hashlib
 import json
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterator
 
 
 def stable_json(obj: Any) -> str:
@@ -18,6 +24,77 @@ def sha256_text(s: str) -> str:
     return sha256_bytes(s.encode("utf-8"))
 
 
+def _compact(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def canonical_tree(obj: Any) -> Any:
+    """A parsed YAML tree with only JSON types, for hashing.
+
+    - mapping keys become strings (non-string keys their compact canonical
+      JSON, e.g. `1`), so mixed int/str keys still sort; if two keys collide
+      (`1` and `"1"`) the entry with the larger canonical value is kept
+    - dates and timestamps become `{"!!timestamp": isoformat}` and sets
+      `{"!!set": [...]}` (sorted by canonical JSON), so neither depends on
+      the Python version nor equals the quoted string or plain list
+    - bytes (`!!binary`) become `{"!!binary": base64}`
+    """
+
+    if isinstance(obj, dict):
+        out: dict = {}
+        for k, v in obj.items():
+            ck = canonical_tree(k)
+            ks = ck if isinstance(ck, str) else _compact(ck)
+            cv = canonical_tree(v)
+            if ks in out:
+                cv = max(out[ks], cv, key=_compact)
+            out[ks] = cv
+        return out
+    if isinstance(obj, (list, tuple)):
+        return [canonical_tree(v) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return {"!!set": sorted((canonical_tree(v) for v in obj), key=_compact)}
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return {"!!timestamp": obj.isoformat()}
+    if isinstance(obj, bytes):
+        return {"!!binary": base64.b64encode(obj).decode("ascii")}
+    return obj
+
+
+def canonical_json(obj: Any) -> str:
+    """stable_json of `canonical_tree(obj)`: any tree `yaml.safe_load` returns encodes."""
+
+    return _compact(canonical_tree(obj)) + "\n"
+
+
+def semantic_sha256(obj: Any) -> str:
+    """sha256 of the canonical JSON of a parsed tree.
+
+    Unlike the byte hash it ignores formatting, comments, quoting style and
+    mapping key order, so reformatting a frame leaves it unchanged.
+    """
+
+    return sha256_text(canonical_json(obj))
+
+
+# One read buffer per thread, reused across sha256_file calls.
+_HASH_BUF = threading.local()
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    buf = getattr(_HASH_BUF, "buf", None)
+    if buf is None or len(buf) != chunk_size:
+        buf = _HASH_BUF.buf = bytearray(chunk_size)
+    h = hashlib.sha256()
+    with path.open("rb", buffering=0) as f, memoryview(buf) as view:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
@@ -28,3 +105,40 @@ def write_text_deterministic(path: Path, s: str) -> None:
     if not s.endswith("\n"):
         s += "\n"
     path.write_text(s, encoding="utf-8", newline="\n")
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """Write data to path only if its bytes differ; replace atomically. Returns True if written."""
+
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+@contextmanager
+def open_if_changed(path: Path, buffering: int = 1 << 20) -> Iterator[IO[str]]:
+    """Stream UTF-8 text to path through a buffered temp file.
+
+    On success the temp file replaces path atomically, unless the bytes are
+    identical, in which case path (and its mtime) is left untouched.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8", newline="\n", buffering=buffering) as fh:
+            yield fh
+        if path.is_file() and filecmp.cmp(tmp, path, shallow=False):
+            tmp.unlink()
+        else:
+            os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
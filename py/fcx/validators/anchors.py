@@ -0,0 +1,107 @@
+"""Anchor collision validator (deterministic).
+
+Anchors must be unique within a rendered document, and cross-doc links need
+node anchors that are unique across the corpus.
+
+- ANCHOR.E.DUPLICATE_IN_FRAME: two ids of one frame (node or pseudo ids such
+  as `kind:*` / `refs`) derive the same anchor.
+- ANCHOR.W.DUPLICATE_IN_CORPUS: a node anchor occurs in frames of more than one
+  graph_id (versions of the same graph_id may share anchors). Reported as a
+  warning unless `strict`, since node ids like `section.1.charter` are
+  currently reused across graphs.
+
+Per-frame anchor tables come from the persisted anchor cache (`fcx.anchors`).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+import yaml
+
+from fcx.anchors import anchor_cache, anchor_table_cached
+from fcx.cache import cache_root
+from fcx.docir import anchor_ids, parse_nodes
+from fcx.kernel import KernelCtx
+from fcx.util import read_text
+from fcx.violations import Violation
+
+
+ANCHOR_E = {
+    "DUPLICATE_IN_FRAME": "ANCHOR.E.DUPLICATE_IN_FRAME",
+    "DUPLICATE_IN_CORPUS": "ANCHOR.E.DUPLICATE_IN_CORPUS",
+}
+
+ANCHOR_W = {
+    "DUPLICATE_IN_CORPUS": "ANCHOR.W.DUPLICATE_IN_CORPUS",
+}
+
+
+def _iter_frames(root: Path) -> List[Path]:
+    return sorted(root.glob("frames/**/v*/frame.yml"))
+
+
+def validate_anchors(ctx: KernelCtx, *, strict: bool = False) -> Tuple[List[Violation], List[Violation]]:
+    """Check anchor uniqueness within each frame and across the corpus.
+
+    Returns (violations, warnings).
+    """
+    root = Path(ctx.repo_root)
+    cache = anchor_cache(cache_root(root))
+    violations: List[Violation] = []
+    warnings: List[Violation] = []
+
+    # anchor -> graph_id -> (first frame path, node id)
+    corpus: Dict[str, Dict[str, Tuple[str, str]]] = {}
+
+    for frame_path in _iter_frames(root):
+        rel = str(frame_path.relative_to(root))
+        data = yaml.safe_load(read_text(frame_path))
+        if not isinstance(data, dict):
+            continue
+        gid = data.get("graph_id")
+        if not isinstance(gid, str) or not gid:
+            continue
+
+        nodes = parse_nodes(data)
+        table = anchor_table_cached(anchor_ids(data, nodes), cache)
+
+        by_anchor: Dict[str, List[str]] = {}
+        for aid, anchor in table.items():
+            by_anchor.setdefault(anchor, []).append(aid)
+        for anchor in sorted(by_anchor):
+            ids = by_anchor[anchor]
+            if len(ids) > 1:
+                violations.append(
+                    Violation(
+                        code=ANCHOR_E["DUPLICATE_IN_FRAME"],
+                        path=rel,
+                        node_id=ids[0],
+                        message=f"anchor {anchor} derived from ids: {', '.join(ids)}",
+                    )
+                )
+
+        for nid in sorted(nodes):
+            corpus.setdefault(table[nid], {}).setdefault(gid, (rel, nid))
+
+    code = ANCHOR_E["DUPLICATE_IN_CORPUS"] if strict else ANCHOR_W["DUPLICATE_IN_CORPUS"]
+    sink = violations if strict else warnings
+    for anchor in sorted(corpus):
+        owners = corpus[anchor]
+        if len(owners) < 2:
+            continue
+        gids = sorted(owners)
+        rel, nid = owners[gids[0]]
+        ids: Set[str] = {owners[g][1] for g in gids}
+        what = f"node id {nid}" if len(ids) == 1 else f"node ids {', '.join(sorted(ids))}"
+        sink.append(
+            Violation(
+                code=code,
+                path=rel,
+                node_id=nid,
+                message=f"anchor {anchor} ({what}) occurs in {len(gids)} graphs: {', '.join(gids)}",
+            )
+        )
+
+    return violations, warnings
@@ -14,7 +14,7 @@ from fcx.util import read_text
 from fcx.violations import Violation
 
 try:
-    from tools.markup.inline_markup_k1 import parse as parse_inline_markup  # type: ignore
+    from tools.markup.inline_markup_k1 import parse_compact as parse_inline_markup  # type: ignore
 except Exception:
     parse_inline_markup = None  # type: ignore
 
@@ -113,8 +113,8 @@ def validate_inline_markup_k1(ctx: KernelCtx) -> Tuple[List[Violation], List[Vio
                 # If parse_inline_markup available, parse for errors
                 if parse_inline_markup and text_format.startswith("md-"):
                     try:
-                        ast, errs = parse_inline_markup(value, mode=text_format)
-                        for err in errs or []:
+                        doc = parse_inline_markup(value, mode=text_format)
+                        for err in doc.errors:
                             violations.append(
                                 Violation(
                                     code=TEXT_E["BAD_CODEFENCE"] if "fence" in str(err.code) else TEXT_E["BAD_TEXT_FORMAT"],
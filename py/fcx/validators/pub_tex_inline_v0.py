@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import json
-import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
 from fcx.kernel import KernelCtx
+from fcx.pubtex import scan_frame_irs
 from fcx.util import read_text
 from fcx.violations import Violation
 
@@ -26,10 +26,6 @@ PUBTEX_E = {
     "JSON_MALFORMED": "PUBTEX.E.JSON_MALFORMED",
 }
 
-_FORBIDDEN_TEX_RE = re.compile(r"\\(input|include|write|openout|read|usepackage|catcode|def|edef|gdef)\b")
-_FORBIDDEN_CODE_RE = re.compile(r"\\[A-Za-z@]+")
-
-
 def _is_str(x: Any) -> bool:
     return isinstance(x, str)
 
@@ -83,11 +79,15 @@ def validate_pub_tex_inline_v0(ctx: KernelCtx) -> Tuple[List[Violation], List[Vi
         if not isinstance(nodes, list):
             continue
 
+        # (node_id, attr key, form label) -> IR node list; scanned once per frame.
+        irs: List[Tuple[Tuple[Optional[str], str, str], List[Any]]] = []
+
         for n in nodes:
             if not isinstance(n, dict):
                 continue
 
             node_id = n.get("id")
+            nid = str(node_id) if node_id else None
             attrs = n.get("attrs")
 
             # Check for pub.tex.* attrs with format=tex-inline-v0
@@ -106,7 +106,7 @@ def validate_pub_tex_inline_v0(ctx: KernelCtx) -> Tuple[List[Violation], List[Vi
                         Violation(
                             code=PUBTEX_E["PARSE_ERROR"],
                             path=rel,
-                            node_id=str(node_id) if node_id else None,
+                            node_id=nid,
                             message=f"missing {val_key} with format={fmt_val}",
                         )
                     )
@@ -118,7 +118,7 @@ def validate_pub_tex_inline_v0(ctx: KernelCtx) -> Tuple[List[Violation], List[Vi
                         Violation(
                             code=PUBTEX_E["PARSE_ERROR"],
                             path=rel,
-                            node_id=str(node_id) if node_id else None,
+                            node_id=nid,
                             message="pub_tex_inline_v0 parser unavailable",
                         )
                     )
@@ -126,52 +126,27 @@ def validate_pub_tex_inline_v0(ctx: KernelCtx) -> Tuple[List[Violation], List[Vi
 
                 try:
                     nodes_parsed, errs = parse_tex_inline_v0(val)
-                    for err in errs or []:
-                        violations.append(
-                            Violation(
-                                code=PUBTEX_E["PARSE_ERROR"],
-                                path=rel,
-                                node_id=str(node_id) if node_id else None,
-                                message=f"{val_key}: {err.code} at {err.pos}",
-                            )
-                        )
-                    
-                    # Validate parsed nodes for forbidden sequences
-                    for seg in nodes_parsed or []:
-                        if not isinstance(seg, dict):
-                            continue
-                        t = seg.get("t")
-                        s = seg.get("s", "")
-                        
-                        if t == "math":
-                            if _FORBIDDEN_TEX_RE.search(s):
-                                violations.append(
-                                    Violation(
-                                        code=PUBTEX_E["FORBIDDEN_CONTROL_SEQ"],
-                                        path=rel,
-                                        node_id=str(node_id) if node_id else None,
-                                        message=f"{val_key} math: forbidden control sequence",
-                                    )
-                                )
-                        elif t == "code":
-                            if _FORBIDDEN_CODE_RE.search(s):
-                                violations.append(
-                                    Violation(
-                                        code=PUBTEX_E["FORBIDDEN_CONTROL_SEQ"],
-                                        path=rel,
-                                        node_id=str(node_id) if node_id else None,
-                                        message=f"{val_key} code: forbidden backslash sequence",
-                                    )
-                                )
                 except Exception as e:
                     violations.append(
                         Violation(
                             code=PUBTEX_E["PARSE_ERROR"],
                             path=rel,
-                            node_id=str(node_id) if node_id else None,
+                            node_id=nid,
                             message=f"{val_key}: {str(e)}",
                         )
                     )
+                    continue
+
+                for err in errs or []:
+                    violations.append(
+                        Violation(
+                            code=PUBTEX_E["PARSE_ERROR"],
+                            path=rel,
+                            node_id=nid,
+                            message=f"{val_key}: {err.code} at {err.pos}",
+                        )
+                    )
+                irs.append(((nid, val_key, ""), nodes_parsed or []))
 
             # Also check canonical JSON form: pub.tex.<field> with vtype=json
             for field in ["summary", "text", "body"]:
@@ -179,31 +154,18 @@ def validate_pub_tex_inline_v0(ctx: KernelCtx) -> Tuple[List[Violation], List[Vi
                 ir = _find_attr_json_value(attrs, val_key)
                 if not isinstance(ir, dict) or ir.get("kind") != "pub-tex-inline-v0":
                     continue
-
-                # Validate nodes in IR
-                for seg in ir.get("nodes") or []:
-                    if not isinstance(seg, dict):
-                        continue
-                    t = seg.get("t")
-                    s = seg.get("s", "")
-                    
-                    if t == "math" and _FORBIDDEN_TEX_RE.search(s):
-                        violations.append(
-                            Violation(
-                                code=PUBTEX_E["FORBIDDEN_CONTROL_SEQ"],
-                                path=rel,
-                                node_id=str(node_id) if node_id else None,
-                                message=f"{val_key} (JSON IR) math: forbidden control sequence",
-                            )
-                        )
-                    elif t == "code" and _FORBIDDEN_CODE_RE.search(s):
-                        violations.append(
-                            Violation(
-                                code=PUBTEX_E["FORBIDDEN_CONTROL_SEQ"],
-                                path=rel,
-                                node_id=str(node_id) if node_id else None,
-                                message=f"{val_key} (JSON IR) code: forbidden backslash sequence",
-                            )
-                        )
+                irs.append(((nid, val_key, " (JSON IR)"), ir.get("nodes") or []))
+
+        # Forbidden control sequences: every hit, with segment index and offset.
+        for (nid, val_key, form), hit in scan_frame_irs(irs):
+            what = "forbidden control sequence" if hit.kind == "math" else "forbidden backslash sequence"
+            violations.append(
+                Violation(
+                    code=PUBTEX_E["FORBIDDEN_CONTROL_SEQ"],
+                    path=rel,
+                    node_id=nid,
+                    message=f"{val_key}{form} {hit.kind}: {what} {hit.seq} at segment {hit.seg} offset {hit.pos}",
+                )
+            )
 
     return violations, warnings
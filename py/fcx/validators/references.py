@@ -4,12 +4,11 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
-
-import yaml
+from typing import List, Tuple
 
+from fcx.index import open_index
 from fcx.kernel import KernelCtx
-from fcx.util import read_text
+from fcx.resolve import Resolver
 from fcx.violations import Violation
 
 
@@ -20,6 +19,12 @@ REF_E = {
     "UNRESOLVED_TARGET_GRAPH_ID": "REF.E.UNRESOLVED_TARGET_GRAPH_ID",
     "UNRESOLVED_EDGE_FROM": "REF.E.UNRESOLVED_EDGE_FROM",
     "EDGE_FROM_NOT_GRAPH_ID": "REF.E.EDGE_FROM_NOT_GRAPH_ID",
+    "PARSE_ERROR": "REF.E.PARSE_ERROR",
+    "INVALID_VERSION_SPEC": "REF.E.INVALID_VERSION_SPEC",
+}
+
+REF_W = {
+    "AMBIGUOUS_REF": "REF.W.AMBIGUOUS_REF",
 }
 
 _FRAMEURL_RE = re.compile(r"^[a-z][a-z0-9+.-]*://")
@@ -29,119 +34,109 @@ def _is_frameurl(value: str) -> bool:
     return bool(_FRAMEURL_RE.match(value))
 
 
-def _iter_frames(root: Path) -> List[Path]:
-    return sorted(root.glob("frames/**/v*/frame.yml"))
-
-
 def validate_references(ctx: KernelCtx) -> Tuple[List[Violation], List[Violation]]:
     """Validate FrameURL references resolve within the repo.
-    
+
+    Frames are read through the corpus index (`fcx.index`), so only frames
+    changed since the last run are parsed. References may pin a version
+    (`<graph_id>@<version or range>`, see `fcx.resolve`); a pin that matches
+    no version is unresolved, a malformed one is REF.E.INVALID_VERSION_SPEC
+    and a reference matched by several frames or tied versions is a
+    REF.W.AMBIGUOUS_REF warning.
+
     Returns (violations, warnings).
     """
     root = Path(ctx.repo_root)
     violations: List[Violation] = []
     warnings: List[Violation] = []
 
-    # Build canonical graph_ids set
-    present_graph_ids: set[str] = set()
-    frames_data: list[tuple[Path, dict]] = []
+    with open_index(root) as idx:
+        records = idx.records()
+        refs = {r.path: idx.refs(r.path) for r in records if r.status == "ok" and r.graph_id}
 
-    for frame_path in _iter_frames(root):
-        data = yaml.safe_load(read_text(frame_path))
-        if not isinstance(data, dict):
-            continue
-        gid = data.get("graph_id")
-        if isinstance(gid, str) and gid:
-            present_graph_ids.add(gid)
-        frames_data.append((frame_path, data))
+    resolver = Resolver.from_records(records)
 
-    def resolves(ref: str) -> bool:
-        return ref in present_graph_ids
+    def resolves(ref: str, rel: str, what: str) -> bool:
+        res = resolver.resolve(ref)
+        if res.status == "invalid":
+            violations.append(
+                Violation(code=REF_E["INVALID_VERSION_SPEC"], path=rel, message=f"{what}: {ref}: {res.message}")
+            )
+            return True
+        if res.status == "ambiguous":
+            warnings.append(Violation(code=REF_W["AMBIGUOUS_REF"], path=rel, message=f"{what}: {ref}: {res.message}"))
+        return res.status != "unresolved"
+
+    def detail(ref: str) -> str:
+        res = resolver.resolve(ref)
+        return f" ({res.message})" if res.spec else ""
 
     # Validate each frame
-    for frame_path, data in frames_data:
-        rel = str(frame_path.relative_to(root))
-        gid = data.get("graph_id")
+    for rec in records:
+        rel = rec.path
+        gid = rec.graph_id
 
-        if not isinstance(gid, str) or not gid:
+        if rec.status == "parse_error":
+            violations.append(Violation(code=REF_E["PARSE_ERROR"], path=rel, message=f"YAML parse error: {rec.error}"))
+            continue
+        if rec.status != "ok":
+            continue
+
+        if not gid:
             violations.append(Violation(code=REF_E["MISSING_GRAPH_ID"], path=rel, message="missing graph_id"))
             continue
 
         # Root node must exist with id == graph_id
-        root_node_ok = False
-        for n in data.get("nodes") or []:
-            if not isinstance(n, dict):
-                continue
-            if n.get("id") == gid:
-                root_node_ok = True
-                break
-        if not root_node_ok:
+        if not rec.has_root:
             violations.append(
                 Violation(code=REF_E["ROOT_NODE_MISSING"], path=rel, message=f"root node with id={gid} not found")
             )
 
+        frame_refs = refs[rel]
+
         # Validate depends_on (FrameURL only)
-        for prop in data.get("properties") or []:
-            if not isinstance(prop, dict):
-                continue
-            if prop.get("key") != "depends_on":
-                continue
-            v = prop.get("value")
-            if isinstance(v, str) and v and _is_frameurl(v) and not resolves(v):
+        for kind, v in frame_refs:
+            if kind == "depends_on" and _is_frameurl(v) and not resolves(v, rel, "depends_on"):
                 violations.append(
                     Violation(
                         code=REF_E["UNRESOLVED_DEPENDS_ON"],
                         path=rel,
-                        message=f"unresolved depends_on: {v}",
+                        message=f"unresolved depends_on: {v}{detail(v)}",
                     )
                 )
 
         # Validate frame-level target_graph_id
-        tgid = data.get("target_graph_id")
-        if isinstance(tgid, str) and tgid and _is_frameurl(tgid) and not resolves(tgid):
-            violations.append(
-                Violation(
-                    code=REF_E["UNRESOLVED_TARGET_GRAPH_ID"],
-                    path=rel,
-                    message=f"unresolved target_graph_id: {tgid}",
+        for kind, tgid in frame_refs:
+            if kind == "target_graph_id" and _is_frameurl(tgid) and not resolves(tgid, rel, "target_graph_id"):
+                violations.append(
+                    Violation(
+                        code=REF_E["UNRESOLVED_TARGET_GRAPH_ID"],
+                        path=rel,
+                        message=f"unresolved target_graph_id: {tgid}{detail(tgid)}",
+                    )
                 )
-            )
 
-        # Validate node-level target_graph_id (external refs ok; only fail if in-repo typo)
-        for n in data.get("nodes") or []:
-            if not isinstance(n, dict):
-                continue
-            ntgid = n.get("target_graph_id")
-            if not isinstance(ntgid, str) or not ntgid or not _is_frameurl(ntgid):
-                continue
-            if not resolves(ntgid):
-                # External reference; don't fail bootstrap
-                continue
+        # Node-level target_graph_id may point outside the repo (external refs ok).
 
         # Validate edges.from (FrameURL must resolve; if not root, warn)
-        for e in data.get("edges") or []:
-            if not isinstance(e, dict):
-                continue
-            frm = e.get("from")
-            if not isinstance(frm, str) or not frm:
+        for kind, frm in frame_refs:
+            if kind != "edge_from" or not _is_frameurl(frm):
                 continue
-
-            if _is_frameurl(frm):
-                if frm != gid and not resolves(frm):
-                    violations.append(
-                        Violation(
-                            code=REF_E["UNRESOLVED_EDGE_FROM"],
-                            path=rel,
-                            message=f"unresolved edge.from: {frm}",
-                        )
+            if frm != gid and not resolves(frm, rel, "edge.from"):
+                violations.append(
+                    Violation(
+                        code=REF_E["UNRESOLVED_EDGE_FROM"],
+                        path=rel,
+                        message=f"unresolved edge.from: {frm}{detail(frm)}",
                     )
-                if frm != gid:
-                    violations.append(
-                        Violation(
-                            code=REF_E["EDGE_FROM_NOT_GRAPH_ID"],
-                            path=rel,
-                            message=f"edge.from={frm} != graph_id={gid}",
-                        )
+                )
+            if frm != gid:
+                violations.append(
+                    Violation(
+                        code=REF_E["EDGE_FROM_NOT_GRAPH_ID"],
+                        path=rel,
+                        message=f"edge.from={frm} != graph_id={gid}",
                     )
+                )
 
     return violations, warnings
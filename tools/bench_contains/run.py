@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""Equivalence check and benchmark for the shared contains-forest analysis (`fcx.graph.contains_forest`).
+
+Usage:
+  tools/bench_contains/run [--edges N] [--check-only]
+
+The analysis replaced two recursive DFSs (kept below as references): the
+cycle check of the specframe-k1 profile validator and
+render_simple_md._contains_forest/emit. On seeded random frames (small
+enough for the references to recurse) and on every corpus frame it checks:
+- identical SPEC.E.CONTAINS_MULTI_PARENT violations
+- a cycle is reported whenever the reference found one (the reference
+  stops at the first cycle reachable from the root; the analysis reports
+  every cycle)
+- identical render_simple_md roots, children, multi-parent warning and
+  Contains Tree lines on acyclic frames
+
+Then it times the analysis and validate_specframe_k1 on synthetic frames
+with N contains edges (default 1,000,000):
+- chain: one path N deep
+- tree: random recursive tree
+- tangled: random tree with 1% of its edges replaced by extra parents,
+  half of them back to a grandparent (multi-parents and cycles)
+The reference validator is timed too; on the chain it exceeds the
+interpreter's recursion limit.
+
+Outputs:
+- out/bench_contains/report.json
+
+Notes:
+- Exit status 1 on any mismatch (timings are skipped).
+- The equivalence part of the report is deterministic; timings are not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.graph import contains_forest  # noqa: E402
+from fcx.kernel import Budget, KernelCtx  # noqa: E402
+from fcx.profiles.specframe_k1 import SPEC_E, validate_specframe_k1  # noqa: E402
+from tools.render_simple_md.run import _contains_forest, render_frame  # noqa: E402
+
+
+TOOL_ID = "bench_contains"
+TOOL_VERSION = "0.1.0"
+
+Edges = List[Tuple[str, str]]
+
+
+# -------------------------
+# Reference implementations (as they were before fcx.graph.contains_forest)
+# -------------------------
+
+
+def ref_specframe(edges: Edges, root_id: str) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """(multi-parent (node, message) list, first cycle node from root) of the old validator."""
+
+    multi: List[Tuple[str, str]] = []
+    parent_of: Dict[str, str] = {}
+    for frm, to in edges:
+        if to in parent_of and parent_of[to] != frm:
+            multi.append((to, f"node has multiple parents via contains: {parent_of[to]} and {frm}"))
+        else:
+            parent_of[to] = frm
+
+    children: Dict[str, List[str]] = {}
+    for frm, to in edges:
+        children.setdefault(frm, []).append(to)
+    for k in children:
+        children[k] = sorted(children[k])
+
+    visiting: set = set()
+    visited: set = set()
+
+    def dfs(nid: str) -> Optional[str]:
+        if nid in visiting:
+            return nid
+        if nid in visited:
+            return None
+        visiting.add(nid)
+        for ch in children.get(nid, []):
+            cyc = dfs(ch)
+            if cyc:
+                return cyc
+        visiting.remove(nid)
+        visited.add(nid)
+        return None
+
+    return multi, dfs(root_id)
+
+
+def ref_forest(node_ids: List[str], edges: Edges, root_id: str) -> Tuple[List[str], Dict[str, List[str]], List[str], bool]:
+    """(roots, children, multi-parent nodes, cycle found) of the old render_simple_md._contains_forest."""
+
+    node_set = set(node_ids)
+    children: Dict[str, List[str]] = {nid: [] for nid in node_ids}
+    indegree: Dict[str, int] = {nid: 0 for nid in node_ids}
+    for frm, to in edges:
+        if frm in node_set and to in node_set:
+            children[frm].append(to)
+            indegree[to] += 1
+    for k in children:
+        children[k] = sorted(set(children[k]))
+    multi = sorted(nid for nid, d in indegree.items() if d > 1)
+    roots = [root_id] if root_id in node_set else sorted(nid for nid, d in indegree.items() if d == 0 and children.get(nid))
+
+    temp: set = set()
+    perm: set = set()
+    found = []
+
+    def dfs(nid: str) -> None:
+        if nid in perm:
+            return
+        if nid in temp:
+            found.append(nid)
+            return
+        temp.add(nid)
+        for c in children.get(nid, []):
+            dfs(c)
+        temp.remove(nid)
+        perm.add(nid)
+
+    for r in roots:
+        dfs(r)
+    return roots, children, multi, bool(found)
+
+
+def ref_emit(roots: List[str], children: Dict[str, List[str]]) -> List[str]:
+    lines: List[str] = []
+
+    def emit(nid: str, depth: int) -> None:
+        lines.append(f"{'  ' * depth}- {nid}")
+        for c in children.get(nid, []):
+            emit(c, depth + 1)
+
+    for r in roots:
+        emit(r, 0)
+    return lines
+
+
+# -------------------------
+# Inputs
+# -------------------------
+
+_ATTRS = {
+    "spec": [
+        {"key": "title", "value": "t"},
+        {"key": "status", "value": "normative"},
+        {"key": "summary", "value": "s"},
+        {"key": "profile", "value": "specframe-k1"},
+    ],
+    "section": [{"key": "title", "value": "t"}, {"key": "status", "value": "normative"}],
+}
+
+
+def make_frame(n_nodes: int, edges: Edges, extra_nodes: int = 0) -> Dict[str, Any]:
+    """A specframe-k1 frame with nodes n0.. (n0 is the root) and these contains edges."""
+
+    gid = "spec://bench/contains"
+    nodes: List[Dict[str, Any]] = [{"id": gid, "kind": "spec", "attrs": _ATTRS["spec"]}]
+    nodes.extend({"id": f"n{i}", "kind": "section", "attrs": _ATTRS["section"]} for i in range(1, n_nodes + extra_nodes))
+    return {
+        "graph_id": gid,
+        "version": "0.1.0",
+        "nodes": nodes,
+        "edges": [{"from": f, "to": t, "type": "contains"} for f, t in _root(edges, gid)],
+    }
+
+
+def _root(edges: Edges, gid: str) -> Edges:
+    return [(gid if f == "n0" else f, gid if t == "n0" else t) for f, t in edges]
+
+
+def synthetic(shape: str, n: int, seed: int = 0) -> Edges:
+    rnd = random.Random(seed)
+    if shape == "chain":
+        return [(f"n{i}", f"n{i + 1}") for i in range(n)]
+    parent = [0] + [rnd.randrange(i) for i in range(1, n + 1)]
+    edges = [(f"n{parent[i]}", f"n{i}") for i in range(1, n + 1)]
+    if shape == "tangled":
+        # Replace the last 1% by extra parents: half random, half back to a grandparent (a cycle).
+        k = n // 100
+        extra = []
+        for j in range(k):
+            v = rnd.randrange(1, n + 1)
+            u = parent[parent[v]] if j % 2 else rnd.randrange(1, n + 1)
+            extra.append((f"n{v}", f"n{u}"))
+        edges = edges[: n - k] + extra
+    return edges
+
+
+def _reachable(start: str, edges: Edges) -> set:
+    adj: Dict[str, List[str]] = {}
+    for f, t in edges:
+        adj.setdefault(f, []).append(t)
+    seen, stack = {start}, [start]
+    while stack:
+        for w in adj.get(stack.pop(), []):
+            if w not in seen:
+                seen.add(w)
+                stack.append(w)
+    return seen
+
+
+def _tree_lines(md: str) -> List[str]:
+    lines = md.splitlines()
+    for i, ln in enumerate(lines):
+        if ln.endswith("# Contains Tree"):
+            out = []
+            for t in lines[i + 1 :]:
+                if not t:
+                    break
+                out.append(t)
+            return out
+    return []
+
+
+def check_frame(g: Dict[str, Any], label: str, ctx: KernelCtx) -> List[str]:
+    """Mismatches between the shared analysis and the references on one frame."""
+
+    bad: List[str] = []
+    gid = str(g.get("graph_id") or "")
+    edges: Edges = [
+        (e["from"], e["to"])
+        for e in g.get("edges") or []
+        if isinstance(e, dict) and e.get("type") == "contains" and isinstance(e.get("from"), str) and e.get("from")
+        and isinstance(e.get("to"), str) and e.get("to")
+    ]
+    forest = contains_forest(edges)
+
+    vs = validate_specframe_k1(ctx, g, label)
+    multi, cyc = ref_specframe(edges, gid)
+    got = [(v.node_id, v.message) for v in vs if v.code == SPEC_E["MULTI_PARENT"]]
+    if vs and vs[0].code == SPEC_E["BAD_ROOT"]:
+        return bad
+    if got != multi:
+        bad.append(f"{label}: multi-parent violations differ")
+    reach = _reachable(gid, edges)
+    if (cyc is not None) != any(set(c) & reach for c in forest.cycles):
+        bad.append(f"{label}: cycle from root: reference {cyc is not None}, shared {cyc is None}")
+    if any(v.code == SPEC_E["CONTAINS_CYCLE"] for v in vs) != bool(forest.cycles):
+        bad.append(f"{label}: cycle violations do not match the analysis")
+
+    nodes = [n for n in g.get("nodes") or [] if isinstance(n, dict) and isinstance(n.get("id"), str) and n.get("id")]
+    node_ids = sorted(n["id"] for n in nodes)
+    e_dicts = [{"from": f, "to": t, "type": "contains"} for f, t in edges]
+    roots, children, warnings = _contains_forest(nodes, e_dicts, gid, "contains")
+    r_roots, r_children, r_multi, r_cyc = ref_forest(node_ids, edges, gid)
+    w_multi = next((w["nodes"] for w in warnings if w["type"] == "contains_multiple_parents"), [])
+    if roots != r_roots or children != r_children or w_multi != r_multi:
+        bad.append(f"{label}: render forest differs")
+    if r_cyc and not any(w["type"] == "contains_cycle" for w in warnings):
+        bad.append(f"{label}: render cycle not reported")
+    if not forest.cycles and edges:
+        md, _ = render_frame(g)
+        if _tree_lines(md) != ref_emit(r_roots, r_children):
+            bad.append(f"{label}: contains tree differs")
+    return bad
+
+
+def random_frame(rnd: random.Random) -> Dict[str, Any]:
+    n = rnd.randint(1, 40)
+    edges = [(f"n{rnd.randrange(i)}", f"n{i}") for i in range(1, n)]
+    for _ in range(rnd.randint(0, 4)):
+        if rnd.random() < 0.5:
+            edges.append((f"n{rnd.randrange(n)}", f"n{rnd.randrange(n)}"))
+    edges = list(dict.fromkeys(edges))
+    rnd.shuffle(edges)
+    return make_frame(n, edges, extra_nodes=rnd.randint(0, 3))
+
+
+def check(ctx: KernelCtx) -> Tuple[int, int, List[str]]:
+    bad: List[str] = []
+    corpus = sorted(REPO_ROOT.glob("frames/**/v*/frame.yml"))
+    for p in corpus:
+        g = yaml.safe_load(p.read_text(encoding="utf-8"))
+        if isinstance(g, dict) and any(isinstance(e, dict) and e.get("type") == "contains" for e in g.get("edges") or []):
+            bad.extend(check_frame(g, p.relative_to(REPO_ROOT).as_posix(), ctx))
+    rnd = random.Random(0)
+    n_random = 500
+    for i in range(n_random):
+        bad.extend(check_frame(random_frame(rnd), f"random[{i}]", ctx))
+    return len(corpus), n_random, bad
+
+
+# -------------------------
+# Timing
+# -------------------------
+
+
+def _timed(fn: Any) -> Tuple[float, Any]:
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def bench(n: int, ctx: KernelCtx) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for shape in ("chain", "tree", "tangled"):
+        edges = synthetic(shape, n)
+        g = make_frame(n + 1, edges)
+        gid = g["graph_id"]
+        redges = _root(edges, gid)
+
+        t_an, forest = _timed(lambda: contains_forest(redges))
+        t_val, vs = _timed(lambda: validate_specframe_k1(ctx, g, "synthetic"))
+        try:
+            t_ref, _ = _timed(lambda: ref_specframe(redges, gid))
+            ref: Any = round(t_ref, 3)
+        except RecursionError:
+            ref = "RecursionError"
+        row = {
+            "edges": len(edges),
+            "analysis_s": round(t_an, 3),
+            "validate_s": round(t_val, 3),
+            "reference_validate_s": ref,
+            "multi_parent": len(forest.multi_parent),
+            "cycles": len(forest.cycles),
+            "violations": len(vs),
+        }
+        out[shape] = row
+        print(
+            f"{shape:8} {row['edges']:>9} edges  analysis {row['analysis_s']:7.3f}s  validate {row['validate_s']:7.3f}s"
+            f"  reference {ref}  multi-parent {row['multi_parent']}  cycles {row['cycles']}"
+        )
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--edges", type=int, default=1_000_000, help="contains edges per synthetic frame")
+    ap.add_argument("--check-only", action="store_true", help="equivalence check only; no timings")
+    args = ap.parse_args()
+    if args.edges < 1:
+        ap.error("--edges must be >= 1")
+
+    ctx = KernelCtx(repo_root=str(REPO_ROOT), budget=Budget(max_meta_depth=16), gamma={})
+    n_corpus, n_random, bad = check(ctx)
+
+    report: Dict[str, Any] = {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "ok": not bad,
+        "inputs": {"corpus": n_corpus, "random": n_random},
+        "mismatches": bad[:20],
+    }
+    if not bad and not args.check_only:
+        report["timings"] = bench(args.edges, ctx)
+
+    out_path = REPO_ROOT / "out" / TOOL_ID / "report.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    if bad:
+        print(f"{TOOL_ID}: {len(bad)} mismatch(es); first: {bad[0]}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Equivalence check and micro-benchmarks for the shared escapers (`fcx.escape`).
+
+Usage:
+  tools/bench_escape/run [--repeat N] [--check-only]
+
+Each `fcx.escape` variant is compared byte-for-byte against the
+implementation it replaced (kept below as the reference) on:
+- every string value in frames/**/v*/frame.yml
+- every single character the tables touch, plus seeded random mixtures of
+  specials, ASCII and Unicode math glyphs
+
+Then throughput (MB/s of UTF-8 input, best of N) is measured for both on the
+corpus text and on a specials-dense synthetic text.
+
+Outputs:
+- out/bench_escape/report.json
+
+Notes:
+- Exit status 1 on any mismatch (timings are skipped).
+- The equivalence part of the report is deterministic; timings are not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import yaml
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx import escape  # noqa: E402
+
+
+TOOL_ID = "bench_escape"
+TOOL_VERSION = "0.1.0"
+
+
+# -------------------------
+# Reference implementations (as they were before fcx.escape)
+# -------------------------
+
+_REF_LATEX_ESC_MAP = {
+    "\\": r"\textbackslash{}",
+    "{": r"\{",
+    "}": r"\}",
+    "$": r"\$",
+    "&": r"\&",
+    "#": r"\#",
+    "%": r"\%",
+    "_": r"\_",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+
+_REF_SPEC_SPECIALS = {k: v for k, v in _REF_LATEX_ESC_MAP.items() if k != "$"}
+
+
+def ref_tex_escape(s: str) -> str:
+    # inline_markup_k1._tex_escape / render_pub_tex.tex_escape
+    return "".join(_REF_LATEX_ESC_MAP.get(ch, ch) for ch in s)
+
+
+def ref_tex_escape_doc(s: str) -> str:
+    # render_tex_doc.tex_escape
+    return (
+        s.replace("\\", r"\textbackslash{}")
+        .replace("{", r"\{")
+        .replace("}", r"\}")
+        .replace("$", r"\$")
+        .replace("&", r"\&")
+        .replace("#", r"\#")
+        .replace("%", r"\%")
+        .replace("_", r"\_")
+        .replace("~", r"\textasciitilde{}")
+        .replace("^", r"\textasciicircum{}")
+    )
+
+
+def ref_tex_escape_keep_math(s: str) -> str:
+    # render_latex_spec.latex_escape
+    return "".join(_REF_SPEC_SPECIALS.get(ch, ch) for ch in s)
+
+
+def ref_md_escape(s: str) -> str:
+    # render_md_doc.md_escape
+    s = s.replace("\\", "\\\\")
+    s = s.replace("`", "\\`")
+    s = s.replace("*", "\\*")
+    s = s.replace("_", "\\_")
+    s = s.replace("[", "\\[").replace("]", "\\]")
+    return s
+
+
+_REF_R_GE0_RE = re.compile(r"R_\{\s*≥\s*0\s*\}")
+
+
+def ref_normalize_tex_unicode(s: str) -> str:
+    # render_tex_doc.normalize_tex_unicode
+    if not s:
+        return ""
+    s = _REF_R_GE0_RE.sub(r"\\mathbb{R}_{\\ge 0}", s)
+    out: List[str] = []
+    for ch in s:
+        rep = escape.UNICODE_TO_TEX.get(ch)
+        out.append(ch if rep is None else rep)
+    return "".join(out)
+
+
+VARIANTS: Dict[str, Tuple[Callable[[str], str], Callable[[str], str]]] = {
+    "md_escape": (escape.md_escape, ref_md_escape),
+    "normalize_tex_unicode": (escape.normalize_tex_unicode, ref_normalize_tex_unicode),
+    "tex_escape": (escape.tex_escape, ref_tex_escape),
+    "tex_escape_doc": (escape.tex_escape_doc, ref_tex_escape_doc),
+    "tex_escape_keep_math": (escape.tex_escape_keep_math, ref_tex_escape_keep_math),
+}
+
+
+# -------------------------
+# Inputs
+# -------------------------
+
+_ALPHABET = "".join(sorted(set(_REF_LATEX_ESC_MAP) | set("`*[]") | set(escape.UNICODE_TO_TEX))) + "aZ0 \n≥R_{}"
+
+
+def _strings(obj: Any) -> Iterator[str]:
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for k in sorted(obj, key=str):
+            yield from _strings(obj[k])
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _strings(v)
+
+
+def corpus_strings(root: Path) -> List[str]:
+    out: List[str] = []
+    for p in sorted(root.glob("frames/**/v*/frame.yml")):
+        out.extend(_strings(yaml.safe_load(p.read_text(encoding="utf-8"))))
+    return out
+
+
+def synthetic_strings(n: int = 2000, seed: int = 0) -> List[str]:
+    rnd = random.Random(seed)
+    out = list(_ALPHABET) + ["", "R_{≥0}", "R_{ ≥ 0 }", "\\\\{}", "a_b^c~d$e"]
+    for _ in range(n):
+        out.append("".join(rnd.choice(_ALPHABET) for _ in range(rnd.randint(1, 64))))
+    return out
+
+
+def check(inputs: List[str]) -> Dict[str, List[str]]:
+    """Variant -> inputs (repr) on which it differs from its reference."""
+
+    bad: Dict[str, List[str]] = {}
+    for name, (new, ref) in VARIANTS.items():
+        diffs = [repr(s) for s in inputs if new(s) != ref(s)]
+        if diffs:
+            bad[name] = diffs[:10]
+    return bad
+
+
+def throughput(fn: Callable[[str], str], texts: List[str], repeat: int) -> float:
+    size = sum(len(t.encode("utf-8")) for t in texts)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - t0)
+    return size / best / 1e6 if best > 0 else float("inf")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5, help="timing repetitions (best-of)")
+    ap.add_argument("--check-only", action="store_true", help="equivalence check only; no timings")
+    args = ap.parse_args()
+    if args.repeat < 1:
+        ap.error("--repeat must be >= 1")
+
+    corpus = corpus_strings(REPO_ROOT)
+    synth = synthetic_strings()
+    bad = check(corpus + synth)
+
+    report: Dict[str, Any] = {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "ok": not bad,
+        "inputs": {"corpus": len(corpus), "synthetic": len(synth)},
+        "mismatches": bad,
+    }
+
+    if not bad and not args.check_only:
+        dense = ["".join(synth[i : i + 50]) for i in range(0, len(synth), 50)]
+        bench: Dict[str, Dict[str, float]] = {}
+        for name, (new, ref) in VARIANTS.items():
+            row: Dict[str, float] = {}
+            for label, texts in (("corpus", corpus), ("dense", dense)):
+                row[f"{label}.shared_mb_s"] = round(throughput(new, texts, args.repeat), 2)
+                row[f"{label}.reference_mb_s"] = round(throughput(ref, texts, args.repeat), 2)
+            bench[name] = row
+            print(
+                f"{name:22} corpus {row['corpus.reference_mb_s']:8.2f} -> {row['corpus.shared_mb_s']:8.2f} MB/s"
+                f"   dense {row['dense.reference_mb_s']:8.2f} -> {row['dense.shared_mb_s']:8.2f} MB/s"
+            )
+        report["throughput"] = bench
+
+    out_path = REPO_ROOT / "out" / TOOL_ID / "report.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    if bad:
+        print(f"{TOOL_ID}: escaper mismatch: {', '.join(sorted(bad))}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
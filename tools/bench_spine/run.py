@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Equivalence check and benchmark for the DocIR spine walk (`fcx.docir._walk_spine`).
+
+Usage:
+  tools/bench_spine/run [--depth N] [--width N] [--repeat N] [--check-only]
+
+The iterative walk over the presorted child index of `build_spine` replaced
+a recursive generator that sorted each node's children as it went (kept
+below as the reference; the per-node block body, now `_spine_block`, moved
+unchanged and is shared by both). The serialized block sequences must be
+byte-identical (as DocIR JSON Lines block records) on:
+- every corpus frame with `contains` edges (frames/**/v*/frame.yml)
+- seeded random acyclic frames with shared children, dangling edges,
+  explicit orders and kinds that emit no block
+- the two synthetic spines timed below
+
+Then it times build_spine plus the walk (best of N) on:
+- deep: a chain of sections N deep (default 5,000)
+- wide: N children of the root (default 50,000)
+The reference is run with the recursion limit raised to fit the deep
+spine; whether it fits the default limit is reported too.
+
+Outputs:
+- out/bench_spine/report.json
+
+Notes:
+- Exit status 1 on any mismatch (timings are skipped).
+- The equivalence part of the report is deterministic; timings are not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.anchors import anchor_table  # noqa: E402
+from fcx.docir import Node, _spine_block, _walk_spine, anchor_ids, build_spine  # noqa: E402
+from fcx.docir import dump_docir_record, edges_of_type, load_frame, parse_nodes, stable_node_sort  # noqa: E402
+
+
+TOOL_ID = "bench_spine"
+TOOL_VERSION = "0.1.0"
+
+
+# -------------------------
+# Reference implementation (as it was before the iterative walk)
+# -------------------------
+
+
+def ref_build_spine(g: Dict[str, Any], nodes: Dict[str, Node]) -> Tuple[str, Dict[str, List[str]]]:
+    root_id = str(g.get("graph_id") or "")
+    if not root_id or root_id not in nodes:
+        raise SystemExit(f"Root node not found: {root_id}")
+    children_map: Dict[str, List[str]] = {}
+    for e in edges_of_type(g.get("edges"), "contains"):
+        children_map.setdefault(str(e.get("from")), []).append(str(e.get("to")))
+    return root_id, children_map
+
+
+def ref_spine(g: Dict[str, Any], nodes: Dict[str, Node], anchors: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    root_id, children_map = ref_build_spine(g, nodes)
+
+    def walk(nid: str, depth: int) -> Iterator[Dict[str, Any]]:
+        n = nodes.get(nid)
+        if n is None:
+            return
+        b = _spine_block(n, depth, anchors)
+        if b is not None:
+            yield b
+        for kid in stable_node_sort(nodes, children_map.get(nid, [])):
+            yield from walk(kid, depth + 1)
+
+    for c in stable_node_sort(nodes, children_map.get(root_id, [])):
+        yield from walk(c, 1)
+
+
+def new_spine(g: Dict[str, Any], nodes: Dict[str, Node], anchors: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    root_id, children_map = build_spine(g, nodes)
+    return _walk_spine(nodes, root_id, children_map, anchors)
+
+
+# -------------------------
+# Inputs
+# -------------------------
+
+_KINDS = ("section", "section", "title", "property", "reference", "spec_ref")
+
+
+def make_frame(n_nodes: int, edges: List[Tuple[int, int]], kinds: List[str], orders: List[Any]) -> Dict[str, Any]:
+    """A frame with nodes n0.. (n0 is the root, graph_id) and these contains edges."""
+
+    gid = "spec://bench/spine"
+    ids = [gid] + [f"n{i}" for i in range(1, n_nodes)]
+    nodes: List[Dict[str, Any]] = [{"id": gid, "kind": "spec", "status": "normative", "title": "Bench"}]
+    for i in range(1, n_nodes):
+        raw: Dict[str, Any] = {"id": ids[i], "kind": kinds[i], "status": "normative", "title": f"Node {i}"}
+        if orders[i] is not None:
+            raw["order"] = orders[i]
+        nodes.append(raw)
+    # An index past the last node is a dangling edge target.
+    name = lambda i: ids[i] if i < n_nodes else f"missing{i}"  # noqa: E731
+    return {
+        "graph_id": gid,
+        "version": "0.1.0",
+        "nodes": nodes,
+        "edges": [{"from": name(f), "to": name(t), "type": "contains"} for f, t in edges],
+    }
+
+
+def random_frame(rnd: random.Random) -> Dict[str, Any]:
+    n = rnd.randint(2, 60)
+    edges = [(rnd.randrange(i), i) for i in range(1, n)]
+    for _ in range(rnd.randint(0, 6)):
+        # Extra parents (forward only, so the spine stays acyclic) and dangling children.
+        f = rnd.randrange(n - 1)
+        edges.append((f, rnd.randrange(f + 1, n + 3)))
+    rnd.shuffle(edges)
+    kinds = ["spec"] + [rnd.choice(_KINDS) for _ in range(1, n)]
+    orders = [None] + [rnd.choice((None, rnd.randrange(5))) for _ in range(1, n)]
+    return make_frame(n, edges, kinds, orders)
+
+
+def deep_frame(depth: int) -> Dict[str, Any]:
+    return make_frame(depth + 1, [(i, i + 1) for i in range(depth)], ["spec"] + ["section"] * depth, [None] * (depth + 1))
+
+
+def wide_frame(width: int) -> Dict[str, Any]:
+    # Reverse orders, so sorting the children does real work.
+    orders = [None] + [width - i for i in range(1, width + 1)]
+    return make_frame(width + 1, [(0, i) for i in range(1, width + 1)], ["spec"] + ["section"] * width, orders)
+
+
+def _prepared(g: Dict[str, Any]) -> Tuple[Dict[str, Node], Dict[str, str]]:
+    nodes = parse_nodes(g)
+    return nodes, anchor_table(anchor_ids(g, nodes))
+
+
+def _dump(blocks: Iterator[Dict[str, Any]]) -> bytes:
+    """The blocks as the DocIR JSON Lines records they become."""
+
+    return "".join(dump_docir_record("block", b) for b in blocks).encode("utf-8")
+
+
+def _with_recursion_limit(limit: int, fn: Callable[[], Any]) -> Any:
+    old = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old, limit))
+    try:
+        return fn()
+    finally:
+        sys.setrecursionlimit(old)
+
+
+def check_frame(g: Dict[str, Any], label: str) -> List[str]:
+    nodes, anchors = _prepared(g)
+    ref = _with_recursion_limit(4 * len(nodes) + 1000, lambda: _dump(ref_spine(g, nodes, anchors)))
+    if _dump(new_spine(g, nodes, anchors)) != ref:
+        return [f"{label}: spine blocks differ"]
+    return []
+
+
+def check(synthetic: Dict[str, Dict[str, Any]]) -> Tuple[int, int, List[str]]:
+    bad: List[str] = []
+    n_corpus = 0
+    for p in sorted(REPO_ROOT.glob("frames/**/v*/frame.yml")):
+        g = load_frame(p.read_bytes())
+        if isinstance(g, dict) and edges_of_type(g.get("edges"), "contains"):
+            n_corpus += 1
+            bad.extend(check_frame(g, p.relative_to(REPO_ROOT).as_posix()))
+    rnd = random.Random(0)
+    n_random = 500
+    for i in range(n_random):
+        bad.extend(check_frame(random_frame(rnd), f"random[{i}]"))
+    for label, g in synthetic.items():
+        bad.extend(check_frame(g, label))
+    return n_corpus, n_random, bad
+
+
+# -------------------------
+# Timing
+# -------------------------
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(synthetic: Dict[str, Dict[str, Any]], repeat: int) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for label, g in synthetic.items():
+        nodes, anchors = _prepared(g)
+        try:
+            list(ref_spine(g, nodes, anchors))
+            default_limit = "ok"
+        except RecursionError:
+            default_limit = "RecursionError"
+        t_new = best_of(lambda: list(new_spine(g, nodes, anchors)), repeat)
+        t_ref = _with_recursion_limit(
+            4 * len(nodes) + 1000, lambda: best_of(lambda: list(ref_spine(g, nodes, anchors)), repeat)
+        )
+        row = {
+            "nodes": len(nodes),
+            "iterative_s": round(t_new, 4),
+            "reference_s": round(t_ref, 4),
+            "reference_default_recursion_limit": default_limit,
+        }
+        out[label] = row
+        print(
+            f"{label:5} {row['nodes']:>7} nodes  iterative {row['iterative_s']:8.4f}s"
+            f"  reference {row['reference_s']:8.4f}s  (default recursion limit: {default_limit})"
+        )
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--depth", type=int, default=5_000, help="depth of the deep synthetic spine")
+    ap.add_argument("--width", type=int, default=50_000, help="children of the root in the wide synthetic spine")
+    ap.add_argument("--repeat", type=int, default=3, help="timing repetitions (best-of)")
+    ap.add_argument("--check-only", action="store_true", help="equivalence check only; no timings")
+    args = ap.parse_args()
+    if args.depth < 1 or args.width < 1 or args.repeat < 1:
+        ap.error("--depth, --width and --repeat must be >= 1")
+
+    synthetic = {"deep": deep_frame(args.depth), "wide": wide_frame(args.width)}
+    n_corpus, n_random, bad = check(synthetic)
+
+    report: Dict[str, Any] = {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "ok": not bad,
+        "inputs": {"corpus": n_corpus, "random": n_random, "depth": args.depth, "width": args.width},
+        "mismatches": bad[:20],
+    }
+    if not bad and not args.check_only:
+        report["timings"] = bench(synthetic, args.repeat)
+
+    out_path = REPO_ROOT / "out" / TOOL_ID / "report.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    if bad:
+        print(f"{TOOL_ID}: {len(bad)} mismatch(es); first: {bad[0]}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
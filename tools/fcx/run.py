@@ -18,11 +18,13 @@ from pathlib import Path
 
 
 def _ensure_import_path() -> None:
-    # Allow importing `py/fcx` without installation.
+    # Allow importing `py/fcx` without installation, and `tools.markup.*`
+    # (the InlineMarkup-K1 / PubTeX parsers used by the validators).
     repo_root = Path(__file__).resolve().parents[2]
     py_dir = repo_root / "py"
-    if str(py_dir) not in sys.path:
-        sys.path.insert(0, str(py_dir))
+    for d in (repo_root, py_dir):
+        if str(d) not in sys.path:
+            sys.path.insert(0, str(d))
 
 
 def main() -> int:
@@ -17,6 +17,20 @@ Determinism:
 - no timestamps
 - deterministic truncation by max_chars budget
 
+Library use (e.g. fcx.gates.gate_enforce_repo_law):
+- generate(root) -> text
+- generate_cached(root, cache=...) -> (text, input fingerprint); the
+  fingerprint hashes every input file, so cached text is reused until one
+  of them changes
+- on a fingerprint miss, per-file sections (frame info/excerpts, workflow
+  step lists, tool excerpts) are reused from out/cache/copilot-sections
+  when their input file is unchanged; the document is reassembled and
+  budgeted as on a full run (byte-identical)
+
+Options:
+- --check: compare with --out in memory; exit 1 if stale (nothing written)
+- --no-cache: always regenerate
+
 This file is intended to be large (up to a budget) so coding agents have
 sufficient context without external browsing.
 """
@@ -26,8 +40,9 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -55,9 +70,54 @@ def find_frame(path: Path) -> Tuple[str, str]:
     return gid, ver
 
 
-def list_tools() -> List[Dict[str, str]]:
+class SectionMemo:
+    """Per-section results cached by (kind, params, input file sha256, generator source).
+
+    Values are JSON and live under `copilot-sections/` of the shared cache
+    (`fcx.cache`); file hashes come from `fcx.cache.FileHashCache`, so
+    unchanged inputs are not even read. Without a cache every call computes.
+    """
+
+    def __init__(self, root: Path, cache: Optional[Path] = None, hashes: Any = None) -> None:
+        self.root = root
+        self.hashes = hashes
+        self.store: Any = None
+        if cache is not None:
+            from fcx.cache import ContentCache, FileHashCache
+
+            self.store = ContentCache(cache, "copilot-sections")
+            if self.hashes is None:
+                self.hashes = FileHashCache(cache)
+
+    def __call__(self, kind: str, path: Path, params: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        if self.store is None:
+            return compute()
+        key = sha256_text(
+            json.dumps(
+                {
+                    "generator": self.hashes.sha256(Path(__file__).resolve()),
+                    "kind": kind,
+                    "params": params,
+                    "path": path.relative_to(self.root).as_posix(),
+                    "sha256": self.hashes.sha256(path),
+                },
+                sort_keys=True,
+            )
+        )
+        hit = self.store.get(key)
+        if hit is not None:
+            return json.loads(hit.decode("utf-8"))
+        value = compute()
+        self.store.put(key, json.dumps(value, sort_keys=True).encode("utf-8"))
+        return value
+
+
+_NO_MEMO = SectionMemo(REPO_ROOT)
+
+
+def list_tools(root: Path = REPO_ROOT) -> List[Dict[str, str]]:
     out: List[Dict[str, str]] = []
-    tools_dir = REPO_ROOT / "tools"
+    tools_dir = root / "tools"
     if not tools_dir.exists():
         return out
 
@@ -65,9 +125,9 @@ def list_tools() -> List[Dict[str, str]]:
         run = d / "run"
         run_py = d / "run.py"
         if run.exists() and run.is_file():
-            out.append({"id": d.name, "entrypoint": str(run.relative_to(REPO_ROOT))})
+            out.append({"id": d.name, "entrypoint": str(run.relative_to(root))})
         elif run_py.exists() and run_py.is_file():
-            out.append({"id": d.name, "entrypoint": str(run_py.relative_to(REPO_ROOT))})
+            out.append({"id": d.name, "entrypoint": str(run_py.relative_to(root))})
 
     return out
 
@@ -81,7 +141,9 @@ def _read_file_head(path: Path, *, max_lines: int) -> str:
     return head
 
 
-def list_tool_excerpts(*, max_lines: int = 80) -> List[Dict[str, str]]:
+def list_tool_excerpts(
+    root: Path = REPO_ROOT, *, max_lines: int = 80, memo: SectionMemo = _NO_MEMO
+) -> List[Dict[str, str]]:
     """Return short deterministic excerpts for each tool.
 
     Preference:
@@ -90,7 +152,7 @@ def list_tool_excerpts(*, max_lines: int = 80) -> List[Dict[str, str]]:
     """
 
     out: List[Dict[str, str]] = []
-    tools_dir = REPO_ROOT / "tools"
+    tools_dir = root / "tools"
     if not tools_dir.exists():
         return out
 
@@ -100,13 +162,15 @@ def list_tool_excerpts(*, max_lines: int = 80) -> List[Dict[str, str]]:
         src_path = run_py if run_py.exists() else run if run.exists() else None
         if src_path is None:
             continue
-        excerpt = _read_file_head(src_path, max_lines=max_lines)
+        excerpt = memo(
+            "tool_excerpt", src_path, {"max_lines": max_lines}, lambda: _read_file_head(src_path, max_lines=max_lines)
+        )
         if not excerpt.strip():
             continue
         out.append(
             {
                 "id": d.name,
-                "path": str(src_path.relative_to(REPO_ROOT)),
+                "path": str(src_path.relative_to(root)),
                 "excerpt": excerpt,
             }
         )
@@ -114,28 +178,32 @@ def list_tool_excerpts(*, max_lines: int = 80) -> List[Dict[str, str]]:
     return out
 
 
-def list_workflows() -> List[Dict[str, Any]]:
-    wf_dir = REPO_ROOT / ".github" / "workflows"
+def workflow_entry(root: Path, p: Path) -> Dict[str, Any]:
+    data = read_yaml(p)
+    name = str(data.get("name") or p.name) if isinstance(data, dict) else p.name
+    jobs = []
+    if isinstance(data, dict) and isinstance(data.get("jobs"), dict):
+        for jid, j in sorted(data["jobs"].items(), key=lambda kv: str(kv[0])):
+            if not isinstance(j, dict):
+                continue
+            steps = []
+            for s in (j.get("steps") or []):
+                if isinstance(s, dict):
+                    nm = s.get("name")
+                    if isinstance(nm, str) and nm.strip():
+                        steps.append(nm.strip())
+            jobs.append({"id": str(jid), "name": str(j.get("name") or ""), "steps": steps})
+    return {"path": str(p.relative_to(root)), "name": name, "jobs": jobs}
+
+
+def list_workflows(root: Path = REPO_ROOT, *, memo: SectionMemo = _NO_MEMO) -> List[Dict[str, Any]]:
+    wf_dir = root / ".github" / "workflows"
     out: List[Dict[str, Any]] = []
     if not wf_dir.exists():
         return out
 
     for p in sorted(wf_dir.glob("*.yml"), key=lambda x: x.name):
-        data = read_yaml(p)
-        name = str(data.get("name") or p.name) if isinstance(data, dict) else p.name
-        jobs = []
-        if isinstance(data, dict) and isinstance(data.get("jobs"), dict):
-            for jid, j in sorted(data["jobs"].items(), key=lambda kv: str(kv[0])):
-                if not isinstance(j, dict):
-                    continue
-                steps = []
-                for s in (j.get("steps") or []):
-                    if isinstance(s, dict):
-                        nm = s.get("name")
-                        if isinstance(nm, str) and nm.strip():
-                            steps.append(nm.strip())
-                jobs.append({"id": str(jid), "name": str(j.get("name") or ""), "steps": steps})
-        out.append({"path": str(p.relative_to(REPO_ROOT)), "name": name, "jobs": jobs})
+        out.append(memo("workflow", p, {}, lambda: workflow_entry(root, p)))
 
     return out
 
@@ -146,6 +214,7 @@ def frame_excerpt(
     title: str,
     section_ids: Optional[List[str]] = None,
     max_chars: int = 8000,
+    repo_root: Path = REPO_ROOT,
 ) -> Dict[str, str]:
     """Produce a deterministic excerpt from a GF0 frame.
 
@@ -161,7 +230,7 @@ def frame_excerpt(
 
     g = read_yaml(frame_path)
     if not isinstance(g, dict):
-        return {"title": title, "path": str(frame_path.relative_to(REPO_ROOT)), "text": ""}
+        return {"title": title, "path": str(frame_path.relative_to(repo_root)), "text": ""}
 
     nodes = g.get("nodes") if isinstance(g.get("nodes"), list) else []
     by_id: Dict[str, Dict[str, Any]] = {}
@@ -192,7 +261,7 @@ def frame_excerpt(
 
     out_lines: List[str] = []
     out_lines.append(f"### {title}")
-    out_lines.append(f"Source: `{frame_path.relative_to(REPO_ROOT)}`")
+    out_lines.append(f"Source: `{frame_path.relative_to(repo_root)}`")
 
     def emit_text(n: Dict[str, Any]) -> None:
         kind = str(n.get("kind") or "")
@@ -238,14 +307,14 @@ def frame_excerpt(
         text = "\n".join(out_lines).rstrip() + "\n"
         return {
             "title": title,
-            "path": str(frame_path.relative_to(REPO_ROOT)),
+            "path": str(frame_path.relative_to(repo_root)),
             "text": text[:max_chars],
         }
 
     # Fallback: raw YAML head
     raw = _read_file_head(frame_path, max_lines=200)
     text = "\n".join(out_lines) + "\n\n```yaml\n" + raw + "```\n"
-    return {"title": title, "path": str(frame_path.relative_to(REPO_ROOT)), "text": text[:max_chars]}
+    return {"title": title, "path": str(frame_path.relative_to(repo_root)), "text": text[:max_chars]}
 
 
 def apply_budget(sections: List[Tuple[str, str]], *, max_chars: int) -> Tuple[str, Dict[str, Any]]:
@@ -369,44 +438,67 @@ def render_markdown(report: Dict[str, Any], *, max_chars: int) -> Tuple[str, Dic
     return md, budget_meta
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--out", default=str(REPO_ROOT / ".github" / "copilot-instructions.md"))
-    ap.add_argument("--max-chars", type=int, default=180_000)
-    args = ap.parse_args()
+GENERATOR_ID = "gen_copilot_instructions"
+GENERATOR_VERSION = "0.2.0"
+DEFAULT_MAX_CHARS = 180_000
 
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+LAW_FRAMES = {
+    "RepoLaw-K1": "frames/repo/law/governance/repo-law-k1/v0.1.0/frame.yml",
+    "InlineMarkup-K1": "frames/repo/law/text/inline-markup-k1/v0.1.0/frame.yml",
+}
 
-    laws: Dict[str, Dict[str, str]] = {}
+# Kernel specs (extra context for agents)
+SPEC_FRAMES = {
+    "GF0-K1": "frames/_kernel/spec/gf/gf0-k1/v0.3.0/frame.yml",
+    "SpecFrame-K1": "frames/_kernel/spec/spec/specframe-k1/v0.3.0/frame.yml",
+}
 
-    law_paths = {
-        "RepoLaw-K1": REPO_ROOT / "frames" / "repo" / "law" / "governance" / "repo-law-k1" / "v0.1.0" / "frame.yml",
-        "InlineMarkup-K1": REPO_ROOT / "frames" / "repo" / "law" / "text" / "inline-markup-k1" / "v0.1.0" / "frame.yml",
-    }
 
-    # Kernel specs (extra context for agents)
-    spec_paths = {
-        "GF0-K1": REPO_ROOT / "frames" / "_kernel" / "spec" / "gf" / "gf0-k1" / "v0.3.0" / "frame.yml",
-        "SpecFrame-K1": REPO_ROOT / "frames" / "_kernel" / "spec" / "spec" / "specframe-k1" / "v0.3.0" / "frame.yml",
-    }
+def _frame_excerpt_memo(
+    memo: SectionMemo, frame_path: Path, *, title: str, section_ids: Optional[List[str]], max_chars: int
+) -> Dict[str, str]:
+    return memo(
+        "frame_excerpt",
+        frame_path,
+        {"title": title, "section_ids": section_ids, "max_chars": max_chars},
+        lambda: frame_excerpt(
+            frame_path, title=title, section_ids=section_ids, max_chars=max_chars, repo_root=memo.root
+        ),
+    )
+
+
+def generate(root: Path = REPO_ROOT, *, max_chars: int = DEFAULT_MAX_CHARS, memo: Optional[SectionMemo] = None) -> str:
+    """Render copilot-instructions.md for the repo at `root` (no I/O besides reads).
+
+    With `memo`, per-file sections (frame info and excerpts, workflow step
+    lists, tool excerpts) are reused from the section cache; the document is
+    then reassembled and budgeted exactly as on a full run.
+    """
+
+    memo = memo or SectionMemo(root)
+
+    laws: Dict[str, Dict[str, str]] = {}
+
+    law_paths = {k: root / rel for k, rel in LAW_FRAMES.items()}
+    spec_paths = {k: root / rel for k, rel in SPEC_FRAMES.items()}
 
     for k in sorted(law_paths.keys()):
         p = law_paths[k]
         if p.exists():
-            gid, ver = find_frame(p)
-            laws[k] = {"graph_id": gid, "version": ver, "path": str(p.relative_to(REPO_ROOT))}
+            gid, ver = memo("frame_id", p, {}, lambda: list(find_frame(p)))
+            laws[k] = {"graph_id": gid, "version": ver, "path": str(p.relative_to(root))}
         else:
-            laws[k] = {"graph_id": "", "version": "", "path": str(p.relative_to(REPO_ROOT))}
+            laws[k] = {"graph_id": "", "version": "", "path": str(p.relative_to(root))}
 
-    workflows = list_workflows()
-    tools = list_tools()
+    workflows = list_workflows(root, memo=memo)
+    tools = list_tools(root)
 
     # Excerpts (big context)
     law_excerpts = []
     if law_paths["RepoLaw-K1"].exists():
         law_excerpts.append(
-            frame_excerpt(
+            _frame_excerpt_memo(
+                memo,
                 law_paths["RepoLaw-K1"],
                 title="RepoLaw K1 (condensed excerpt)",
                 section_ids=[
@@ -424,7 +516,8 @@ def main() -> int:
 
     if law_paths["InlineMarkup-K1"].exists():
         law_excerpts.append(
-            frame_excerpt(
+            _frame_excerpt_memo(
+                memo,
                 law_paths["InlineMarkup-K1"],
                 title="InlineMarkup-K1 (primer excerpt)",
                 section_ids=None,
@@ -435,7 +528,8 @@ def main() -> int:
     # IMPORTANT: include kernel spec context early (before tool excerpts)
     if spec_paths["GF0-K1"].exists():
         law_excerpts.append(
-            frame_excerpt(
+            _frame_excerpt_memo(
+                memo,
                 spec_paths["GF0-K1"],
                 title="GF0-K1 (excerpt)",
                 section_ids=None,
@@ -445,7 +539,8 @@ def main() -> int:
 
     if spec_paths["SpecFrame-K1"].exists():
         law_excerpts.append(
-            frame_excerpt(
+            _frame_excerpt_memo(
+                memo,
                 spec_paths["SpecFrame-K1"],
                 title="SpecFrame-K1 (excerpt)",
                 section_ids=None,
@@ -454,21 +549,106 @@ def main() -> int:
         )
 
     report: Dict[str, Any] = {
-        "tool": {"id": "gen_copilot_instructions", "version": "0.2.0"},
+        "tool": {"id": GENERATOR_ID, "version": GENERATOR_VERSION},
         "laws": laws,
         "tools": tools,
         "workflows": workflows,
         "law_excerpts": law_excerpts,
-        "tool_excerpts": list_tool_excerpts(max_lines=80),
+        "tool_excerpts": list_tool_excerpts(root, max_lines=80, memo=memo),
     }
 
-    md, budget_meta = render_markdown(report, max_chars=int(args.max_chars))
+    md, budget_meta = render_markdown(report, max_chars=max_chars)
 
     content = "".join(md)
-    if len(content) > args.max_chars:
-        content = content[: args.max_chars].rstrip() + "\n"
+    if len(content) > max_chars:
+        content = content[:max_chars].rstrip() + "\n"
+    return content
+
 
-    out_path.write_text(content, encoding="utf-8", newline="\n")
+def input_files(root: Path = REPO_ROOT) -> List[Path]:
+    """Every file `generate` reads: law/spec frames, workflows, tool entrypoints (incl. this one)."""
+
+    files = [root / rel for rel in sorted(list(LAW_FRAMES.values()) + list(SPEC_FRAMES.values()))]
+    wf_dir = root / ".github" / "workflows"
+    if wf_dir.exists():
+        files.extend(sorted(wf_dir.glob("*.yml"), key=lambda x: x.name))
+    tools_dir = root / "tools"
+    if tools_dir.exists():
+        for d in sorted([p for p in tools_dir.iterdir() if p.is_dir()], key=lambda p: p.name):
+            files.extend(f for f in (d / "run", d / "run.py") if f.is_file())
+    return [f for f in files if f.is_file()]
+
+
+def input_fingerprint(root: Path = REPO_ROOT, *, max_chars: int = DEFAULT_MAX_CHARS, hashes: Any = None) -> str:
+    """sha256 over the generator version, budget and every input file (path + sha256).
+
+    `hashes` (a `fcx.cache.FileHashCache`) skips re-reading unchanged files.
+    """
+
+    def sha(f: Path) -> str:
+        return hashes.sha256(f) if hashes is not None else hashlib.sha256(f.read_bytes()).hexdigest()
+
+    lines = [f"{GENERATOR_ID}@{GENERATOR_VERSION}\0{max_chars}\n"]
+    for f in input_files(root):
+        lines.append(f"{f.relative_to(root).as_posix()}\0{sha(f)}\n")
+    return sha256_text("".join(lines))
+
+
+def generate_cached(
+    root: Path = REPO_ROOT, *, max_chars: int = DEFAULT_MAX_CHARS, cache: Optional[Path] = None
+) -> Tuple[str, str]:
+    """(text, input fingerprint); with a cache root, text is reused while the fingerprint matches.
+
+    Cached under `copilot/` of the shared cache (`fcx.cache`, e.g. out/cache).
+    On a miss only the sections whose input files changed are recomputed
+    (`SectionMemo`).
+    """
+
+    if cache is None:
+        return generate(root, max_chars=max_chars), input_fingerprint(root, max_chars=max_chars)
+
+    from fcx.cache import ContentCache, FileHashCache
+
+    hashes = FileHashCache(cache)
+    fp = input_fingerprint(root, max_chars=max_chars, hashes=hashes)
+    store = ContentCache(cache, "copilot")
+    hit = store.get(fp)
+    if hit is None:
+        text = generate(root, max_chars=max_chars, memo=SectionMemo(root, cache, hashes))
+        store.put(fp, text.encode("utf-8"))
+    else:
+        text = hit.decode("utf-8")
+    hashes.save()
+    return text, fp
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default=str(REPO_ROOT / ".github" / "copilot-instructions.md"))
+    ap.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS)
+    ap.add_argument("--check", action="store_true", help="compare with --out instead of writing; exit 1 if stale")
+    ap.add_argument("--no-cache", action="store_true", help="always regenerate (ignore out/cache/copilot)")
+    args = ap.parse_args()
+
+    cache = None
+    if not args.no_cache:
+        sys.path.insert(0, str(REPO_ROOT / "py"))
+        from fcx.cache import cache_root
+
+        cache = cache_root(REPO_ROOT)
+
+    content, _ = generate_cached(REPO_ROOT, max_chars=int(args.max_chars), cache=cache)
+
+    out_path = Path(args.out)
+    try:
+        current = out_path.read_text(encoding="utf-8")
+    except OSError:
+        current = None
+    if args.check:
+        return 0 if current == content else 1
+    if current != content:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(content, encoding="utf-8", newline="\n")
     return 0
 
 
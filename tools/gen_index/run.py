@@ -11,21 +11,26 @@ Design goals:
 
 This is intentionally conservative: it only relies on:
 - `governance/publications/registry.yml`
-- `frames/**/frame.yml`
+- `frames/**/v*/frame.yml`, read through the corpus index (`fcx.index`)
 
-If you later want richer navigation (grouping by domain/version), extend the
-`collect_frames()` step.
+If you later want richer navigation (grouping by domain/version), extend
+`collect_pub_docs()`, which reads the frames' index records (`fcx.index`).
 """
 
 from __future__ import annotations
 
-import json
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
-
+from typing import Any, Dict, List, Tuple
 
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
 REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.index import open_index  # noqa: E402
 
 
 def read_text(path: Path) -> str:
@@ -88,26 +93,6 @@ def load_yaml_minimal(path: Path) -> Any:
     return stack[0][1]
 
 
-def find_attr(attrs: Any, key: str) -> Optional[str]:
-    if not isinstance(attrs, list):
-        return None
-    for a in attrs:
-        if isinstance(a, dict) and a.get("key") == key:
-            v = a.get("value")
-            return v if isinstance(v, str) else None
-    return None
-
-
-def find_attrs_json(attrs: Any, key: str) -> Optional[Any]:
-    v = find_attr(attrs, key)
-    if v is None:
-        return None
-    try:
-        return json.loads(v)
-    except Exception:
-        return None
-
-
 @dataclass(frozen=True)
 class PubDoc:
     graph_id: str
@@ -116,79 +101,54 @@ class PubDoc:
     bundle_path: str
     pdf_name: str
     pub_version: str
+    frame_path: str = ""  # relative to the parent of frames_root (the repo root)
 
 
-def collect_pub_docs(frames_root: Path) -> List[PubDoc]:
-    docs: List[PubDoc] = []
+def pdf_basename(bundle_path: str) -> str:
+    """PDF basename used by the workflows: <spec-name>-v<semver>.
 
-    for frame_path in sorted(frames_root.glob("**/frame.yml")):
-        # Parse as YAML-ish by a minimal heuristic: this file is real YAML, but
-        # we only need a few top-level fields and the root node attrs.
-        text = read_text(frame_path)
-        if "graph_id:" not in text or "nodes:" not in text:
-            continue
+    Derived from the last two bundle path components (name + version dir);
+    the version dir may be either "0.1.0" or "v0.1.0".
+    """
 
-        # crude extraction: load via json-like scanning is hard; simplest is to
-        # rely on python's stdlib only by using a tiny bit of YAML parsing logic.
-        # Here we take an easier path: import yaml if available.
-        data: Dict[str, Any]
-        try:
-            import yaml  # type: ignore
+    bp = bundle_path.strip("/").split("/")
+    spec_name = bp[-2] if len(bp) >= 2 else "document"
+    ver = bp[-1] if bp else ""
+    ver = ver[1:] if ver.startswith("v") else ver
+    return f"{spec_name}-v{ver}"
 
-            data = yaml.safe_load(text)
-        except Exception:
-            # If PyYAML isn't available, skip (CI environments typically have it
-            # via other tooling, but we remain safe).
-            continue
 
-        graph_id = str(data.get("graph_id") or "")
-        version = str(data.get("version") or "")
-        nodes = data.get("nodes")
-        if not graph_id or not isinstance(nodes, list):
-            continue
+def collect_pub_docs(frames_root: Path) -> List[PubDoc]:
+    """Publication-marked root `spec` nodes of the frames under frames_root, by graph_id."""
+
+    docs: List[PubDoc] = []
 
-        root = None
-        for n in nodes:
-            if isinstance(n, dict) and n.get("kind") == "spec" and n.get("id") == graph_id:
-                root = n
-                break
-        if root is None:
+    with open_index(frames_root.parent) as idx:
+        records = idx.records()
+
+    for rec in records:
+        if not rec.graph_id or rec.root_kind != "spec":
             continue
 
-        attrs = root.get("attrs")
-        pub_kind = find_attr(attrs, "pub.kind")
-        pub_track = find_attr(attrs, "pub.track")
-        bundle_path = find_attr(attrs, "pub.bundle.path")
-        pub_version = find_attr(attrs, "pub.version")
+        pub_kind = rec.pub.get("pub.kind")
+        pub_track = rec.pub.get("pub.track")
+        bundle_path = rec.pub.get("pub.bundle.path")
+        pub_version = rec.pub.get("pub.version")
 
         if pub_kind != "spec-paper" or pub_track != "zenodo-record":
             continue
         if not bundle_path or not pub_version:
             continue
 
-        title = str(root.get("title") or graph_id)
-        pdf_name = bundle_path.rstrip("/").split("/")[-1] + f"-v{pub_version}"
-        # Keep current convention used by workflow names:
-        # sigma-k1-v0.1.0, sigma-composition-k1-v0.1.0
-        # derive from last two components (name + version) when possible.
-        parts = bundle_path.strip("/").split("/")
-        if len(parts) >= 2:
-            pdf_name = f"{parts[-2]}-v{parts[-1]}" if parts[-1].startswith("v") else f"{parts[-2]}-v{parts[-1]}"
-        # but existing uses `...-v0.1.0` (no leading 'v' in version dir). Keep:
-        if len(parts) >= 1:
-            # last is version like 0.1.0
-            # second last is spec name
-            if len(parts) >= 2:
-                pdf_name = f"{parts[-2]}-v{parts[-1]}"
-
         docs.append(
             PubDoc(
-                graph_id=graph_id,
-                version=version,
-                title=title,
+                graph_id=rec.graph_id,
+                version=rec.version or "",
+                title=rec.title or rec.graph_id,
                 bundle_path=bundle_path,
-                pdf_name=pdf_name,
+                pdf_name=pdf_basename(bundle_path),
                 pub_version=pub_version,
+                frame_path=rec.path,
             )
         )
 
@@ -231,20 +191,11 @@ def write_index(pub_docs: List[PubDoc], registry: Dict[str, Any]) -> None:
         lines.append("")
     else:
         for d in pub_docs:
-            frame_link = (
-                f"[{d.graph_id}]({path_from_root_for_graph(d.graph_id)})"
-                if path_from_root_for_graph(d.graph_id)
-                else d.graph_id
-            )
+            frame_link = f"[{d.graph_id}]({d.frame_path})" if d.frame_path else d.graph_id
 
             # Expected PDF naming convention from workflows:
             #   <spec-name>-v<version>.pdf
-            bp = d.bundle_path.strip("/").split("/")
-            spec_name = bp[-2] if len(bp) >= 2 else "document"
-            ver = bp[-1] if bp else ""
-            # Some bundle paths may use either "0.1.0" or "v0.1.0"; workflows name PDFs as -v<semver>.
-            ver = ver[1:] if ver.startswith("v") else ver
-            pdf_filename = f"{spec_name}-v{ver}.pdf"
+            pdf_filename = f"{pdf_basename(d.bundle_path)}.pdf"
             pdf_rel = f"/{d.bundle_path}/out/{pdf_filename}"
             pdf_url = f"{base}{pdf_rel}" if base else pdf_rel
 
@@ -292,15 +243,6 @@ def write_index(pub_docs: List[PubDoc], registry: Dict[str, Any]) -> None:
     out.write_text("\n".join(lines), encoding="utf-8")
 
 
-def path_from_root_for_graph(graph_id: str) -> str:
-    # best-effort: only for the two known core specs we care about right now.
-    mapping = {
-        "spec://domains/systemics/sigma-k1": "frames/domains/spec/systemics/sigma-k1/v0.1.0/frame.yml",
-        "spec://domains/systemics/sigma-composition-k1": "frames/domains/spec/systemics/sigma-composition-k1/v0.1.0/frame.yml",
-    }
-    return mapping.get(graph_id, "")
-
-
 def main() -> None:
     frames_root = REPO_ROOT / "frames"
     registry_path = REPO_ROOT / "governance" / "publications" / "registry.yml"
@@ -20,10 +20,16 @@ This module is intentionally small and strict.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import re
 
+from fcx.escape import tex_escape as _tex_escape
+
+
+# Bump whenever parse output (MarkupIR or errors) changes; keys DocIR caches.
+PARSER_VERSION = "0.1.0"
+
 
 # -------------------------
 # Errors / violation codes
@@ -42,8 +48,145 @@ def _err(code: str, message: str, pos: int) -> MarkupError:
 
 
 # -------------------------
-# AST helpers (JSON-serializable)
+# Compact MarkupIR (internal)
 # -------------------------
+#
+# Parsing and rendering operate on a compact form: every node is a tuple whose
+# first item is an integer tag. Child sequences are tuples as well.
+#
+#   inline:  (T_TEXT, s) | (T_CODE, s) | (T_MATH, s)
+#            (T_EMPH, kids) | (T_STRONG, kids) | (T_LINK, kids, url)
+#            (T_RAW, dict)                  # unknown JSON node, kept verbatim
+#   block:   (B_PARAGRAPH, kids) | (B_CODE_FENCE, lang, code)
+#            (B_RAW, dict)                  # unknown JSON block, kept verbatim
+#
+# The JSON-serializable dict shape (the DocIR contract) is produced on demand by
+# `to_json`, and `from_json` is its lossless inverse.
+
+T_TEXT = 0
+T_EMPH = 1
+T_STRONG = 2
+T_CODE = 3
+T_MATH = 4
+T_LINK = 5
+T_RAW = 6
+
+B_PARAGRAPH = 0
+B_CODE_FENCE = 1
+B_RAW = 2
+
+_INLINE_NAMES = {T_TEXT: "text", T_EMPH: "emph", T_STRONG: "strong", T_CODE: "code", T_MATH: "math", T_LINK: "link"}
+_INLINE_TAGS = {v: k for k, v in _INLINE_NAMES.items()}
+
+InlineNode = Tuple[Any, ...]
+BlockNode = Tuple[Any, ...]
+
+
+class MarkupDoc:
+    """Compact MarkupIR document (parse result)."""
+
+    __slots__ = ("mode", "blocks", "errors")
+
+    def __init__(self, mode: str, blocks: Tuple[BlockNode, ...], errors: Tuple[MarkupError, ...] = ()) -> None:
+        self.mode = mode
+        self.blocks = blocks
+        self.errors = errors
+
+    def to_json(self, *, with_errors: bool = False) -> Dict[str, Any]:
+        return to_json(self, with_errors=with_errors)
+
+
+def _inline_to_json(n: InlineNode) -> Dict[str, Any]:
+    tag = n[0]
+    if tag in (T_TEXT, T_CODE, T_MATH):
+        return {"t": _INLINE_NAMES[tag], "s": n[1]}
+    if tag in (T_EMPH, T_STRONG):
+        return {"t": _INLINE_NAMES[tag], "c": [_inline_to_json(k) for k in n[1]]}
+    if tag == T_LINK:
+        return {"t": "link", "c": [_inline_to_json(k) for k in n[1]], "url": n[2]}
+    return n[1]
+
+
+def _block_to_json(b: BlockNode) -> Dict[str, Any]:
+    tag = b[0]
+    if tag == B_PARAGRAPH:
+        return {"t": "paragraph", "c": [_inline_to_json(k) for k in b[1]]}
+    if tag == B_CODE_FENCE:
+        return {"t": "code_fence", "lang": b[1], "code": b[2]}
+    return b[1]
+
+
+def to_json(doc: MarkupDoc, *, with_errors: bool = False) -> Dict[str, Any]:
+    """Project a compact document to the JSON MarkupIR shape used by DocIR."""
+
+    out: Dict[str, Any] = {
+        "kind": "inline-markup-k1",
+        "mode": doc.mode,
+        "blocks": [_block_to_json(b) for b in doc.blocks],
+    }
+    if with_errors:
+        out["errors"] = [{"code": e.code, "message": e.message, "pos": e.pos} for e in doc.errors]
+    return out
+
+
+def _inline_from_json(nodes: Any) -> Tuple[InlineNode, ...]:
+    out: List[InlineNode] = []
+    for n in nodes or []:
+        if not isinstance(n, dict):
+            continue
+        tag = _INLINE_TAGS.get(n.get("t"))  # type: ignore[arg-type]
+        if tag in (T_TEXT, T_CODE, T_MATH):
+            out.append((tag, str(n.get("s", ""))))
+        elif tag in (T_EMPH, T_STRONG):
+            out.append((tag, _inline_from_json(n.get("c"))))
+        elif tag == T_LINK:
+            out.append((T_LINK, _inline_from_json(n.get("c")), str(n.get("url", ""))))
+        else:
+            out.append((T_RAW, n))
+    return tuple(out)
+
+
+def from_json(ast: Dict[str, Any]) -> MarkupDoc:
+    """Lift a JSON MarkupIR dict (e.g. read back from DocIR) into compact form."""
+
+    blocks: List[BlockNode] = []
+    for b in ast.get("blocks") or []:
+        if not isinstance(b, dict):
+            continue
+        t = b.get("t")
+        if t == "paragraph":
+            blocks.append((B_PARAGRAPH, _inline_from_json(b.get("c"))))
+        elif t == "code_fence":
+            blocks.append((B_CODE_FENCE, str(b.get("lang") or ""), str(b.get("code") or "")))
+        else:
+            blocks.append((B_RAW, b))
+    errors = tuple(
+        MarkupError(code=str(e.get("code", "")), message=str(e.get("message", "")), pos=int(e.get("pos", 0) or 0))
+        for e in (ast.get("errors") or [])
+        if isinstance(e, dict)
+    )
+    return MarkupDoc(str(ast.get("mode") or ""), tuple(blocks), errors)
+
+
+def as_markup_doc(value: Any) -> Optional[MarkupDoc]:
+    """Return `value` as a compact document, or None if it is not MarkupIR."""
+
+    if isinstance(value, MarkupDoc):
+        return value
+    if isinstance(value, dict) and value.get("kind") == "inline-markup-k1":
+        return from_json(value)
+    return None
+
+
+def markup_json_default(o: Any) -> Any:
+    """`json.dumps(default=...)` hook that serializes embedded MarkupDoc values."""
+
+    if isinstance(o, MarkupDoc):
+        return to_json(o, with_errors=True)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+# JSON node constructors (kept for callers that build MarkupIR dicts directly).
 
 
 def text_node(s: str) -> Dict[str, Any]:
@@ -82,6 +225,16 @@ def parse(text: str, *, mode: str) -> Tuple[Dict[str, Any], List[MarkupError]]:
       ast is a dict with keys: {"kind": "inline-markup-k1", "mode": <mode>, "blocks": [...]}
     """
 
+    doc = parse_compact(text, mode=mode)
+    return to_json(doc), list(doc.errors)
+
+
+def parse_compact(text: str, *, mode: str) -> MarkupDoc:
+    """Parse text to compact MarkupIR (see `parse` for modes).
+
+    Errors are carried on the returned document.
+    """
+
     # Normalize newlines deterministically.
     text = text.replace("\r\n", "\n").replace("\r", "\n")
 
@@ -99,20 +252,19 @@ def parse(text: str, *, mode: str) -> Tuple[Dict[str, Any], List[MarkupError]]:
         )
 
     if mode == "plain":
-        return ({"kind": "inline-markup-k1", "mode": mode, "blocks": [{"t": "paragraph", "c": [text_node(text)]}]}, errors)
+        return MarkupDoc(mode, ((B_PARAGRAPH, ((T_TEXT, text),)),), tuple(errors))
 
     if mode not in ("md-inline", "md-block"):
         errors.append(_err("TEXT.E.BAD_TEXT_FORMAT", f"Unknown text.format: {mode}", 0))
-        return ({"kind": "inline-markup-k1", "mode": mode, "blocks": [{"t": "paragraph", "c": [text_node(text)]}]}, errors)
+        return MarkupDoc(mode, ((B_PARAGRAPH, ((T_TEXT, text),)),), tuple(errors))
 
     if mode == "md-inline":
         # Inline fields are treated as a single paragraph.
-        inl, e2 = _parse_inline(text)
-        errors.extend(e2)
-        return ({"kind": "inline-markup-k1", "mode": mode, "blocks": [{"t": "paragraph", "c": inl}]}, errors)
+        inl = _parse_inline(text, errors)
+        return MarkupDoc(mode, ((B_PARAGRAPH, inl),), tuple(errors))
 
     # md-block
-    blocks: List[Dict[str, Any]] = []
+    blocks: List[BlockNode] = []
     i = 0
     n = len(text)
 
@@ -130,46 +282,37 @@ def parse(text: str, *, mode: str) -> Tuple[Dict[str, Any], List[MarkupError]]:
         # Code fence must be at start of line
         line_start = i == 0 or text[i - 1] == "\n"
         if line_start and startswith_at("```", i):
-            # parse fence header
-            j = i + 3
-            # language until newline
-            lang = ""
-            while j < n and text[j] != "\n":
-                lang += text[j]
-                j += 1
-            if j < n and text[j] == "\n":
+            # parse fence header: language until newline
+            j = text.find("\n", i + 3)
+            if j == -1:
+                j = n
+            lang = text[i + 3 : j]
+            if j < n:
                 j += 1
             # find closing fence at line start
             code_start = j
-            k = j
-            close = None
-            while k < n:
-                if (k == 0 or text[k - 1] == "\n") and text.startswith("```", k):
-                    close = k
-                    break
-                k += 1
+            if text.startswith("```", j) and (j == 0 or text[j - 1] == "\n"):
+                close: Optional[int] = j
+            else:
+                k = text.find("\n```", j)
+                close = None if k == -1 else k + 1
             if close is None:
                 errors.append(_err("TEXT.E.BAD_CODEFENCE", "Unterminated code fence", i))
                 # treat rest as text
                 rest = text[i:]
-                inl, e2 = _parse_inline(rest)
-                errors.extend(e2)
-                blocks.append({"t": "paragraph", "c": inl})
+                inl = _parse_inline(rest, errors)
+                blocks.append((B_PARAGRAPH, inl))
                 break
 
             code = text[code_start:close]
             # strip a single trailing newline in code for stability
             if code.endswith("\n"):
                 code = code[:-1]
-            blocks.append({"t": "code_fence", "lang": lang.strip() or "", "code": code})
+            blocks.append((B_CODE_FENCE, lang.strip() or "", code))
 
             # consume closing fence line
-            k2 = close + 3
-            while k2 < n and text[k2] != "\n":
-                k2 += 1
-            if k2 < n and text[k2] == "\n":
-                k2 += 1
-            i = k2
+            k2 = text.find("\n", close + 3)
+            i = n if k2 == -1 else k2 + 1
             continue
 
         # Paragraph: consume until blank line or code fence at line start
@@ -187,45 +330,46 @@ def parse(text: str, *, mode: str) -> Tuple[Dict[str, Any], List[MarkupError]]:
             # stop if next token is a code fence at line start
             if (i == 0 or text[i - 1] == "\n") and text.startswith("```", i):
                 break
-            # normal char
-            para_lines.append(text[i])
-            i += 1
+            # normal run of chars up to the next newline
+            j = text.find("\n", i)
+            if j == -1:
+                j = n
+            para_lines.append(text[i:j])
+            i = j
 
         para = "".join(para_lines)
         # Normalize newlines within paragraph to single spaces for md output stability.
         # (LaTeX will treat this as a paragraph body too.)
         para = " ".join([ln.strip() for ln in para.split("\n")]).strip()
-        inl, e2 = _parse_inline(para)
-        errors.extend(e2)
-        blocks.append({"t": "paragraph", "c": inl})
+        inl = _parse_inline(para, errors)
+        blocks.append((B_PARAGRAPH, inl))
 
         # Consume blank lines
         while i < n and text[i] == "\n":
             i += 1
 
-    return ({"kind": "inline-markup-k1", "mode": mode, "blocks": blocks}, errors)
+    return MarkupDoc(mode, tuple(blocks), tuple(errors))
 
 
-def _parse_inline(s: str) -> Tuple[List[Dict[str, Any]], List[MarkupError]]:
-    """Parse inline markup for a single line/paragraph.
+def _parse_inline(s: str, errors: List[MarkupError]) -> Tuple[InlineNode, ...]:
+    """Parse inline markup for a single line/paragraph into compact nodes.
 
     This is a strict parser with limited nesting and deterministic precedence.
+    Errors are appended to `errors`.
     """
 
-    errors: List[MarkupError] = []
-
-    out: List[Dict[str, Any]] = []
+    out: List[InlineNode] = []
+    # Pending literal text; flushed as one merged text node when a non-text
+    # node is emitted (adjacent text is merged deterministically).
+    pending: List[str] = []
     i = 0
     n = len(s)
 
-    def emit_text(t: str) -> None:
-        if not t:
-            return
-        # merge adjacent text nodes deterministically
-        if out and out[-1].get("t") == "text":
-            out[-1]["s"] = str(out[-1].get("s", "")) + t
-        else:
-            out.append(text_node(t))
+    def push(node: InlineNode) -> None:
+        if pending:
+            out.append((T_TEXT, "".join(pending)))
+            pending.clear()
+        out.append(node)
 
     while i < n:
         ch = s[i]
@@ -235,10 +379,9 @@ def _parse_inline(s: str) -> Tuple[List[Dict[str, Any]], List[MarkupError]]:
             j = s.find("`", i + 1)
             if j == -1:
                 errors.append(_err("TEXT.E.UNBALANCED_DELIMS", "Unterminated inline code", i))
-                emit_text(s[i:])
+                pending.append(s[i:])
                 break
-            code = s[i + 1 : j]
-            out.append(leaf_node("code", code))
+            push((T_CODE, s[i + 1 : j]))
             i = j + 1
             continue
 
@@ -247,10 +390,9 @@ def _parse_inline(s: str) -> Tuple[List[Dict[str, Any]], List[MarkupError]]:
             j = s.find("$", i + 1)
             if j == -1:
                 errors.append(_err("TEXT.E.UNBALANCED_DELIMS", "Unterminated inline math", i))
-                emit_text(s[i:])
+                pending.append(s[i:])
                 break
-            math = s[i + 1 : j]
-            out.append(leaf_node("math", math))
+            push((T_MATH, s[i + 1 : j]))
             i = j + 1
             continue
 
@@ -259,28 +401,21 @@ def _parse_inline(s: str) -> Tuple[List[Dict[str, Any]], List[MarkupError]]:
             j = s.find("**", i + 2)
             if j == -1:
                 errors.append(_err("TEXT.E.UNBALANCED_DELIMS", "Unterminated strong (**)", i))
-                emit_text(s[i:])
+                pending.append(s[i:])
                 break
-            inner = s[i + 2 : j]
-            kids, e2 = _parse_inline(inner)
-            errors.extend(e2)
-            out.append(wrap_node("strong", kids))
+            push((T_STRONG, _parse_inline(s[i + 2 : j], errors)))
             i = j + 2
             continue
 
         # emphasis (*...*) or _..._
         if ch in ("*", "_"):
-            delim = ch
-            j = s.find(delim, i + 1)
+            j = s.find(ch, i + 1)
             if j == -1:
                 # treat as literal
-                emit_text(delim)
+                pending.append(ch)
                 i += 1
                 continue
-            inner = s[i + 1 : j]
-            kids, e2 = _parse_inline(inner)
-            errors.extend(e2)
-            out.append(wrap_node("emph", kids))
+            push((T_EMPH, _parse_inline(s[i + 1 : j], errors)))
             i = j + 1
             continue
 
@@ -290,21 +425,20 @@ def _parse_inline(s: str) -> Tuple[List[Dict[str, Any]], List[MarkupError]]:
             if close != -1 and close + 1 < n and s[close + 1] == "(":
                 end = s.find(")", close + 2)
                 if end != -1:
-                    label = s[i + 1 : close]
-                    url = s[close + 2 : end]
-                    kids, e2 = _parse_inline(label)
-                    errors.extend(e2)
-                    out.append(link_node(kids, url))
+                    kids = _parse_inline(s[i + 1 : close], errors)
+                    push((T_LINK, kids, s[close + 2 : end]))
                     i = end + 1
                     continue
                 errors.append(_err("TEXT.E.LINK_SYNTAX", "Unterminated link url", i))
             # fallthrough as literal
 
         # default: literal char
-        emit_text(ch)
+        pending.append(ch)
         i += 1
 
-    return out, errors
+    if pending:
+        out.append((T_TEXT, "".join(pending)))
+    return tuple(out)
 
 
 # -------------------------
@@ -312,118 +446,91 @@ def _parse_inline(s: str) -> Tuple[List[Dict[str, Any]], List[MarkupError]]:
 # -------------------------
 
 
-def render_markdown(ast: Dict[str, Any]) -> str:
-    """Render MarkupIR to Markdown deterministically."""
+def _doc_of(ast: Union[Dict[str, Any], MarkupDoc]) -> MarkupDoc:
+    return ast if isinstance(ast, MarkupDoc) else from_json(ast)
+
+
+def render_markdown(ast: Union[Dict[str, Any], MarkupDoc]) -> str:
+    """Render MarkupIR (compact or JSON form) to Markdown deterministically."""
 
-    blocks = ast.get("blocks") or []
     out: List[str] = []
-    for b in blocks:
-        if not isinstance(b, dict):
-            continue
-        t = b.get("t")
-        if t == "code_fence":
-            lang = str(b.get("lang") or "").strip()
-            code = str(b.get("code") or "")
-            out.append(f"```{lang}".rstrip())
-            out.extend(code.split("\n"))
+    for b in _doc_of(ast).blocks:
+        tag = b[0]
+        if tag == B_CODE_FENCE:
+            out.append(f"```{b[1].strip()}".rstrip())
+            out.extend(b[2].split("\n"))
             out.append("```")
             out.append("")
             continue
-        if t == "paragraph":
-            out.append(_render_inline_md(b.get("c") or []))
+        if tag == B_PARAGRAPH:
+            out.append(_render_inline_md(b[1]))
             out.append("")
             continue
         # unknown block
-        out.append(_render_inline_md([text_node(f"[unhandled:{t}]")]))
+        out.append(f"[unhandled:{b[1].get('t')}]")
         out.append("")
     return "\n".join(ln.rstrip() for ln in out).rstrip() + "\n"
 
 
-def _render_inline_md(nodes: List[Dict[str, Any]]) -> str:
+def _render_inline_md(nodes: Tuple[InlineNode, ...]) -> str:
     out: List[str] = []
     for n in nodes:
-        if not isinstance(n, dict):
-            continue
-        t = n.get("t")
-        if t == "text":
-            out.append(str(n.get("s", "")))
-        elif t == "emph":
-            out.append("*" + _render_inline_md(n.get("c") or []) + "*")
-        elif t == "strong":
-            out.append("**" + _render_inline_md(n.get("c") or []) + "**")
-        elif t == "code":
-            out.append("`" + str(n.get("s", "")) + "`")
-        elif t == "math":
-            out.append("$" + str(n.get("s", "")) + "$")
-        elif t == "link":
-            out.append("[" + _render_inline_md(n.get("c") or []) + "](" + str(n.get("url", "")) + ")")
+        tag = n[0]
+        if tag == T_TEXT:
+            out.append(n[1])
+        elif tag == T_EMPH:
+            out.append("*" + _render_inline_md(n[1]) + "*")
+        elif tag == T_STRONG:
+            out.append("**" + _render_inline_md(n[1]) + "**")
+        elif tag == T_CODE:
+            out.append("`" + n[1] + "`")
+        elif tag == T_MATH:
+            out.append("$" + n[1] + "$")
+        elif tag == T_LINK:
+            out.append("[" + _render_inline_md(n[1]) + "](" + n[2] + ")")
         else:
-            out.append(str(n.get("s", "")))
+            out.append(str(n[1].get("s", "")))
     return "".join(out)
 
 
-_LATEX_ESC_MAP = {
-    "\\": r"\textbackslash{}",
-    "{": r"\{",
-    "}": r"\}",
-    "$": r"\$",
-    "&": r"\&",
-    "#": r"\#",
-    "%": r"\%",
-    "_": r"\_",
-    "~": r"\textasciitilde{}",
-    "^": r"\textasciicircum{}",
-}
-
-
-def _tex_escape(s: str) -> str:
-    return "".join(_LATEX_ESC_MAP.get(ch, ch) for ch in s)
-
-
-def render_latex(ast: Dict[str, Any]) -> str:
-    """Render MarkupIR to LaTeX body content (not full document)."""
+def render_latex(ast: Union[Dict[str, Any], MarkupDoc]) -> str:
+    """Render MarkupIR (compact or JSON form) to LaTeX body content (not full document)."""
 
-    blocks = ast.get("blocks") or []
     out: List[str] = []
-    for b in blocks:
-        if not isinstance(b, dict):
-            continue
-        t = b.get("t")
-        if t == "code_fence":
-            code = str(b.get("code") or "")
+    for b in _doc_of(ast).blocks:
+        tag = b[0]
+        if tag == B_CODE_FENCE:
             out.append(r"\begin{verbatim}")
-            out.extend(code.split("\n"))
+            out.extend(b[2].split("\n"))
             out.append(r"\end{verbatim}")
             out.append("")
             continue
-        if t == "paragraph":
-            out.append(_render_inline_tex(b.get("c") or []))
+        if tag == B_PARAGRAPH:
+            out.append(_render_inline_tex(b[1]))
             out.append("")
             continue
-        out.append(_tex_escape(f"[unhandled:{t}]"))
+        out.append(_tex_escape(f"[unhandled:{b[1].get('t')}]"))
         out.append("")
     return "\n".join(ln.rstrip() for ln in out).rstrip() + "\n"
 
 
-def _render_inline_tex(nodes: List[Dict[str, Any]]) -> str:
+def _render_inline_tex(nodes: Tuple[InlineNode, ...]) -> str:
     out: List[str] = []
     for n in nodes:
-        if not isinstance(n, dict):
-            continue
-        t = n.get("t")
-        if t == "text":
-            out.append(_tex_escape(str(n.get("s", ""))))
-        elif t == "emph":
-            out.append(r"\emph{" + _render_inline_tex(n.get("c") or []) + "}")
-        elif t == "strong":
-            out.append(r"\textbf{" + _render_inline_tex(n.get("c") or []) + "}")
-        elif t == "code":
-            out.append(r"\texttt{" + _tex_escape(str(n.get("s", ""))) + "}")
-        elif t == "math":
+        tag = n[0]
+        if tag == T_TEXT:
+            out.append(_tex_escape(n[1]))
+        elif tag == T_EMPH:
+            out.append(r"\emph{" + _render_inline_tex(n[1]) + "}")
+        elif tag == T_STRONG:
+            out.append(r"\textbf{" + _render_inline_tex(n[1]) + "}")
+        elif tag == T_CODE:
+            out.append(r"\texttt{" + _tex_escape(n[1]) + "}")
+        elif tag == T_MATH:
             # math content is not escaped; treated as math mode
-            out.append("$" + str(n.get("s", "")) + "$")
-        elif t == "link":
-            out.append(r"\href{" + _tex_escape(str(n.get("url", ""))) + "}{" + _render_inline_tex(n.get("c") or []) + "}")
+            out.append("$" + n[1] + "$")
+        elif tag == T_LINK:
+            out.append(r"\href{" + _tex_escape(n[2]) + "}{" + _render_inline_tex(n[1]) + "}")
         else:
-            out.append(_tex_escape(str(n.get("s", ""))))
+            out.append(_tex_escape(str(n[1].get("s", ""))))
     return "".join(out)
@@ -28,6 +28,10 @@ from dataclasses import dataclass
 from typing import List, Tuple, Dict
 
 
+# Bump whenever parse output (IR nodes or errors) changes; keys DocIR caches.
+PARSER_VERSION = "0.1.0"
+
+
 @dataclass(frozen=True)
 class PubTexParseError:
     code: str
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Reproducibility gate: render every projection twice and compare digests.
+
+Usage:
+  tools/no_diff/run [--sample K]
+
+For each canonical frame (frames/**/v*/frame.yml) the projections
+- DocIR JSON (tools/render_docir)
+- Markdown (tools/render_md_doc; identical to docs/**/README.md)
+- LaTeX main.tex (tools/render_tex_doc)
+- PubTeX main.tex (tools/render_pub_tex)
+plus docs/MANIFEST.json are rendered in memory (one DocIR load per frame, all
+printers via `fcx.render.render_all`) by two worker processes that
+run concurrently with different PYTHONHASHSEED values. Only sha256 digests
+are exchanged; when they differ, the mismatching projections are re-emitted
+and unified diffs are written under out/no_diff/diff/.
+
+Options:
+- --sample K: check K frames picked evenly from the sorted frame list
+  (quick PR mode); default is every frame.
+
+Determinism:
+- nothing is written to docs/ or copied out of the repo
+- report keys sorted; no timestamps
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.util import sha256_bytes  # noqa: E402
+
+
+TOOL_ID = "no_diff"
+TOOL_VERSION = "0.4.0"
+
+HASH_SEEDS = ("0", "1")
+MANIFEST_KEY = "docs/MANIFEST.json"
+
+
+def list_frames(root: Path) -> List[str]:
+    return [p.relative_to(root).as_posix() for p in sorted(root.glob("frames/**/v*/frame.yml"))]
+
+
+def sample_frames(frames: List[str], k: Optional[int]) -> List[str]:
+    if k is None or k >= len(frames):
+        return frames
+    n = len(frames)
+    return [frames[i * n // k] for i in range(k)]
+
+
+def render_projections(root: Path, frames: List[str]) -> Dict[str, bytes]:
+    """Render all projections of frames in memory: {key: bytes}."""
+
+    import yaml
+
+    from fcx.docir import dump_docir, to_docir
+    from fcx.render import render_all
+    from tools.render_docs.run import TOOL_VERSION as RENDER_DOCS_VERSION
+    from tools.render_docs.run import build_manifest, frame_identity, frameurl_path
+
+    out: Dict[str, bytes] = {}
+    entries: List[Dict[str, str]] = []
+    for rel in frames:
+        src = (root / rel).read_bytes()
+        try:
+            data = yaml.safe_load(src.decode("utf-8"))
+            if not isinstance(data, dict):
+                continue
+            docir = to_docir(data, src)
+            out[f"{rel}::docir"] = dump_docir(docir).encode("utf-8")
+            rendered, errors = render_all(docir)
+            for t, text in rendered.items():
+                out[f"{rel}::{t}"] = text.encode("utf-8")
+            for t, err in errors.items():
+                out[f"{rel}::{t}::error"] = f"{err}\n".encode("utf-8")
+        except (Exception, SystemExit) as e:
+            # Failures must be reproducible too.
+            out[f"{rel}::error"] = f"{type(e).__name__}: {e}\n".encode("utf-8")
+            continue
+        gid, ver = frame_identity(data)
+        if gid is not None and ver is not None:
+            entries.append({"graph_id": gid, "version": ver, "input": rel, "output": f"docs/{frameurl_path(gid)}/v{ver}/README.md"})
+
+    report = {"tool": {"id": "render_docs", "version": RENDER_DOCS_VERSION}, "outputs": entries}
+    out[MANIFEST_KEY] = (json.dumps(build_manifest(report), indent=2, sort_keys=True) + "\n").encode("utf-8")
+    return out
+
+
+def worker_main() -> int:
+    """Worker mode: read {"frames": [...], "emit": [...]} on stdin, answer on stdout."""
+
+    req = json.loads(sys.stdin.read())
+    rendered = render_projections(REPO_ROOT, list(req.get("frames") or []))
+    emit = set(req.get("emit") or [])
+    resp = {
+        "digests": {k: sha256_bytes(v) for k, v in rendered.items()},
+        "content": {k: v.decode("utf-8", errors="replace") for k, v in rendered.items() if k in emit},
+    }
+    sys.stdout.write(json.dumps(resp, sort_keys=True))
+    return 0
+
+
+def run_workers(frames: List[str], emit: List[str]) -> List[Dict[str, Any]]:
+    """Run one worker per hash seed concurrently; return their responses in seed order."""
+
+    payload = json.dumps({"frames": frames, "emit": emit})
+    procs = []
+    for seed in HASH_SEEDS:
+        env = dict(os.environ)
+        env["PYTHONHASHSEED"] = seed
+        procs.append(
+            subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), "--worker"],
+                cwd=str(REPO_ROOT),
+                env=env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+        )
+    # Feed both before waiting on either so they render in parallel.
+    for p in procs:
+        assert p.stdin is not None
+        p.stdin.write(payload)
+        p.stdin.close()
+    out: List[Dict[str, Any]] = []
+    for seed, p in zip(HASH_SEEDS, procs):
+        assert p.stdout is not None
+        data = p.stdout.read()
+        if p.wait() != 0:
+            raise SystemExit(f"no_diff worker failed (PYTHONHASHSEED={seed})")
+        out.append(json.loads(data))
+    return out
+
+
+def _diff_name(key: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "__", key) + ".diff"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sample", type=int, default=None, help="check K evenly spaced frames")
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        return worker_main()
+    if args.sample is not None and args.sample < 1:
+        ap.error("--sample must be >= 1")
+
+    out_dir = REPO_ROOT / "out" / "no_diff"
+    diff_dir = out_dir / "diff"
+    shutil.rmtree(diff_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    frames = sample_frames(list_frames(REPO_ROOT), args.sample)
+    r1, r2 = run_workers(frames, [])
+    d1, d2 = r1["digests"], r2["digests"]
+    differing = sorted(k for k in set(d1) | set(d2) if d1.get(k) != d2.get(k))
+
+    if differing:
+        # Re-emit only the mismatching projections and write their diffs.
+        c1, c2 = (r["content"] for r in run_workers(frames, differing))
+        diff_dir.mkdir(parents=True, exist_ok=True)
+        for k in differing:
+            a = c1.get(k, "").splitlines(keepends=True)
+            b = c2.get(k, "").splitlines(keepends=True)
+            text = "".join(
+                difflib.unified_diff(a, b, fromfile=f"seed{HASH_SEEDS[0]}/{k}", tofile=f"seed{HASH_SEEDS[1]}/{k}")
+            )
+            (diff_dir / _diff_name(k)).write_text(text, encoding="utf-8")
+
+    ok = not differing
+    report = {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "ok": ok,
+        "note": "ok" if ok else "Outputs differ between runs (non-deterministic projections)",
+        "hash_seeds": list(HASH_SEEDS),
+        "frames": len(frames),
+        "sample": args.sample,
+        "checked": len(set(d1) | set(d2)),
+        "differing": [{"key": k, "diff": f"out/no_diff/diff/{_diff_name(k)}"} for k in differing],
+    }
+    (out_dir / "report.json").write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    if not ok:
+        print(report["note"], file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Build publication PDFs from LaTeX bundles with a content-addressed cache.
+
+Usage:
+  tools/pub_build/run --src <dir> --out <dir> --name <basename>
+      [--frame <frame.yml> --manifest <MANIFEST.json>]
+  tools/pub_build/run --jobs-file <jobs.json>
+  common: [--workers N] [--engine <path>] [--no-cache]
+
+jobs.json is a list of {"src", "out", "name", "frame"?, "manifest"?} objects
+(paths relative to the current directory).
+
+For each job:
+- <out>/<name>.pdf, keyed by sha256(bundle) + engine name/flags/version and
+  reused from the cache (out/cache/pdf, or $FCX_CACHE_DIR) when present
+- <out>/SHA256SUMS for all PDFs of the jobs sharing <out> (`shasum -a 256`
+  format)
+- with --frame/--manifest (or "frame"/"manifest"): a tools/pub_manifest
+  record (commit resolved once per run)
+
+Options:
+- --workers N: build cache misses on N concurrent engine processes (default 1)
+- --engine: tectonic/latexmk path or any executable run as `<engine> main.tex`
+  (e.g. a stub for tests); default: $FCX_PDF_ENGINE, else tectonic, else latexmk
+- --no-cache: always build (outputs are still written only when changed)
+
+Outputs:
+- out/pub_build/report.json
+
+Determinism:
+- jobs reported in (out, name) order; no timestamps; cache hits are only
+  reported on stderr, so the report does not depend on cache state
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.cache import cache_root  # noqa: E402
+from fcx.pdf import PDF_BUILDER_VERSION, PdfJob, detect_engine, pdf_cache, run_pdf_jobs, sha256sums  # noqa: E402
+from fcx.util import sha256_bytes, write_bytes_if_changed  # noqa: E402
+from tools.pub_manifest.run import dump_manifest, git_head_sha, manifest_records  # noqa: E402
+
+
+TOOL_ID = "pub_build"
+TOOL_VERSION = "0.1.0"
+
+
+def load_jobs(path: Path) -> List[PdfJob]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(raw, list):
+        raise SystemExit(f"{path}: expected a list of jobs")
+    jobs: List[PdfJob] = []
+    for i, j in enumerate(raw):
+        if not isinstance(j, dict) or not all(isinstance(j.get(k), str) and j.get(k) for k in ("src", "out", "name")):
+            raise SystemExit(f"{path}: job {i} needs string src/out/name")
+        if bool(j.get("frame")) != bool(j.get("manifest")):
+            raise SystemExit(f"{path}: job {i}: frame and manifest go together")
+        jobs.append(
+            PdfJob(
+                src=Path(j["src"]),
+                out=Path(j["out"]),
+                name=j["name"],
+                frame=Path(j["frame"]) if j.get("frame") else None,
+                manifest=Path(j["manifest"]) if j.get("manifest") else None,
+            )
+        )
+    return jobs
+
+
+def write_outputs(
+    jobs: List[PdfJob], built: Dict[PdfJob, Tuple[str, bytes]], errors: Dict[PdfJob, str], commit: str
+) -> List[Dict[str, Any]]:
+    """Write PDFs, per-directory SHA256SUMS and manifests; return report entries in (out, name) order."""
+
+    # PDFs first, then one SHA256SUMS per output directory, then manifests.
+    by_out: Dict[Path, Dict[str, bytes]] = {}
+    for job, (_, data) in built.items():
+        write_bytes_if_changed(job.pdf, data)
+        by_out.setdefault(job.out, {})[job.pdf.name] = data
+    for out, pdfs in by_out.items():
+        write_bytes_if_changed(out / "SHA256SUMS", sha256sums(pdfs).encode("utf-8"))
+
+    # Manifests: one batch, so shared files (frames, bundles) are hashed once.
+    with_manifest = [j for j in built if j.frame is not None and j.manifest is not None]
+    records = manifest_records(
+        [(j.frame, j.src, j.pdf) for j in with_manifest if j.frame is not None],
+        commit,
+        workers=min(8, os.cpu_count() or 1),
+    )
+    manifests = dict(zip(with_manifest, records))
+
+    entries: List[Dict[str, Any]] = []
+    for job in sorted(jobs, key=lambda j: (j.out.as_posix(), j.name)):
+        e: Dict[str, Any] = {"name": job.name, "src": job.src.as_posix(), "pdf": job.pdf.as_posix()}
+        if job in errors:
+            e["error"] = errors[job]
+        else:
+            bundle, data = built[job]
+            e["bundle_sha256"] = bundle
+            e["pdf_sha256"] = sha256_bytes(data)
+            if job in manifests and job.manifest is not None:
+                write_bytes_if_changed(job.manifest, dump_manifest(manifests[job]).encode("utf-8"))
+                e["manifest"] = job.manifest.as_posix()
+        entries.append(e)
+
+    return entries
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--src")
+    ap.add_argument("--out")
+    ap.add_argument("--name", default="document")
+    ap.add_argument("--frame")
+    ap.add_argument("--manifest")
+    ap.add_argument("--jobs-file")
+    ap.add_argument("--workers", type=int, default=1, help="concurrent engine processes (default 1)")
+    ap.add_argument("--engine", default=os.environ.get("FCX_PDF_ENGINE") or None)
+    ap.add_argument("--no-cache", action="store_true", help="always build")
+    args = ap.parse_args()
+
+    if args.workers < 1:
+        ap.error("--workers must be >= 1")
+    if bool(args.frame) != bool(args.manifest):
+        ap.error("--frame and --manifest go together")
+    if args.jobs_file:
+        if args.src or args.out:
+            ap.error("--jobs-file excludes --src/--out")
+        jobs = load_jobs(Path(args.jobs_file))
+    else:
+        if not args.src or not args.out:
+            ap.error("Missing --src or --out")
+        jobs = [
+            PdfJob(
+                src=Path(args.src),
+                out=Path(args.out),
+                name=args.name,
+                frame=Path(args.frame) if args.frame else None,
+                manifest=Path(args.manifest) if args.manifest else None,
+            )
+        ]
+
+    engine = detect_engine(args.engine)
+    cache = None if args.no_cache else pdf_cache(cache_root(REPO_ROOT))
+    built, errors, n_built = run_pdf_jobs(jobs, engine, cache, workers=args.workers)
+
+    commit = git_head_sha(Path.cwd()) if any(j.manifest for j in built) else ""
+    entries = write_outputs(jobs, built, errors, commit)
+
+    report = {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "builder": PDF_BUILDER_VERSION,
+        "engine": {"name": engine.name, "version": engine.version},
+        "ok": not errors,
+        "jobs": entries,
+    }
+    write_bytes_if_changed(
+        REPO_ROOT / "out" / TOOL_ID / "report.json",
+        (json.dumps(report, indent=2, sort_keys=True) + "\n").encode("utf-8"),
+    )
+
+    print(f"{TOOL_ID}: {len(jobs)} job(s), {n_built} engine run(s), rest from cache", file=sys.stderr)
+    for job in sorted(errors, key=lambda j: (j.out.as_posix(), j.name)):
+        print(f"{TOOL_ID}: {job.name}: {errors[job]}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,27 +3,44 @@
 
 Usage:
   tools/pub_manifest/run.py --frame <frame.yml> --src <srcdir> --pdf <pdfpath> --out <MANIFEST.json>
+  tools/pub_manifest/run.py --batch <batch.json> [--workers N] [--no-cache]
 
 The manifest records hashes and build context (commit SHA if available).
+
+batch.json is a list of {"frame", "src", "pdf", "out"} objects (paths
+relative to the current directory). In batch mode:
+- the commit is resolved once for all publications
+- every distinct input/output file is hashed once, on N threads
+- file hashes are reused across runs while (path, size, mtime_ns, inode) is
+  unchanged (`fcx.cache.FileHashCache`, out/cache/hashes or $FCX_CACHE_DIR)
+
+Manifests are written only when their bytes change; their content does not
+depend on the hash cache or on --workers.
 """
 
 from __future__ import annotations
 
 import argparse
-import hashlib
 import json
 import os
 import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.cache import FileHashCache, cache_root  # noqa: E402
+from fcx.util import sha256_file, write_bytes_if_changed  # noqa: E402
 
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+# (frame, src dir, pdf) of one publication build.
+Publication = Tuple[Path, Path, Path]
 
 
 def git_head_sha(root: Path) -> str:
@@ -34,32 +51,30 @@ def git_head_sha(root: Path) -> str:
         return ""
 
 
-def main() -> None:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--frame", required=True)
-    ap.add_argument("--src", required=True)
-    ap.add_argument("--pdf", required=True)
-    ap.add_argument("--out", required=True)
-    args = ap.parse_args()
+def manifest_record(
+    frame: Path, src: Path, pdf: Path, commit: str, digests: Optional[Dict[Path, str]] = None
+) -> Dict[str, Any]:
+    """The manifest record for one publication build (paths as given).
 
-    repo_root = Path.cwd()
-    frame = Path(args.frame)
-    src = Path(args.src)
-    pdf = Path(args.pdf)
-    out = Path(args.out)
+    `digests` maps paths to precomputed sha256s (see `hash_files`); missing
+    paths are hashed here.
+    """
+
+    def sha(p: Path) -> str:
+        return digests[p] if digests is not None and p in digests else sha256_file(p)
 
-    data: Dict[str, Any] = {
+    return {
         "version": "0.1.0",
-        "commit": git_head_sha(repo_root),
+        "commit": commit,
         "inputs": {
             "frame_path": str(frame),
-            "frame_sha256": sha256_file(frame),
+            "frame_sha256": sha(frame),
         },
         "outputs": {
             "main_tex_path": str(src / "main.tex"),
-            "main_tex_sha256": sha256_file(src / "main.tex"),
+            "main_tex_sha256": sha(src / "main.tex"),
             "pdf_path": str(pdf),
-            "pdf_sha256": sha256_file(pdf),
+            "pdf_sha256": sha(pdf),
         },
         "tooling": {
             "render_latex_spec": "0.1.0",
@@ -67,8 +82,75 @@ def main() -> None:
         },
     }
 
+
+def hash_files(paths: Iterable[Path], hashes: Optional[FileHashCache] = None, *, workers: int = 1) -> Dict[Path, str]:
+    """sha256 of each distinct path, computed on `workers` threads (hashlib releases the GIL)."""
+
+    todo = sorted(set(paths))
+    fn = hashes.sha256 if hashes is not None else sha256_file
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        return dict(zip(todo, ex.map(fn, todo)))
+
+
+def manifest_records(
+    pubs: List[Publication], commit: str, hashes: Optional[FileHashCache] = None, *, workers: int = 1
+) -> List[Dict[str, Any]]:
+    """Manifest records for many publications, hashing each distinct file once."""
+
+    digests = hash_files((p for f, s, pdf in pubs for p in (f, s / "main.tex", pdf)), hashes, workers=workers)
+    return [manifest_record(f, s, pdf, commit, digests) for f, s, pdf in pubs]
+
+
+def dump_manifest(data: Dict[str, Any]) -> str:
+    return json.dumps(data, indent=2, sort_keys=True) + "\n"
+
+
+def load_batch(path: Path) -> List[Tuple[Publication, Path]]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(raw, list):
+        raise SystemExit(f"{path}: expected a list of publications")
+    out: List[Tuple[Publication, Path]] = []
+    for i, j in enumerate(raw):
+        if not isinstance(j, dict) or not all(isinstance(j.get(k), str) and j.get(k) for k in ("frame", "src", "pdf", "out")):
+            raise SystemExit(f"{path}: entry {i} needs string frame/src/pdf/out")
+        out.append(((Path(j["frame"]), Path(j["src"]), Path(j["pdf"])), Path(j["out"])))
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frame")
+    ap.add_argument("--src")
+    ap.add_argument("--pdf")
+    ap.add_argument("--out")
+    ap.add_argument("--batch", help="JSON list of {frame, src, pdf, out}")
+    ap.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1), help="hashing threads (batch mode)")
+    ap.add_argument("--no-cache", action="store_true", help="do not use the file hash cache (batch mode)")
+    args = ap.parse_args()
+
+    repo_root = Path.cwd()
+
+    if args.batch:
+        if args.frame or args.src or args.pdf or args.out:
+            ap.error("--batch excludes --frame/--src/--pdf/--out")
+        if args.workers < 1:
+            ap.error("--workers must be >= 1")
+        batch = load_batch(Path(args.batch))
+        hashes = None if args.no_cache else FileHashCache(cache_root(REPO_ROOT))
+        records = manifest_records([pub for pub, _ in batch], git_head_sha(repo_root), hashes, workers=args.workers)
+        if hashes is not None:
+            hashes.save()
+        written = sum(write_bytes_if_changed(out, dump_manifest(rec).encode("utf-8")) for (_, out), rec in zip(batch, records))
+        print(f"pub_manifest: {len(batch)} manifest(s), {written} written", file=sys.stderr)
+        return
+
+    if not (args.frame and args.src and args.pdf and args.out):
+        ap.error("--frame, --src, --pdf and --out are required (or --batch)")
+    data = manifest_record(Path(args.frame), Path(args.src), Path(args.pdf), git_head_sha(repo_root))
+
+    out = Path(args.out)
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    out.write_text(dump_manifest(data), encoding="utf-8")
 
 
 if __name__ == "__main__":
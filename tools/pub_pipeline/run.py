@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Build every registered publication: frame -> DocIR -> PubTeX -> PDF -> manifest.
+
+Usage:
+  tools/pub_pipeline/run [--only <graph_id>]... [--jobs N] [--workers N]
+      [--engine <path>] [--no-cache] [--semantic-keys] [--force] [--list]
+
+Publications are discovered, not listed in CI:
+- root `spec` nodes with `pub.*` attrs (tools/gen_index `collect_pub_docs`:
+  pub.kind=spec-paper, pub.track=zenodo-record, pub.bundle.path, pub.version)
+- whose graph_id is registered in governance/publications/registry.yml
+  (`pub_docs`); pub-marked frames missing from the registry, and registry
+  entries without a frame, are reported and not built
+
+Per publication (<bundle> = pub.bundle.path, <name> = PDF basename):
+- out/docir/<name>.json          DocIR (content-addressed DocIR cache)
+- <bundle>/src/main.tex          PubTeX (skipped when its stamp matches the DocIR)
+- <bundle>/out/<name>.pdf        PDF (cached by bundle sha256 + engine version)
+- <bundle>/out/SHA256SUMS
+- <bundle>/MANIFEST.json         tools/pub_manifest record
+
+Options:
+- --jobs N: render DocIR/PubTeX for N publications at once (processes; default 1)
+- --workers N: concurrent PDF engine processes (default 1)
+- --engine: as tools/pub_build (default: $FCX_PDF_ENGINE, tectonic, latexmk)
+- --no-cache: bypass DocIR/PDF caches and render stamps
+- --semantic-keys: reuse the cached DocIR of a semantically equal frame
+  (see tools/render_docir); a reformatted frame then re-renders to the same
+  PubTeX bytes and its PDF comes from the PDF cache
+- --force: re-render PubTeX even when its stamp is current
+- --list: print the discovered publications and exit
+
+Outputs:
+- out/pub_pipeline/report.json
+
+Determinism:
+- publications processed and reported in graph_id order; no timestamps
+- every stage writes only when bytes change
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.cache import cache_root  # noqa: E402
+from fcx.docir import cached_docir_text, docir_cache  # noqa: E402
+from fcx.pdf import PdfJob, detect_engine, pdf_cache, run_pdf_jobs  # noqa: E402
+from fcx.util import sha256_bytes, write_bytes_if_changed  # noqa: E402
+from tools.gen_index.run import PubDoc, collect_pub_docs  # noqa: E402
+from tools.pub_build.run import write_outputs  # noqa: E402
+from tools.pub_manifest.run import git_head_sha  # noqa: E402
+from tools.render_all.run import render_outputs  # noqa: E402
+
+
+TOOL_ID = "pub_pipeline"
+TOOL_VERSION = "0.1.0"
+
+REGISTRY_REL = "governance/publications/registry.yml"
+
+
+def discover(root: Path) -> Tuple[List[PubDoc], List[str], List[str]]:
+    """(registered publications, unregistered pub graph_ids, registry ids without a frame)."""
+
+    registry_path = root / REGISTRY_REL
+    registry: Any = {}
+    if registry_path.exists():
+        # PyYAML, not gen_index's minimal loader: registry keys are FrameURLs
+        # (`spec://...:`), which that loader splits at the first ':'.
+        try:
+            registry = yaml.safe_load(registry_path.read_text(encoding="utf-8"))
+        except yaml.YAMLError as e:
+            raise SystemExit(f"Failed to parse {registry_path}: {e}")
+    reg = registry.get("pub_docs") if isinstance(registry, dict) and isinstance(registry.get("pub_docs"), dict) else {}
+
+    docs = collect_pub_docs(root / "frames")
+    pubs = [d for d in docs if d.graph_id in reg]
+    unregistered = sorted({d.graph_id for d in docs if d.graph_id not in reg})
+    missing = sorted(set(reg) - {d.graph_id for d in docs})
+    return pubs, unregistered, missing
+
+
+def pdf_job(pub: PubDoc) -> PdfJob:
+    # Repo-relative, so MANIFEST.json records the same paths as the workflows did.
+    bundle = Path(pub.bundle_path)
+    return PdfJob(
+        src=bundle / "src",
+        out=bundle / "out",
+        name=pub.pdf_name,
+        frame=Path(pub.frame_path),
+        manifest=bundle / "MANIFEST.json",
+    )
+
+
+def render_pub(
+    root: Path, pub: PubDoc, croot: Optional[Path], force: bool, semantic: bool = False
+) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+    """Frame -> DocIR -> PubTeX main.tex for one publication; (stage digests, error)."""
+
+    try:
+        src = (root / pub.frame_path).read_bytes()
+        cache = docir_cache(croot) if croot is not None else None
+        docir_text, _ = cached_docir_text(src, cache, semantic=semantic)
+        docir_bytes = docir_text.encode("utf-8")
+        write_bytes_if_changed(root / "out" / "docir" / f"{pub.pdf_name}.json", docir_bytes)
+
+        main_tex = root / pdf_job(pub).src / "main.tex"
+        failures = render_outputs(docir_text, {"pub_tex": main_tex}, force=force, croot=croot)
+        if failures:
+            return None, "; ".join(f"{t}: {err}" for t, err in failures)
+        return {
+            "frame_sha256": sha256_bytes(src),
+            "docir_sha256": sha256_bytes(docir_bytes),
+            "main_tex_sha256": sha256_bytes(main_tex.read_bytes()),
+        }, None
+    except (Exception, SystemExit) as e:
+        return None, str(e)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--only", action="append", default=[], help="build only this graph_id (repeatable)")
+    ap.add_argument("--jobs", type=int, default=1, help="render processes (default 1)")
+    ap.add_argument("--workers", type=int, default=1, help="concurrent PDF engine processes (default 1)")
+    ap.add_argument("--engine", default=os.environ.get("FCX_PDF_ENGINE") or None)
+    ap.add_argument("--no-cache", action="store_true", help="bypass caches and stamps")
+    ap.add_argument("--semantic-keys", action="store_true", help="reuse cached DocIR of semantically equal frames")
+    ap.add_argument("--force", action="store_true", help="re-render PubTeX even if up to date")
+    ap.add_argument("--list", action="store_true", help="list publications and exit")
+    args = ap.parse_args()
+    if args.jobs < 1 or args.workers < 1:
+        ap.error("--jobs/--workers must be >= 1")
+
+    root = REPO_ROOT
+    os.chdir(root)  # PDF jobs use repo-relative paths
+    pubs, unregistered, missing = discover(root)
+    if args.only:
+        unknown = sorted(set(args.only) - {p.graph_id for p in pubs})
+        if unknown:
+            ap.error(f"not a registered publication: {', '.join(unknown)}")
+        pubs = [p for p in pubs if p.graph_id in set(args.only)]
+
+    if args.list:
+        for p in pubs:
+            print(f"{p.graph_id}\t{p.frame_path}\t{p.bundle_path}\t{p.pdf_name}")
+        return 0
+
+    croot = None if args.no_cache else cache_root(root)
+
+    # Stage 1-2 (frame -> DocIR -> PubTeX): independent per publication.
+    if args.jobs > 1 and len(pubs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            n = len(pubs)
+            rendered = list(ex.map(render_pub, [root] * n, pubs, [croot] * n, [args.force] * n, [args.semantic_keys] * n))
+    else:
+        rendered = [render_pub(root, p, croot, args.force, args.semantic_keys) for p in pubs]
+
+    # Stage 3-4 (PDF -> SHA256SUMS/manifest) for every publication whose PubTeX rendered.
+    jobs = {p.graph_id: pdf_job(p) for (p, (_, err)) in zip(pubs, rendered) if err is None}
+    built: Dict[PdfJob, Tuple[str, bytes]] = {}
+    errors: Dict[PdfJob, str] = {}
+    n_built = 0
+    entries: Dict[str, Dict[str, Any]] = {}
+    if jobs:
+        engine = detect_engine(args.engine)
+        cache = None if croot is None else pdf_cache(croot)
+        built, errors, n_built = run_pdf_jobs(list(jobs.values()), engine, cache, workers=args.workers)
+        job_entries = write_outputs(list(jobs.values()), built, errors, git_head_sha(root))
+        by_pdf = {e["pdf"]: e for e in job_entries}
+        entries = {gid: by_pdf[j.pdf.as_posix()] for gid, j in jobs.items()}
+
+    report_pubs: List[Dict[str, Any]] = []
+    failed = 0
+    for p, (stages, err) in zip(pubs, rendered):
+        e: Dict[str, Any] = {
+            "graph_id": p.graph_id,
+            "version": p.version,
+            "pub_version": p.pub_version,
+            "frame": p.frame_path,
+            "bundle": p.bundle_path,
+        }
+        if err is not None:
+            e["error"] = f"render: {err}"
+        else:
+            e.update(stages or {})
+            je = entries[p.graph_id]
+            if "error" in je:
+                e["error"] = f"pdf: {je['error']}"
+            else:
+                e["pdf"] = je["pdf"]
+                e["pdf_sha256"] = je["pdf_sha256"]
+                e["bundle_sha256"] = je["bundle_sha256"]
+                e["manifest"] = je["manifest"]
+        if "error" in e:
+            failed += 1
+        report_pubs.append(e)
+
+    report = {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "ok": failed == 0,
+        "publications": report_pubs,
+        "unregistered": unregistered,
+        "registry_without_frame": missing,
+    }
+    write_bytes_if_changed(
+        root / "out" / TOOL_ID / "report.json",
+        (json.dumps(report, indent=2, sort_keys=True) + "\n").encode("utf-8"),
+    )
+
+    print(f"{TOOL_ID}: {len(pubs)} publication(s), {n_built} engine run(s), {failed} failed", file=sys.stderr)
+    for gid in unregistered:
+        print(f"{TOOL_ID}: warning: {gid} has pub.* attrs but is not in {REGISTRY_REL}", file=sys.stderr)
+    for gid in missing:
+        print(f"{TOOL_ID}: warning: {gid} is in {REGISTRY_REL} but no pub-marked frame was found", file=sys.stderr)
+    for e in report_pubs:
+        if "error" in e:
+            print(f"{TOOL_ID}: {e['graph_id']}: {e['error']}", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
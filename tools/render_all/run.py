@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Render Markdown, generic LaTeX and PubTeX from one DocIR load.
+
+Usage:
+  tools/render_all/run.py (--frame <frame.yml> | --in <docir.json>)
+      [--docir <docir.json>] [--md <doc.md>] [--tex-dir <latex_dir>]
+      [--pub-tex-dir <latex_dir>] [--force] [--no-cache] [--semantic-keys]
+
+Each target is rendered only if its output path is given:
+- --docir: canonical DocIR JSON (with --frame; via the shared DocIR cache,
+  with --semantic-keys also by semantic frame hash, see tools/render_docir)
+- --md: Markdown (same bytes as tools/render_md_doc)
+- --tex-dir: <dir>/main.tex (same bytes as tools/render_tex_doc)
+- --pub-tex-dir: <dir>/main.tex (same bytes as tools/render_pub_tex)
+
+Notes:
+- DocIR is built (or read) and parsed once; all printers share it in memory.
+- Outputs are rewritten only when their bytes change. Targets whose stamp
+  matches the DocIR digest are skipped; stamps are shared with the
+  single-target tools, so mixing them stays incremental. --force overrides.
+- A failing target (e.g. PubTeX rejecting raw TeX) is reported on stderr
+  and makes the exit status 1; the other targets are still written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.cache import cache_root, is_fresh, record_stamp  # noqa: E402
+from fcx.docir import cached_docir_text, docir_cache, read_bytes  # noqa: E402
+from fcx.render import TARGETS, render_all  # noqa: E402
+from fcx.util import sha256_bytes, write_bytes_if_changed  # noqa: E402
+
+
+# target -> tool id whose stamps it shares
+STAMP_TOOLS = {"md": "render_md_doc", "tex": "render_tex_doc", "pub_tex": "render_pub_tex"}
+
+
+def render_outputs(
+    docir_text: str, outputs: Dict[str, Path], *, force: bool = False, croot: Optional[Path] = None
+) -> List[Tuple[str, str]]:
+    """Render the targets in `outputs` ({target: file}) from one DocIR text; returns failures."""
+
+    in_sha = sha256_bytes(docir_text.encode("utf-8"))
+    todo = [
+        t
+        for t in TARGETS
+        if t in outputs
+        and (force or croot is None or not is_fresh(croot, STAMP_TOOLS[t], TARGETS[t][1], in_sha, [outputs[t]]))
+    ]
+    if not todo:
+        return []
+
+    rendered, errors = render_all(json.loads(docir_text), todo)
+    for t in todo:
+        if t not in rendered:
+            continue
+        write_bytes_if_changed(outputs[t], rendered[t].encode("utf-8"))
+        if croot is not None:
+            record_stamp(croot, STAMP_TOOLS[t], TARGETS[t][1], in_sha, [outputs[t]])
+    return sorted(errors.items())
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--frame", dest="frame_path", help="frame.yml (DocIR built in-process)")
+    src.add_argument("--in", dest="in_path", help="DocIR JSON")
+    ap.add_argument("--docir", dest="docir_out", help="write DocIR JSON here (with --frame)")
+    ap.add_argument("--md", dest="md_out")
+    ap.add_argument("--tex-dir", dest="tex_dir")
+    ap.add_argument("--pub-tex-dir", dest="pub_tex_dir")
+    ap.add_argument("--force", action="store_true", help="render even if the input DocIR is unchanged")
+    ap.add_argument("--no-cache", action="store_true", help="bypass the DocIR cache and output stamps")
+    ap.add_argument("--semantic-keys", action="store_true", help="reuse cached DocIR of semantically equal frames")
+    args = ap.parse_args()
+
+    if args.docir_out and not args.frame_path:
+        ap.error("--docir requires --frame")
+
+    croot = None if args.no_cache else cache_root(REPO_ROOT)
+    if args.frame_path:
+        src_bytes = read_bytes(Path(args.frame_path))
+        cache = docir_cache(croot) if croot is not None else None
+        docir_text, _ = cached_docir_text(src_bytes, cache, semantic=args.semantic_keys)
+        if args.docir_out:
+            write_bytes_if_changed(Path(args.docir_out), docir_text.encode("utf-8"))
+    else:
+        docir_text = Path(args.in_path).read_bytes().decode("utf-8")
+
+    outputs: Dict[str, Path] = {}
+    if args.md_out:
+        outputs["md"] = Path(args.md_out)
+    if args.tex_dir:
+        outputs["tex"] = Path(args.tex_dir) / "main.tex"
+    if args.pub_tex_dir:
+        outputs["pub_tex"] = Path(args.pub_tex_dir) / "main.tex"
+
+    failures = render_outputs(docir_text, outputs, force=args.force, croot=croot)
+    for t, err in failures:
+        print(f"render_all: {t}: {err}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
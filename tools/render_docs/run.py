@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Deterministically render docs for all canonical frames in frames/**/v*/frame.yml.
+
+Pipeline: GF0/SpecFrame -> DocIR -> Markdown, in one process
+(`fcx.docir.to_docir` + `fcx.render.md.render`; no per-frame subprocesses).
+
+Usage:
+  tools/render_docs/run [--jobs N] [--incremental] [--no-cache] [--semantic-keys]
+
+Options:
+- --jobs N: render frames on a pool of N worker processes (default 1).
+- --incremental: skip frames whose (frame sha256, renderer versions) match the
+  previous out/render_docs/report.json and whose outputs still exist.
+- --no-cache: bypass the content-addressed DocIR cache (out/cache/docir,
+  or $FCX_CACHE_DIR; shared with tools/render_docir).
+- --semantic-keys: DocIR cache misses fall back to the frame's semantic hash,
+  so reformatted frames reuse their DocIR (see tools/render_docir).
+
+Outputs (relative to the current directory, which must be the repo root):
+- out/render_docs/docir/<frameurl>__v<ver>.json
+- out/render_docs/md/<frameurl>__v<ver>.md
+- docs/<frameurl_path>/v<ver>/README.md
+- out/render_docs/report.json
+- docs/MANIFEST.json
+
+Determinism:
+- frames processed in sorted path order
+- byte-identical to running tools/render_docir + tools/render_md_doc per frame
+- no timestamps
+- outputs are written only when their bytes change (atomic rename), so file
+  mtimes stay stable; report.json and docs/MANIFEST.json are identical to a
+  full single-process rebuild regardless of --jobs/--incremental
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.cache import ContentCache, cache_root  # noqa: E402
+from fcx.docir import DOCIR_VERSION, INLINE_MARKUP_VERSION, PUB_TEX_VERSION  # noqa: E402
+from fcx.docir import cached_docir_text, docir_cache  # noqa: E402
+from fcx.index import frameurl_path, open_index  # noqa: E402
+from fcx.render.md import RENDERER_VERSION as MD_RENDERER_VERSION  # noqa: E402
+from fcx.render.md import render as render_markdown  # noqa: E402
+from fcx.util import sha256_bytes, write_bytes_if_changed  # noqa: E402
+
+
+TOOL_ID = "render_docs"
+TOOL_VERSION = "0.3.0"
+
+# Anything that changes rendered bytes must be listed here; a mismatch against
+# the previous report disables incremental reuse.
+RENDERERS = {
+    "docir": DOCIR_VERSION,
+    "inline_markup_k1": INLINE_MARKUP_VERSION,
+    "pub_tex_inline_v0": PUB_TEX_VERSION,
+    "md": MD_RENDERER_VERSION,
+    TOOL_ID: TOOL_VERSION,
+}
+
+REPORT_REL = "out/render_docs/report.json"
+
+
+def frame_identity(data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    gid = data.get("graph_id")
+    ver = data.get("version")
+
+    # fallback: first node id and root-node version
+    nodes0 = data.get("nodes") if isinstance(data.get("nodes"), list) else []
+    if not isinstance(gid, str) or not gid:
+        for n in nodes0:
+            if isinstance(n, dict) and isinstance(n.get("id"), str) and n.get("id"):
+                gid = n.get("id")
+                break
+    if not isinstance(ver, str) or not ver:
+        if isinstance(gid, str) and gid:
+            for n in nodes0:
+                if isinstance(n, dict) and n.get("id") == gid and isinstance(n.get("version"), str) and n.get("version"):
+                    ver = n.get("version")
+                    break
+
+    if not isinstance(gid, str) or not gid or not isinstance(ver, str) or not ver:
+        return None, None
+    return gid, ver
+
+
+def render_frame(
+    root: Path, p: Path, src: bytes, cache: Optional[ContentCache] = None, *, semantic: bool = False
+) -> Optional[Dict[str, str]]:
+    """Render one frame; returns its report entry (None if the file is not a mapping)."""
+
+    data = yaml.safe_load(src.decode("utf-8"))
+    if not isinstance(data, dict):
+        return None
+
+    gid, ver = frame_identity(data)
+    if gid is None or ver is None:
+        raise ValueError("missing graph_id/version")
+
+    safe = frameurl_path(gid).replace("/", "__")
+    docir_path = root / "out" / "render_docs" / "docir" / f"{safe}__v{ver}.json"
+    md_path = root / "out" / "render_docs" / "md" / f"{safe}__v{ver}.md"
+
+    # DocIR comes from the shared content-addressed cache when available.
+    docir_text, _ = cached_docir_text(src, cache, g=data, semantic=semantic)
+    write_bytes_if_changed(docir_path, docir_text.encode("utf-8"))
+    docir = json.loads(docir_text)
+    md = render_markdown(docir).encode("utf-8")
+    write_bytes_if_changed(md_path, md)
+
+    out_path = root / "docs" / frameurl_path(gid) / f"v{ver}" / "README.md"
+    write_bytes_if_changed(out_path, md)
+
+    return {
+        "graph_id": gid,
+        "version": ver,
+        "input": p.relative_to(root).as_posix(),
+        "sha256": sha256_bytes(src),
+        "docir": docir_path.relative_to(root).as_posix(),
+        "output": out_path.relative_to(root).as_posix(),
+    }
+
+
+def _render_job(
+    root: Path, p: Path, croot: Optional[Path], semantic: bool = False
+) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+    """Worker entry point: (entry, None) on success, (None, error) on failure."""
+
+    try:
+        cache = docir_cache(croot) if croot is not None else None
+        return render_frame(root, p, p.read_bytes(), cache, semantic=semantic), None
+    except (Exception, SystemExit) as e:
+        return None, str(e)
+
+
+def load_previous(root: Path) -> Dict[str, Dict[str, str]]:
+    """Reusable entries of the previous report keyed by input path ({} if renderers changed)."""
+
+    try:
+        prev = json.loads((root / REPORT_REL).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(prev, dict) or prev.get("renderers") != RENDERERS:
+        return {}
+    out: Dict[str, Dict[str, str]] = {}
+    for o in prev.get("outputs") or []:
+        if isinstance(o, dict) and isinstance(o.get("input"), str) and isinstance(o.get("sha256"), str):
+            out[o["input"]] = o
+    return out
+
+
+def _reusable(root: Path, prev: Dict[str, str], sha: str) -> bool:
+    if prev.get("sha256") != sha:
+        return False
+    docir = root / prev["docir"]
+    md = root / "out" / "render_docs" / "md" / (docir.stem + ".md")
+    return docir.is_file() and md.is_file() and (root / prev["output"]).is_file()
+
+
+def build_manifest(report: Dict[str, Any]) -> Dict[str, Any]:
+    outputs = report.get("outputs", [])
+    return {
+        "manifest_version": "0.2.0",
+        "generated_by": {"tool": TOOL_ID, "version": report.get("tool", {}).get("version", "unknown")},
+        "active": {
+            "law": {"graph_id": "law://repo/governance/repo-law-k1", "version": "0.1.0"},
+        },
+        "inputs": sorted(
+            [{"path": o["input"], "graph_id": o["graph_id"], "version": o["version"]} for o in outputs],
+            key=lambda x: (x["graph_id"], x["version"], x["path"]),
+        ),
+        "outputs": sorted(
+            [{"path": o["output"], "graph_id": o["graph_id"], "version": o["version"]} for o in outputs],
+            key=lambda x: (x["graph_id"], x["version"], x["path"]),
+        ),
+    }
+
+
+def render_docs(
+    root: Path, *, jobs: int = 1, incremental: bool = False, use_cache: bool = True, semantic_keys: bool = False
+) -> Dict[str, Any]:
+    """Render every canonical frame under root; writes outputs, report and manifest."""
+
+    (root / "docs").mkdir(parents=True, exist_ok=True)
+    (root / "out" / "render_docs" / "docir").mkdir(parents=True, exist_ok=True)
+    (root / "out" / "render_docs" / "md").mkdir(parents=True, exist_ok=True)
+
+    # Frames and their byte hashes come from the corpus index (`fcx.index`).
+    with open_index(root, use_cache=use_cache) as idx:
+        shas = {root / r.path: r.sha256 for r in idx.records()}
+    frames = list(shas)
+    prev = load_previous(root) if incremental else {}
+    croot = cache_root(root) if use_cache else None
+
+    # Decide per frame: reuse the previous entry or (re)render.
+    results: Dict[Path, Tuple[Optional[Dict[str, str]], Optional[str]]] = {}
+    todo: List[Path] = []
+    for p in frames:
+        old = prev.get(p.relative_to(root).as_posix())
+        if old is not None and _reusable(root, old, shas[p]):
+            results[p] = (old, None)
+        else:
+            todo.append(p)
+
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            n = len(todo)
+            for p, res in zip(todo, ex.map(_render_job, [root] * n, todo, [croot] * n, [semantic_keys] * n)):
+                results[p] = res
+    else:
+        for p in todo:
+            results[p] = _render_job(root, p, croot, semantic_keys)
+
+    outputs: List[Dict[str, str]] = []
+    fails: List[Dict[str, str]] = []
+    for p in frames:
+        entry, err = results[p]
+        if err is not None:
+            fails.append({"path": p.relative_to(root).as_posix(), "error": err})
+        elif entry is not None:
+            outputs.append(entry)
+
+    report = {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "renderers": RENDERERS,
+        "ok": len(fails) == 0,
+        "outputs": sorted(outputs, key=lambda x: (x["graph_id"], x["version"], x["output"])),
+        "failures": fails,
+    }
+    write_bytes_if_changed(root / REPORT_REL, (json.dumps(report, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+    if fails:
+        return report
+
+    write_bytes_if_changed(
+        root / "docs" / "MANIFEST.json",
+        (json.dumps(build_manifest(report), indent=2, sort_keys=True) + "\n").encode("utf-8"),
+    )
+    return report
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=1, help="worker processes (default 1)")
+    ap.add_argument("--incremental", action="store_true", help="reuse unchanged frames from the previous report")
+    ap.add_argument("--no-cache", action="store_true", help="bypass the DocIR cache")
+    ap.add_argument("--semantic-keys", action="store_true", help="reuse cached DocIR of semantically equal frames")
+    args = ap.parse_args()
+    if args.jobs < 1:
+        ap.error("--jobs must be >= 1")
+
+    report = render_docs(
+        Path(".").resolve(),
+        jobs=args.jobs,
+        incremental=args.incremental,
+        use_cache=not args.no_cache,
+        semantic_keys=args.semantic_keys,
+    )
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
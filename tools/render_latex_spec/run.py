@@ -21,29 +21,20 @@ from __future__ import annotations
 import argparse
 import os
 import re
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
 
-_LATEX_SPECIALS = {
-    "\\": r"\textbackslash{}",
-    "{": r"\{",
-    "}": r"\}",
-    "#": r"\#",
-    "%": r"\%",
-    "&": r"\&",
-    "_": r"\_",
-    "^": r"\textasciicircum{}",
-    "~": r"\textasciitilde{}",
-}
-
-
-def latex_escape(text: str) -> str:
-    # Preserve unicode math-ish symbols (Σ, χ, ⪯, →, ×). Escape only LaTeX specials.
-    return "".join(_LATEX_SPECIALS.get(ch, ch) for ch in text)
+from fcx.escape import tex_escape_keep_math as latex_escape  # noqa: E402
 
 
 def norm_ws(s: str) -> str:
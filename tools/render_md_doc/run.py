@@ -2,190 +2,62 @@
 """Render DocIR JSON to deterministic Markdown.
 
 Usage:
-  tools/render_md_doc/run.py --in <docir.json> --out <doc.md>
+  tools/render_md_doc/run.py --in <docir.json|docir.jsonl> --out <doc.md> [--force]
 
 Notes:
-- This is a pure pretty-printer over DocIR.
+- This is a thin CLI over `fcx.render.md` (a pure pretty-printer over DocIR).
 - Deterministic ordering comes from DocIR (already ordered blocks).
+- *.jsonl input (streaming DocIR) is rendered incrementally; same bytes.
+- Skips rendering when the input DocIR bytes and renderer version match the
+  stamp recorded for --out (see `fcx.cache`) and --out is untouched.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
-from typing import Any, Dict, List
 
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
 
-def read_json(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+from fcx.cache import cache_root, is_fresh, record_stamp  # noqa: E402
+from fcx.docir import read_docir_jsonl, split_docir_records  # noqa: E402
+from fcx.render.md import RENDERER_VERSION, render, render_stream  # noqa: E402
+from fcx.util import open_if_changed, sha256_file, write_bytes_if_changed  # noqa: E402
 
 
-def md_escape(s: str) -> str:
-    # Conservative escaping for plain-text fields.
-    # Avoid changing unicode.
-    s = s.replace("\\", "\\\\")
-    s = s.replace("`", "\\`")
-    s = s.replace("*", "\\*")
-    s = s.replace("_", "\\_")
-    s = s.replace("[", "\\[").replace("]", "\\]")
-    return s
-
-
-def render_inline_markup_k1(ast: Dict[str, Any]) -> str:
-    # InlineMarkup-K1 blocks -> Markdown
-    # We render paragraphs separated by blank lines and code fences verbatim.
-    out: List[str] = []
-    blocks = ast.get("blocks") or []
-    for b in blocks:
-        if not isinstance(b, dict):
-            continue
-        t = b.get("t")
-        if t == "code_fence":
-            lang = str(b.get("lang") or "").strip()
-            code = str(b.get("code") or "")
-            out.append(f"```{lang}".rstrip())
-            out.extend(code.split("\n"))
-            out.append("```")
-            out.append("")
-        elif t == "paragraph":
-            out.append(render_inline_nodes_md(b.get("c") or []))
-            out.append("")
-        else:
-            out.append(f"[unhandled:{t}]")
-            out.append("")
-    return "\n".join(out).rstrip("\n")
-
-
-def render_inline_nodes_md(nodes: List[Dict[str, Any]]) -> str:
-    out: List[str] = []
-    for n in nodes:
-        if not isinstance(n, dict):
-            continue
-        t = n.get("t")
-        if t == "text":
-            out.append(str(n.get("s", "")))
-        elif t == "emph":
-            out.append("*" + render_inline_nodes_md(n.get("c") or []) + "*")
-        elif t == "strong":
-            out.append("**" + render_inline_nodes_md(n.get("c") or []) + "**")
-        elif t == "code":
-            out.append("`" + str(n.get("s", "")) + "`")
-        elif t == "math":
-            out.append("$" + str(n.get("s", "")) + "$")
-        elif t == "link":
-            out.append("[" + render_inline_nodes_md(n.get("c") or []) + "](" + str(n.get("url", "")) + ")")
-        else:
-            out.append(str(n.get("s", "")))
-    return "".join(out)
-
-
-def render_body(docir_block: Dict[str, Any], field: str) -> List[str]:
-    # Prefer structured markup if present; otherwise treat as plain text.
-    # field is informational (may inform escaping later).
-    bm = docir_block.get("body_markup")
-    if isinstance(bm, dict) and bm.get("kind") == "inline-markup-k1":
-        errors = bm.get("errors") or []
-        # Do not fail rendering here; validators are responsible for enforcing.
-        _ = errors
-        return [render_inline_markup_k1(bm), ""]
-
-    body = md_escape(str(docir_block.get("body", "")))
-    return [body, ""] if body else [""]
-
-
-def render_block(b: Dict[str, Any]) -> List[str]:
-    t = b.get("type")
-    if t == "heading":
-        level = int(b.get("level", 1))
-        title = md_escape(str(b.get("title", "")))
-        anchor = str(b.get("anchor", ""))
-        # GitHub MD headings autogenerate ids; keep explicit anchor as HTML.
-        out = [f"{'#' * max(1, min(6, level))} {title}"]
-        if anchor:
-            out.append(f"<a id=\"{anchor}\"></a>")
-        out.append("")
-        return out
-
-    if t == "paragraph":
-        # Prefer MarkupIR in paragraphs too (not only clause/definition bodies).
-        if isinstance(b.get("body_markup"), dict) and b.get("body_markup", {}).get("kind") == "inline-markup-k1":
-            return [render_inline_markup_k1(b.get("body_markup") or {}), ""]
-        txt = md_escape(str(b.get("text", "")))
-        return [txt, ""] if txt else [""]
-
-    if t == "definition":
-        label = md_escape(str(b.get("label", "")))
-        status = md_escape(str(b.get("status", "")))
-        head = f"**{label}**" + (f" _({status})_" if status else "")
-        out = [head, ""]
-        out.extend(render_body(b, "body"))
-        return out
-
-    if t == "clause":
-        label = md_escape(str(b.get("label", "")))
-        status = md_escape(str(b.get("status", "")))
-        head = f"**{label}**" + (f" _({status})_" if status else "")
-        out = [head, ""]
-        out.extend(render_body(b, "body"))
-        return out
-
-    if t == "property":
-        label = md_escape(str(b.get("label", "")))
-        status = md_escape(str(b.get("status", "")))
-        symbols = b.get("symbols") or []
-        head = f"**{label}**" + (f" _({status})_" if status else "")
-        out = [head, ""]
-        if symbols:
-            for s in symbols:
-                sym = md_escape(str(s.get("sym", "")))
-                desc = md_escape(str(s.get("desc", "")))
-                out.append(f"- `{sym}`: {desc}")
-            out.append("")
-        return out
-
-    if t == "list_item":
-        txt = md_escape(str(b.get("text", "")))
-        return [f"- {txt}"]
-
-    if t == "note":
-        kind = md_escape(str(b.get("kind", "note")))
-        txt = md_escape(str(b.get("text", "")))
-        return [f"> **{kind}**: {txt}", ""]
-
-    return [f"> **unhandled block**: `{t}`", ""]
-
-
-def render(docir: Dict[str, Any]) -> str:
-    lines: List[str] = []
-
-    fm = docir.get("front_matter", {})
-    title = str(fm.get("title", ""))
-    if title:
-        pass  # first heading block should already contain it
-
-    for b in docir.get("blocks", []):
-        if not isinstance(b, dict):
-            continue
-        lines.extend(render_block(b))
-
-    # Normalize trailing whitespace and ensure newline at EOF.
-    out = "\n".join(ln.rstrip() for ln in lines).rstrip() + "\n"
-    return out
+TOOL_ID = "render_md_doc"
 
 
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="in_path", required=True)
     ap.add_argument("--out", dest="out_path", required=True)
+    ap.add_argument("--force", action="store_true", help="render even if the input DocIR is unchanged")
     args = ap.parse_args()
 
     in_path = Path(args.in_path)
     out_path = Path(args.out_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    docir = read_json(in_path)
-    out_path.write_text(render(docir), encoding="utf-8")
+    in_sha = sha256_file(in_path)
+    croot = cache_root(REPO_ROOT)
+    if not args.force and is_fresh(croot, TOOL_ID, RENDERER_VERSION, in_sha, [out_path]):
+        return
+
+    if in_path.suffix == ".jsonl":
+        # Streaming DocIR: print block by block through a buffered file.
+        with in_path.open(encoding="utf-8") as fh, open_if_changed(out_path) as out:
+            front, blocks = split_docir_records(read_docir_jsonl(fh))
+            render_stream(front.get("front_matter", {}), blocks, out.write)
+    else:
+        docir = json.loads(in_path.read_bytes().decode("utf-8"))
+        write_bytes_if_changed(out_path, render(docir).encode("utf-8"))
+    record_stamp(croot, TOOL_ID, RENDERER_VERSION, in_sha, [out_path])
 
 
 if __name__ == "__main__":
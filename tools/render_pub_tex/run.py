@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Render DocIR JSON to a deterministic LaTeX bundle using PubTeX Inline IR.
 
-This renderer is intended for publication-grade TeX output.
+This renderer is intended for publication-grade TeX output. The printer lives
+in `fcx.render.pub_tex`; this is its CLI.
 
 Key idea (Option A): frames may attach a publication-specific inline IR via attrs
 (e.g. `pub.tex.summary`, `pub.tex.text`) that is carried into DocIR as
@@ -14,10 +15,13 @@ TeX passthrough (opt-in):
   For now we keep this mode opt-in and leave enforcement to future tooling.
 
 Input:
-- DocIR JSON (tools/render_docir/run.py output)
+- DocIR JSON (tools/render_docir/run.py output), or streaming DocIR JSON Lines
+  (*.jsonl, `--jsonl`), which is rendered incrementally with the same bytes
 
 Output:
 - a directory containing `main.tex`
+- rendering is skipped when the input DocIR bytes and renderer version match
+  the stamp recorded for that main.tex (see `fcx.cache`); --force overrides
 
 Determinism:
 - stable ordering (comes from DocIR)
@@ -33,278 +37,49 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
 
+# Allow importing `py/fcx` (and tools/* for its parsers) without installation.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
 
-# Minimal TeX escaping for text segments.
-_LATEX_SPECIALS = {
-    "\\": r"\textbackslash{}",
-    "{": r"\{",
-    "}": r"\}",
-    "$": r"\$",
-    "&": r"\&",
-    "#": r"\#",
-    "%": r"\%",
-    "_": r"\_",
-    "~": r"\textasciitilde{}",
-    "^": r"\textasciicircum{}",
-}
+from fcx.cache import cache_root, is_fresh, record_stamp  # noqa: E402
+from fcx.docir import read_docir_jsonl, split_docir_records  # noqa: E402
+from fcx.render.pub_tex import RENDERER_VERSION, render_tex, render_tex_stream  # noqa: E402
+from fcx.util import open_if_changed, sha256_file, write_bytes_if_changed  # noqa: E402
 
 
-def tex_escape(s: str) -> str:
-    return "".join(_LATEX_SPECIALS.get(ch, ch) for ch in s)
-
-
-# Strongly disallow obvious raw-TeX injection in math strings.
-# (This is intentionally conservative; expand only with policy.)
-_FORBIDDEN_TEX_RE = re.compile(r"\\(input|include|write|openout|read|usepackage|catcode|def|edef|gdef)\b")
-
-# Extra-conservative for code spans: disallow any backslash control sequence.
-_FORBIDDEN_CODE_RE = re.compile(r"\\[A-Za-z@]+")
-
-
-def validate_math_tex(s: str) -> None:
-    if _FORBIDDEN_TEX_RE.search(s or ""):
-        raise ValueError("PubTeXIR: forbidden control sequence in math segment")
-
-
-def validate_code_tex(s: str) -> None:
-    if _FORBIDDEN_CODE_RE.search(s or ""):
-        raise ValueError("PubTeXIR: forbidden control sequence in code segment")
-
-
-def read_json(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _is_tex_passthrough(text_format: Any) -> bool:
-    return text_format in ("tex-inline", "tex-block")
-
-
-def _read_passthrough_block_text(b: Dict[str, Any]) -> str:
-    """Pick the correct string payload for passthrough blocks."""
-
-    # DocIR uses:
-    # - paragraph: `text`
-    # - clause/definition: `body`
-    # Keep this deterministic and explicit.
-    t = b.get("type")
-    if t == "paragraph":
-        return str(b.get("text", ""))
-    if t in ("clause", "definition"):
-        return str(b.get("body", ""))
-    return str(b.get("text", "") or b.get("body", ""))
-
-
-def _read_passthrough_heading_title(b: Dict[str, Any]) -> str:
-    return str(b.get("title", ""))
-
-
-def render_tex_inline(nodes: List[Dict[str, Any]]) -> str:
-    """Render constrained publication inline nodes."""
-
-    out: List[str] = []
-    for n in nodes:
-        if not isinstance(n, dict):
-            continue
-        t = n.get("t")
-        if t == "text":
-            out.append(tex_escape(str(n.get("s", ""))))
-        elif t == "math":
-            s = str(n.get("s", ""))
-            validate_math_tex(s)
-            out.append(r"\\(" + s + r"\\)")
-        elif t == "code":
-            # Inline code (not block). Keep it simple and deterministic.
-            s = str(n.get("s", ""))
-            validate_code_tex(s)
-            out.append(r"\\texttt{" + tex_escape(s) + "}")
-        elif t == "strong":
-            out.append(r"\textbf{" + render_tex_inline(n.get("c") or []) + "}")
-        elif t == "emph":
-            out.append(r"\emph{" + render_tex_inline(n.get("c") or []) + "}")
-        elif t == "link":
-            url = tex_escape(str(n.get("url", "")))
-            label = render_tex_inline(n.get("c") or [])
-            out.append(r"\href{" + url + "}{" + label + "}")
-        else:
-            # Unknown nodes are rendered as escaped text for robustness.
-            out.append(tex_escape(str(n.get("s", ""))))
-    return "".join(out)
-
-
-def render_preamble(title: str) -> List[str]:
-    # NOTE: Title may contain TeX. For now we treat it as plain text and escape.
-    # If you want TeX titles, add an explicit, validated passthrough profile.
-    t = tex_escape(title or "Document")
-    return [
-        r"\documentclass[11pt]{article}",
-        r"\usepackage[T1]{fontenc}",
-        r"\usepackage[utf8]{inputenc}",
-        r"\usepackage{lmodern}",
-        r"\usepackage{hyperref}",
-        r"\usepackage{geometry}",
-        r"\usepackage{amsmath}",
-        r"\usepackage{amssymb}",
-        r"\usepackage{fancyvrb}",
-        r"\geometry{margin=1in}",
-        "",
-        rf"\title{{{t}}}",
-        r"\author{}",
-        r"\date{}",
-        "",
-        r"\begin{document}",
-        r"\maketitle",
-        "",
-    ]
-
-
-def render_block(b: Dict[str, Any]) -> List[str]:
-    t = b.get("type")
-
-    if t == "heading":
-        level = int(b.get("level", 1))
-
-        if _is_tex_passthrough(b.get("text_format")):
-            title = _read_passthrough_heading_title(b).strip()
-        else:
-            title = tex_escape(str(b.get("title", "")))
-
-        if level <= 1:
-            return [rf"\section*{{{title}}}", ""]
-        if level == 2:
-            return [rf"\subsection*{{{title}}}", ""]
-        if level == 3:
-            return [rf"\subsubsection*{{{title}}}", ""]
-        return [rf"\paragraph*{{{title}}}", ""]
-
-    if t == "paragraph":
-        if _is_tex_passthrough(b.get("text_format")):
-            raw = _read_passthrough_block_text(b).rstrip()
-            return [raw, ""] if raw else [""]
-
-        pub = b.get("pub_tex_inline")
-        if isinstance(pub, dict) and pub.get("kind") == "pub-tex-inline-v0":
-            return [render_tex_inline(pub.get("nodes") or []), ""]
-        txt = str(b.get("text", "")).strip()
-        return [tex_escape(txt), ""] if txt else [""]
-
-    if t in ("definition", "clause"):
-        # Allow TeX-capable labels via explicit passthrough.
-        if _is_tex_passthrough(b.get("text_format")):
-            label = str(b.get("label", ""))
-        else:
-            label = tex_escape(str(b.get("label", "")))
-
-        status = tex_escape(str(b.get("status", "")))
-        head = rf"\textbf{{{label}}}" + (rf" \emph{{({status})}}" if status else "")
-        out: List[str] = [head, ""]
-
-        if _is_tex_passthrough(b.get("text_format")):
-            raw = _read_passthrough_block_text(b).rstrip()
-            out.extend([raw, ""] if raw else [""])
-            return out
-
-        pub = b.get("pub_tex_inline")
-        if isinstance(pub, dict) and pub.get("kind") == "pub-tex-inline-v0":
-            out.append(render_tex_inline(pub.get("nodes") or []))
-            out.append("")
-            return out
-
-        body = str(b.get("body", "")).strip()
-        out.extend([tex_escape(body), ""] if body else [""])
-        return out
-
-    if t == "property":
-        label = tex_escape(str(b.get("label", "")))
-        status = tex_escape(str(b.get("status", "")))
-        head = rf"\textbf{{{label}}}" + (rf" \emph{{({status})}}" if status else "")
-        out: List[str] = [head, ""]
-
-        symbols = b.get("symbols") or []
-        if symbols:
-            out.append(r"\begin{itemize}")
-            for s in symbols:
-                sym_raw = str(s.get("sym", ""))
-                desc_raw = str(s.get("desc", ""))
-
-                # Symbols/descriptions are part of the TeX output; treat as plain text
-                # unless explicitly marked by the frame as TeX passthrough.
-                sym = sym_raw
-                desc = desc_raw
-                if not _is_tex_passthrough(b.get("text_format")):
-                    sym = tex_escape(sym_raw)
-                    desc = tex_escape(desc_raw)
-
-                if sym:
-                    out.append(rf"  \item \({sym}\): {desc}")
-                else:
-                    out.append(rf"  \item {desc}")
-            out.append(r"\end{itemize}")
-            out.append("")
-        return out
-
-    return [rf"\begin{{quote}}\textbf{{unhandled block}}: {tex_escape(str(t))}\end{{quote}}", ""]
-
-
-def render_tex(docir: Dict[str, Any]) -> str:
-    fm = docir.get("front_matter", {})
-    title = str(fm.get("title", ""))
-
-    lines: List[str] = []
-    lines.extend(render_preamble(title))
-
-    in_itemize = False
-    skipped_title_heading = False
-
-    for b in docir.get("blocks", []):
-        if not isinstance(b, dict):
-            continue
-
-        if not skipped_title_heading and b.get("type") == "heading":
-            try:
-                level = int(b.get("level", 1))
-            except Exception:
-                level = 1
-            if level <= 1:
-                htitle = str(b.get("title", ""))
-                if title and htitle.strip() == title.strip():
-                    skipped_title_heading = True
-                    continue
-
-        if b.get("type") == "list_item" and not in_itemize:
-            lines.append(r"\begin{itemize}")
-            in_itemize = True
-
-        if b.get("type") != "list_item" and in_itemize:
-            lines.append(r"\end{itemize}")
-            lines.append("")
-            in_itemize = False
-
-        lines.extend(render_block(b))
-
-    if in_itemize:
-        lines.append(r"\end{itemize}")
-        lines.append("")
-
-    lines.append(r"\end{document}")
-    return "\n".join(ln.rstrip() for ln in lines).rstrip() + "\n"
+TOOL_ID = "render_pub_tex"
 
 
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="in_path", required=True)
     ap.add_argument("--out-dir", dest="out_dir", required=True)
+    ap.add_argument("--force", action="store_true", help="render even if the input DocIR is unchanged")
     args = ap.parse_args()
 
     in_path = Path(args.in_path)
-    out_dir = Path(args.out_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    docir = read_json(in_path)
-    (out_dir / "main.tex").write_text(render_tex(docir), encoding="utf-8")
+    out_tex = Path(args.out_dir) / "main.tex"
+
+    # Skip when this DocIR was already rendered into an untouched main.tex.
+    in_sha = sha256_file(in_path)
+    croot = cache_root(REPO_ROOT)
+    if not args.force and is_fresh(croot, TOOL_ID, RENDERER_VERSION, in_sha, [out_tex]):
+        return
+
+    if in_path.suffix == ".jsonl":
+        # Streaming DocIR: print block by block through a buffered file.
+        with in_path.open(encoding="utf-8") as fh, open_if_changed(out_tex) as out:
+            front, blocks = split_docir_records(read_docir_jsonl(fh))
+            render_tex_stream(front.get("front_matter", {}), blocks, out.write)
+    else:
+        docir = json.loads(in_path.read_bytes().decode("utf-8"))
+        write_bytes_if_changed(out_tex, render_tex(docir).encode("utf-8"))
+    record_stamp(croot, TOOL_ID, RENDERER_VERSION, in_sha, [out_tex])
 
 
 if __name__ == "__main__":
@@ -4,7 +4,8 @@
 This is a repo-local deterministic renderer.
 
 Input:
-- frame file path (YAML) OR reads all frames in frames/**/v*/frame.yml when no args are given.
+- frame file path (YAML) OR reads all frames in frames/**/v*/frame.yml when no args are given
+  (enumerated through the corpus index, `fcx.index`).
 
 Output (default):
 - docs/<frameurl_path>/v<version>/README.md
@@ -30,6 +31,15 @@ except Exception:
     print("ERROR: PyYAML is required (pip install pyyaml)", file=sys.stderr)
     raise
 
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.graph import contains_forest  # noqa: E402
+from fcx.index import frameurl_path as _frameurl_path, open_index  # noqa: E402
+
 
 _FRAME_LEAF = "frame.yml"
 
@@ -46,15 +56,6 @@ def _stable_json(x) -> str:
     return json.dumps(x, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
-def _frameurl_path(graph_id: str) -> str:
-    # render://_kernel/md/simple-k1 -> _kernel/render/md/simple-k1
-    # <scheme>://<scope>/<segments...>
-    if "://" not in graph_id:
-        return graph_id
-    scheme, rest = graph_id.split("://", 1)
-    return f"{rest.split('/',1)[0]}/{scheme}/{rest.split('/',1)[1] if '/' in rest else ''}".rstrip("/")
-
-
 def _yaml_block(obj: dict) -> str:
     # Deterministic YAML code block: stable key order.
     # PyYAML doesn't guarantee ordering; we pre-sort dict keys recursively.
@@ -156,9 +157,7 @@ def _contains_forest(nodes: list[dict], edges: list[dict], root_id: str, contain
     node_ids = sorted([n["id"] for n in nodes if isinstance(n, dict) and _is_str(n.get("id"))])
     node_set = set(node_ids)
 
-    children: dict[str, list[str]] = {nid: [] for nid in node_ids}
-    indegree: dict[str, int] = {nid: 0 for nid in node_ids}
-
+    pairs: list[tuple[str, str]] = []
     for e in edges:
         if not isinstance(e, dict):
             continue
@@ -169,43 +168,25 @@ def _contains_forest(nodes: list[dict], edges: list[dict], root_id: str, contain
         if not (_is_str(frm) and _is_str(to)):
             continue
         if frm in node_set and to in node_set:
-            children[frm].append(to)
-            indegree[to] += 1
+            pairs.append((frm, to))
 
-    # determinism
-    for k in children.keys():
-        children[k] = sorted(set(children[k]))
+    # Shared iterative analysis (fcx.graph): distinct sorted children, every multi-parent node and cycle.
+    forest = contains_forest(pairs)
+    children: dict[str, list[str]] = {nid: forest.children.get(nid, []) for nid in node_ids}
 
-    multi_parents = sorted([nid for nid, d in indegree.items() if d > 1])
-    if multi_parents:
-        warnings.append({"type": "contains_multiple_parents", "nodes": multi_parents})
+    if forest.multi_parent:
+        warnings.append({"type": "contains_multiple_parents", "nodes": forest.multi_parent})
 
     # roots
     if root_id in node_set:
         roots = [root_id]
     else:
-        roots = sorted([nid for nid, d in indegree.items() if d == 0 and children.get(nid)])
+        roots = forest.roots()
         if roots:
             warnings.append({"type": "missing_root_node_for_contains", "root": root_id})
 
-    # cycle detection (DFS)
-    temp: set[str] = set()
-    perm: set[str] = set()
-
-    def dfs(nid: str):
-        if nid in perm:
-            return
-        if nid in temp:
-            warnings.append({"type": "contains_cycle", "at": nid})
-            return
-        temp.add(nid)
-        for c in children.get(nid, []):
-            dfs(c)
-        temp.remove(nid)
-        perm.add(nid)
-
-    for r in roots:
-        dfs(r)
+    for cyc in forest.cycles:
+        warnings.append({"type": "contains_cycle", "at": cyc[0], "cycle": cyc})
 
     return roots, children, warnings
 
@@ -361,15 +342,27 @@ def render_frame(frame: dict, *, heading_level: int = 1) -> tuple[str, list[dict
     if any(e.get("type") == contains_type for e in edges_sorted):
         lines.append(f"{h}# Contains Tree")
 
-        def emit(nid: str, depth: int):
-            indent = "  " * depth
-            lines.append(f"{indent}- {nid}")
-            for c in children.get(nid, []):
-                emit(c, depth + 1)
+        def emit(root: str):
+            # Pre-order, iteratively; a node already on the path (a contains
+            # cycle, reported above) is listed but not expanded again.
+            stack = [(root, 0)]
+            path: list[str] = []
+            on_path: set[str] = set()
+            while stack:
+                nid, depth = stack.pop()
+                for done in path[depth:]:
+                    on_path.discard(done)
+                del path[depth:]
+                lines.append(f"{'  ' * depth}- {nid}")
+                if nid in on_path:
+                    continue
+                path.append(nid)
+                on_path.add(nid)
+                stack.extend((c, depth + 1) for c in reversed(children.get(nid, [])))
 
         if roots:
             for r in roots:
-                emit(r, 0)
+                emit(r)
         else:
             lines.append("- (none)")
         lines.append("")
@@ -409,7 +402,8 @@ def main() -> int:
         # Normalize provided paths to absolute so relative_to() is stable.
         frames = [Path(a).resolve() for a in args]
     else:
-        frames = sorted(root.glob('frames/**/v*/frame.yml'))
+        with open_index(root) as idx:
+            frames = [root / r.path for r in idx.records()]
 
     failures: list[dict] = []
     outputs: list[dict] = []
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Run the CI contract (ci/contract.yml) as a dependency DAG.
+
+Usage:
+  tools/run_contract/run [--gate <id>]... [--jobs N] [--seconds N]
+      [--timeout N] [--force] [--no-cache] [--list]
+
+Each gate is `{id, tool, inputs?, outputs, timeout_seconds?, depends_on?}`:
+- gate B depends on gate A when one of A's `outputs` matches one of B's
+  `inputs` globs (`**` spans directories), or when B lists A in `depends_on`
+- ready gates run concurrently (--jobs), each through
+  tools/run_with_timeout (log: out/run_contract/logs/<id>.txt)
+- a gate whose dependency did not succeed is `blocked`; a missing tool is
+  `missing` (both fail the run)
+- a gate with `inputs` is `skipped` when the sha256 of its inputs, its tool
+  directory and its contract entry match its last successful run and its
+  outputs are unchanged since (stamps in out/cache/stamps, or
+  $FCX_CACHE_DIR); gates without inputs always run
+- `outputs` may be globs; every file they match is stamped, and a glob
+  matching nothing counts as a missing output
+
+Options:
+- --gate <id>: run only these gates (repeatable) and what they depend on
+- --jobs N: concurrent gates (default: number of gates)
+- --seconds N: timeout for gates without `timeout_seconds` (default 600)
+- --timeout N: timeout for every gate, overriding `timeout_seconds` (e.g.
+  more headroom on slow release runners)
+- --force: run every selected gate even if unchanged
+- --no-cache: neither read nor record stamps
+- --list: print the gates in topological order with their dependencies
+
+Outputs:
+- out/run_contract/report.json
+- out/run_contract/logs/<id>.txt
+
+Determinism:
+- gates reported in contract order with status, exit code and dependencies;
+  no timings or timestamps
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import yaml
+
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.cache import FileHashCache, cache_root, is_fresh, record_stamp  # noqa: E402
+from fcx.util import sha256_text, stable_json, write_bytes_if_changed  # noqa: E402
+from tools.run_with_timeout.run import run_with_timeout  # noqa: E402
+
+
+TOOL_ID = "run_contract"
+TOOL_VERSION = "0.1.0"
+
+CONTRACT_REL = "ci/contract.yml"
+DEFAULT_SECONDS = 600
+
+
+def glob_regex(pattern: str) -> "re.Pattern[str]":
+    """Compile a repo-relative glob: `**` spans directories, `*`/`?` do not."""
+
+    out: List[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def load_contract(root: Path) -> List[Dict[str, Any]]:
+    path = root / CONTRACT_REL
+    try:
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    except (OSError, yaml.YAMLError) as e:
+        raise SystemExit(f"Failed to read {path}: {e}")
+    gates = data.get("gates") if isinstance(data, dict) else None
+    if not isinstance(gates, list):
+        raise SystemExit(f"{path}: expected a `gates` list")
+
+    seen: Set[str] = set()
+    for i, g in enumerate(gates):
+        if not isinstance(g, dict) or not isinstance(g.get("id"), str) or not isinstance(g.get("tool"), str):
+            raise SystemExit(f"{path}: gate {i} needs string id/tool")
+        for k in ("inputs", "outputs", "depends_on"):
+            v = g.get(k, [])
+            if not isinstance(v, list) or not all(isinstance(x, str) for x in v):
+                raise SystemExit(f"{path}: gate {g['id']}: {k} must be a list of strings")
+        if g["id"] in seen:
+            raise SystemExit(f"{path}: duplicate gate id: {g['id']}")
+        seen.add(g["id"])
+    return gates
+
+
+def infer_deps(gates: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Gate id -> ids of the gates it depends on (sorted)."""
+
+    ids = {g["id"] for g in gates}
+    deps: Dict[str, Set[str]] = {g["id"]: set() for g in gates}
+    for b in gates:
+        pats = [glob_regex(p) for p in b.get("inputs", [])]
+        for a in gates:
+            if a["id"] != b["id"] and any(r.match(o) for o in a.get("outputs", []) for r in pats):
+                deps[b["id"]].add(a["id"])
+        for d in b.get("depends_on", []):
+            if d not in ids:
+                raise SystemExit(f"{CONTRACT_REL}: gate {b['id']}: unknown dependency {d}")
+            deps[b["id"]].add(d)
+    return {k: sorted(v) for k, v in deps.items()}
+
+
+def topo_order(gates: List[Dict[str, Any]], deps: Dict[str, List[str]]) -> List[str]:
+    """Kahn's algorithm, ties broken by contract order; SystemExit on a cycle."""
+
+    order_ix = {g["id"]: i for i, g in enumerate(gates)}
+    indeg = {gid: len(d) for gid, d in deps.items()}
+    users: Dict[str, List[str]] = {gid: [] for gid in deps}
+    for gid, ds in deps.items():
+        for d in ds:
+            users[d].append(gid)
+    ready = sorted((gid for gid, n in indeg.items() if n == 0), key=order_ix.__getitem__)
+    out: List[str] = []
+    while ready:
+        gid = ready.pop(0)
+        out.append(gid)
+        for u in users[gid]:
+            indeg[u] -= 1
+            if indeg[u] == 0:
+                ready.append(u)
+        ready.sort(key=order_ix.__getitem__)
+    if len(out) != len(deps):
+        raise SystemExit(f"{CONTRACT_REL}: dependency cycle among: {', '.join(sorted(set(deps) - set(out)))}")
+    return out
+
+
+def _expand(root: Path, patterns: List[str]) -> List[Path]:
+    files: Set[Path] = set()
+    for pat in patterns:
+        # A trailing `**` means every file below (Path.glob would yield only directories).
+        if pat == "**" or pat.endswith("/**"):
+            pat += "/*"
+        for p in root.glob(pat):
+            if p.is_file() and "__pycache__" not in p.parts:
+                files.add(p)
+    return sorted(files)
+
+
+def _output_paths(root: Path, patterns: List[str]) -> List[Path]:
+    """Gate outputs as files: globs expanded, literal paths kept even if missing.
+
+    A glob matching nothing stays as its (nonexistent) path, so it never
+    counts as fresh.
+    """
+
+    out: List[Path] = []
+    for pat in patterns:
+        hits = _expand(root, [pat]) if any(c in pat for c in "*?[") else []
+        out.extend(hits or [root / pat])
+    return out
+
+
+def input_fingerprint(root: Path, gate: Dict[str, Any], hashes: FileHashCache) -> str:
+    """sha256 over the gate's contract entry, its tool directory and its input files."""
+
+    tool_dir = (root / gate["tool"]).parent
+    files = set(_expand(root, list(gate.get("inputs", []))))
+    files.update(p for p in tool_dir.rglob("*") if p.is_file() and "__pycache__" not in p.parts)
+    lines = [stable_json(gate)]
+    lines.extend(f"{p.relative_to(root).as_posix()}\0{hashes.sha256(p)}\n" for p in sorted(files))
+    return sha256_text("".join(lines))
+
+
+def run_gate(
+    root: Path, gate: Dict[str, Any], seconds: int, croot: Optional[Path], hashes: FileHashCache, force: bool
+) -> Tuple[str, Optional[int]]:
+    """(status, exit code) for one gate run with a `seconds` timeout.
+
+    Status: ok | failed | timeout | missing | skipped.
+    """
+
+    tool = root / gate["tool"]
+    if not tool.is_file():
+        return "missing", None
+    outputs = _output_paths(root, list(gate.get("outputs", [])))
+    stamp_tool = f"{TOOL_ID}/{gate['id']}"
+    stamp_root = croot if gate.get("inputs") else None
+    fp = input_fingerprint(root, gate, hashes) if stamp_root is not None else ""
+    if stamp_root is not None and not force and is_fresh(stamp_root, stamp_tool, TOOL_VERSION, fp, outputs):
+        return "skipped", None
+
+    log = root / "out" / TOOL_ID / "logs" / f"{gate['id']}.txt"
+    rc, _ = run_with_timeout([str(tool)], seconds, log, cwd=root)
+    if rc == 0:
+        if stamp_root is not None:
+            record_stamp(stamp_root, stamp_tool, TOOL_VERSION, fp, outputs)
+        return "ok", 0
+    return ("timeout" if rc == 124 else "failed"), rc
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--gate", action="append", default=[], help="run only this gate and its dependencies (repeatable)")
+    ap.add_argument("--jobs", type=int, default=0, help="concurrent gates (default: all)")
+    ap.add_argument("--seconds", type=int, default=DEFAULT_SECONDS, help="default per-gate timeout")
+    ap.add_argument("--timeout", type=int, default=0, help="timeout for every gate, overriding timeout_seconds")
+    ap.add_argument("--force", action="store_true", help="run gates even if their inputs are unchanged")
+    ap.add_argument("--no-cache", action="store_true", help="do not read or record stamps")
+    ap.add_argument("--list", action="store_true", help="print gates in topological order and exit")
+    args = ap.parse_args()
+    if args.jobs < 0 or args.seconds < 1 or args.timeout < 0:
+        ap.error("--jobs and --timeout must be >= 0 and --seconds >= 1")
+
+    root = REPO_ROOT
+    gates = load_contract(root)
+    by_id = {g["id"]: g for g in gates}
+    deps = infer_deps(gates)
+    order = topo_order(gates, deps)
+
+    selected = set(order)
+    if args.gate:
+        unknown = sorted(set(args.gate) - selected)
+        if unknown:
+            ap.error(f"unknown gate(s): {', '.join(unknown)}")
+        selected = set()
+        stack = list(args.gate)
+        while stack:
+            gid = stack.pop()
+            if gid not in selected:
+                selected.add(gid)
+                stack.extend(deps[gid])
+    order = [gid for gid in order if gid in selected]
+
+    if args.list:
+        for gid in order:
+            print(f"{gid}\t{by_id[gid]['tool']}\t{','.join(deps[gid]) or '-'}")
+        return 0
+
+    croot = None if args.no_cache else cache_root(root)
+    hashes = FileHashCache(croot)
+    results: Dict[str, Tuple[str, Optional[int]]] = {}
+    pending = list(order)
+    running: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=args.jobs or max(1, len(order))) as ex:
+        while pending or running:
+            # Start every gate whose dependencies have finished (block on failures).
+            for gid in list(pending):
+                if any(d not in results for d in deps[gid]):
+                    continue
+                pending.remove(gid)
+                if any(results[d][0] not in ("ok", "skipped") for d in deps[gid]):
+                    results[gid] = ("blocked", None)
+                    continue
+                seconds = args.timeout or int(by_id[gid].get("timeout_seconds") or args.seconds)
+                running[ex.submit(run_gate, root, by_id[gid], seconds, croot, hashes, args.force)] = gid
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                gid = running.pop(fut)
+                results[gid] = fut.result()
+                status, rc = results[gid]
+                print(f"{TOOL_ID}: {gid}: {status}" + (f" (exit {rc})" if status in ("failed", "timeout") else ""), file=sys.stderr)
+    hashes.save()
+
+    report_gates: List[Dict[str, Any]] = []
+    for g in gates:
+        if g["id"] not in selected:
+            continue
+        status, rc = results[g["id"]]
+        e: Dict[str, Any] = {"id": g["id"], "tool": g["tool"], "status": status, "depends_on": deps[g["id"]]}
+        if rc is not None:
+            e["exit_code"] = rc
+            e["log"] = f"out/{TOOL_ID}/logs/{g['id']}.txt"
+        report_gates.append(e)
+
+    ok = all(e["status"] in ("ok", "skipped") for e in report_gates)
+    report = {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "contract": CONTRACT_REL,
+        "ok": ok,
+        "gates": report_gates,
+    }
+    write_bytes_if_changed(
+        root / "out" / TOOL_ID / "report.json",
+        (json.dumps(report, indent=2, sort_keys=True) + "\n").encode("utf-8"),
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
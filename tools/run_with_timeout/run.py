@@ -22,6 +22,7 @@ import os
 import subprocess
 import sys
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 
 def tail_lines(s: str, n: int) -> str:
@@ -31,20 +32,12 @@ def tail_lines(s: str, n: int) -> str:
     return "\n".join(lines[-n:])
 
 
-def main() -> None:
-    ap = argparse.ArgumentParser(add_help=True)
-    ap.add_argument("--seconds", type=int, required=True)
-    ap.add_argument("--out", required=True)
-    ap.add_argument("--tail", type=int, default=80)
-    ap.add_argument("cmd", nargs=argparse.REMAINDER)
-    args = ap.parse_args()
+def run_with_timeout(cmd: List[str], seconds: int, out_path: Path, cwd: Optional[Path] = None) -> Tuple[int, str]:
+    """Run cmd non-interactively; write combined stdout/stderr to out_path.
 
-    if not args.cmd or args.cmd[0] != "--" or len(args.cmd) < 2:
-        print("Expected: -- <cmd> [args...]", file=sys.stderr)
-        sys.exit(2)
+    Returns (exit code, combined output); the exit code is 124 on timeout.
+    """
 
-    cmd = args.cmd[1:]
-    out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Ensure non-interactive defaults.
@@ -56,29 +49,43 @@ def main() -> None:
     try:
         p = subprocess.run(
             cmd,
-            cwd=os.getcwd(),
+            cwd=str(cwd) if cwd is not None else os.getcwd(),
             env=env,
             capture_output=True,
             text=True,
-            timeout=args.seconds,
+            timeout=seconds,
             check=False,
         )
         combined = (p.stdout or "") + (p.stderr or "")
-        out_path.write_text(combined, encoding="utf-8")
-        if combined.strip():
-            print(tail_lines(combined, args.tail))
-        sys.exit(p.returncode)
+        rc = p.returncode
     except subprocess.TimeoutExpired as e:
         combined = ""
         if e.stdout:
-            combined += e.stdout
+            combined += e.stdout if isinstance(e.stdout, str) else e.stdout.decode("utf-8", "replace")
         if e.stderr:
-            combined += e.stderr
-        combined += f"\n[run_with_timeout] TIMEOUT after {args.seconds}s: {' '.join(cmd)}\n"
-        out_path.write_text(combined, encoding="utf-8")
-        if combined.strip():
-            print(tail_lines(combined, args.tail))
-        sys.exit(124)
+            combined += e.stderr if isinstance(e.stderr, str) else e.stderr.decode("utf-8", "replace")
+        combined += f"\n[run_with_timeout] TIMEOUT after {seconds}s: {' '.join(cmd)}\n"
+        rc = 124
+    out_path.write_text(combined, encoding="utf-8")
+    return rc, combined
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(add_help=True)
+    ap.add_argument("--seconds", type=int, required=True)
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--tail", type=int, default=80)
+    ap.add_argument("cmd", nargs=argparse.REMAINDER)
+    args = ap.parse_args()
+
+    if not args.cmd or args.cmd[0] != "--" or len(args.cmd) < 2:
+        print("Expected: -- <cmd> [args...]", file=sys.stderr)
+        sys.exit(2)
+
+    rc, combined = run_with_timeout(args.cmd[1:], args.seconds, Path(args.out))
+    if combined.strip():
+        print(tail_lines(combined, args.tail))
+    sys.exit(rc)
 
 
 if __name__ == "__main__":
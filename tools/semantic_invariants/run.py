@@ -7,11 +7,29 @@ Structural changes (IDs, edges, kinds, statuses) are forbidden.
 
 Usage:
   tools/semantic_invariants/run.py --before <old.yml> --after <new.yml> [--verbose]
+  tools/semantic_invariants/run.py --rev-a <commit> --rev-b <commit> [--jobs N] [--no-cache] [--verbose]
 
 Exit codes:
   0 if invariants are preserved
   1 if structural changes detected
 
+Revision mode (--rev-a/--rev-b), no checkout:
+- changed frames (frames/**/frame.yml) come from one
+  `git diff-tree -r -M` between the two commits; renamed frames are
+  compared old path -> new path, added frames are listed, and deleted
+  frames are violations (`frame_removed`); a rename out of (into) the
+  frame paths counts as a deletion (addition)
+- both blob versions of every changed frame are read through a single
+  `git cat-file --batch` pipe
+- pairs are checked in parallel (--jobs processes, default: CPU count)
+- each side is summarised by its structural digest (`fcx.structure`,
+  cached under out/cache/structure or $FCX_CACHE_DIR; --no-cache to
+  bypass): equal roots clear a frame with one comparison, otherwise only
+  the changed header/edges/nodes are re-checked; roots and the changed
+  node ids are reported per frame
+- report: out/semantic_invariants/report.json (frames sorted by path; no
+  timestamps)
+
 Allowed changes:
 - text, summary, title (content only, not presence/absence)
 - text.format attribute
@@ -35,14 +53,26 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import subprocess
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 
+# Ensure repo root (tools/*) and py/ (fcx) are on sys.path.
 REPO_ROOT = Path(__file__).resolve().parents[2]
+for _p in (REPO_ROOT, REPO_ROOT / "py"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from fcx.cache import ContentCache, cache_root  # noqa: E402
+from fcx.structure import PROTECTED_NODE_FIELDS, StructuralDigest, cached_structural_digest  # noqa: E402
+from fcx.structure import diff_digests, structure_cache  # noqa: E402
 
 
 def read_yaml(path: Path) -> Any:
@@ -52,17 +82,8 @@ def read_yaml(path: Path) -> Any:
 # Fields that are safe to modify for readability
 SAFE_TEXT_FIELDS = {"text", "summary", "title", "label", "desc"}
 
-# Fields that MUST NOT change
-PROTECTED_FIELDS = {
-    "graph_id",
-    "version",
-    "id",
-    "kind",
-    "status",
-    "profile",
-    "law_id",
-    "law_version",
-}
+# Fields that MUST NOT change (shared with the structural digest's node hash)
+PROTECTED_FIELDS = set(PROTECTED_NODE_FIELDS)
 
 
 @dataclass
@@ -84,7 +105,7 @@ def check_protected_fields(before_node: Dict[str, Any], after_node: Dict[str, An
     violations: List[Violation] = []
     nid = normalize_node_id(before_node)
 
-    for field in PROTECTED_FIELDS:
+    for field in sorted(PROTECTED_FIELDS):
         before_val = before_node.get(field)
         after_val = after_node.get(field)
         if before_val != after_val:
@@ -126,7 +147,7 @@ def check_text_format_attrs(before_node: Dict[str, Any], after_node: Dict[str, A
             Violation(
                 code="attrs_added",
                 frame_path="(node-level)",
-                details=f"node {nid}: new attrs {added}",
+                details=f"node {nid}: new attrs {sorted(added, key=str)}",
             )
         )
 
@@ -135,7 +156,7 @@ def check_text_format_attrs(before_node: Dict[str, Any], after_node: Dict[str, A
             Violation(
                 code="attrs_removed",
                 frame_path="(node-level)",
-                details=f"node {nid}: removed attrs {removed}",
+                details=f"node {nid}: removed attrs {sorted(removed, key=str)}",
             )
         )
 
@@ -190,7 +211,7 @@ def check_node_ids(before_data: Dict[str, Any], after_data: Dict[str, Any]) -> L
             Violation(
                 code="nodes_added",
                 frame_path="(frame-level)",
-                details=f"new nodes: {added}",
+                details=f"new nodes: {sorted(added)}",
             )
         )
 
@@ -199,7 +220,7 @@ def check_node_ids(before_data: Dict[str, Any], after_data: Dict[str, Any]) -> L
             Violation(
                 code="nodes_removed",
                 frame_path="(frame-level)",
-                details=f"removed nodes: {removed}",
+                details=f"removed nodes: {sorted(removed)}",
             )
         )
 
@@ -208,72 +229,307 @@ def check_node_ids(before_data: Dict[str, Any], after_data: Dict[str, Any]) -> L
 
 def compare_frames(before_path: Path, after_path: Path) -> List[Violation]:
     """Compare two frame.yml files for semantic invariance."""
+
+    try:
+        before_text = before_path.read_text(encoding="utf-8")
+        after_text = after_path.read_text(encoding="utf-8")
+    except Exception as e:
+        return [Violation(code="parse_error", frame_path=str(before_path), details=str(e))]
+    return compare_texts(before_text, after_text, str(before_path))
+
+
+def compare_texts(before_text: str, after_text: str, label: str) -> List[Violation]:
+    """Compare two frame.yml texts for semantic invariance (`label` names the frame)."""
+
+    violations, _, _ = compare_sources(before_text.encode("utf-8"), after_text.encode("utf-8"), label)
+    return violations
+
+
+def compare_sources(
+    before_src: bytes, after_src: bytes, label: str, cache: Optional[ContentCache] = None
+) -> Tuple[List[Violation], Optional[StructuralDigest], Optional[StructuralDigest]]:
+    """(violations, before digest, after digest) for two frame.yml sources.
+
+    Structural digests (`fcx.structure`) hash exactly the fields checked
+    below, so equal roots clear the pair without further work, and a
+    differing root only re-checks the parts whose hashes differ. Digests
+    come from `cache` when given, so unchanged frames are not parsed.
+    """
+
     violations: List[Violation] = []
 
     try:
-        before_data = read_yaml(before_path)
-        after_data = read_yaml(after_path)
+        before_digest, before_data = cached_structural_digest(before_src, cache)
+        after_digest, after_data = cached_structural_digest(after_src, cache)
     except Exception as e:
         violations.append(
             Violation(
                 code="parse_error",
-                frame_path=str(before_path),
+                frame_path=label,
                 details=str(e),
             )
         )
-        return violations
+        return violations, None, None
 
-    if not isinstance(before_data, dict) or not isinstance(after_data, dict):
+    if before_digest is None or after_digest is None:
         violations.append(
             Violation(
                 code="not_mapping",
-                frame_path=str(before_path),
+                frame_path=label,
                 details="frame is not a YAML mapping",
             )
         )
-        return violations
+        return violations, before_digest, after_digest
+
+    diff = diff_digests(before_digest, after_digest)
+    if diff.unchanged:
+        return violations, before_digest, after_digest
+
+    # Digests served from the cache carry no parsed frame.
+    if before_data is None:
+        before_data = yaml.safe_load(before_src.decode("utf-8"))
+    if after_data is None:
+        after_data = yaml.safe_load(after_src.decode("utf-8"))
 
     # Check top-level fields
-    for field in ["graph_id", "version"]:
-        if before_data.get(field) != after_data.get(field):
-            violations.append(
-                Violation(
-                    code=f"frame_field_changed_{field}",
-                    frame_path=str(before_path),
-                    details=f"{field} changed",
+    if diff.header_changed:
+        for field in ["graph_id", "version"]:
+            if before_data.get(field) != after_data.get(field):
+                violations.append(
+                    Violation(
+                        code=f"frame_field_changed_{field}",
+                        frame_path=label,
+                        details=f"{field} changed",
+                    )
                 )
-            )
 
     # Check nodes
-    violations.extend(check_node_ids(before_data, after_data))
+    if diff.nodes_added or diff.nodes_removed:
+        violations.extend(check_node_ids(before_data, after_data))
 
     # Check edges
-    violations.extend(check_edges(before_data, after_data))
+    if diff.edges_changed:
+        violations.extend(check_edges(before_data, after_data))
 
-    # Check each node
+    # Check each node whose digest changed
     def nodes_by_id(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         nodes = data.get("nodes", [])
         return {normalize_node_id(n): n for n in nodes if isinstance(n, dict)}
 
+    changed = set(diff.nodes_changed)
     before_nodes = nodes_by_id(before_data)
     after_nodes = nodes_by_id(after_data)
 
     for nid in before_nodes:
-        if nid not in after_nodes:
+        if nid not in changed or nid not in after_nodes:
             continue
         violations.extend(check_protected_fields(before_nodes[nid], after_nodes[nid]))
         violations.extend(check_text_format_attrs(before_nodes[nid], after_nodes[nid]))
 
-    return violations
+    return violations, before_digest, after_digest
+
+
+# -------------------------
+# Revision mode
+# -------------------------
+
+TOOL_ID = "semantic_invariants"
+TOOL_VERSION = "0.3.0"
+
+NULL_SHA = "0" * 40
+
+
+@dataclass(frozen=True)
+class FrameChange:
+    """One changed frame between two commits (blob shas; NULL_SHA when absent)."""
+
+    status: str  # modified | renamed | added | deleted
+    path: str  # path at rev-b (rev-a for deleted)
+    before_path: str
+    before_sha: str
+    after_sha: str
+
+
+def _git(root: Path, *args: str) -> bytes:
+    try:
+        return subprocess.run(["git", *args], cwd=str(root), capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise SystemExit(f"git {' '.join(args)} failed: {e.stderr.decode('utf-8', 'replace').strip()}")
+
+
+def resolve_commit(root: Path, rev: str) -> str:
+    return _git(root, "rev-parse", "--verify", f"{rev}^{{commit}}").decode("utf-8").strip()
+
+
+def is_frame_path(path: str) -> bool:
+    return path.startswith("frames/") and path.endswith("/frame.yml")
+
+
+def changed_frames(root: Path, rev_a: str, rev_b: str) -> List[FrameChange]:
+    """Changed frame blobs between two commits, from one `git diff-tree -r -z -M`."""
+
+    raw = _git(root, "diff-tree", "-r", "-z", "-M", rev_a, rev_b)
+    fields = raw.decode("utf-8").split("\0")
+    out: List[FrameChange] = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        # :<mode_a> <mode_b> <sha_a> <sha_b> <status>\0<path>[\0<path_b>]
+        _, mode_b, sha_a, sha_b, status = fields[i][1:].split(" ")
+        if status[0] in "RC":
+            src, dst = fields[i + 1], fields[i + 2]
+            i += 3
+        else:
+            src = dst = fields[i + 1]
+            i += 2
+        if status[0] == "R":
+            # A rename into or out of the frame set is an addition or a deletion.
+            if is_frame_path(src) and is_frame_path(dst):
+                out.append(FrameChange("renamed", dst, src, sha_a, sha_b))
+            elif is_frame_path(src):
+                out.append(FrameChange("deleted", src, src, sha_a, NULL_SHA))
+            elif is_frame_path(dst):
+                out.append(FrameChange("added", dst, "", NULL_SHA, sha_b))
+        elif not is_frame_path(dst):
+            continue
+        elif status[0] == "M" or (status[0] == "T" and mode_b != "160000"):
+            out.append(FrameChange("modified", dst, src, sha_a, sha_b))
+        elif status[0] in "AC":
+            out.append(FrameChange("added", dst, src if status[0] == "C" else "", NULL_SHA, sha_b))
+        elif status[0] == "D":
+            out.append(FrameChange("deleted", src, src, sha_a, NULL_SHA))
+    return sorted(out, key=lambda c: c.path)
+
+
+def cat_blobs(root: Path, shas: List[str]) -> Dict[str, bytes]:
+    """Read blobs through a single `git cat-file --batch` process.
+
+    Requests are written from a helper thread while replies are parsed, so
+    neither side of the pipe can fill up and stall.
+    """
+
+    todo = sorted(set(shas) - {NULL_SHA})
+    out: Dict[str, bytes] = {}
+    if not todo:
+        return out
+    proc = subprocess.Popen(
+        ["git", "cat-file", "--batch"], cwd=str(root), stdin=subprocess.PIPE, stdout=subprocess.PIPE
+    )
+    stdin, stdout = proc.stdin, proc.stdout
+    assert stdin is not None and stdout is not None
+
+    def feed() -> None:
+        try:
+            stdin.write("".join(f"{sha}\n" for sha in todo).encode("ascii"))
+        finally:
+            stdin.close()
+
+    writer = threading.Thread(target=feed)
+    writer.start()
+    try:
+        for _ in todo:
+            header = stdout.readline().decode("ascii").split()
+            if len(header) != 3:
+                raise SystemExit(f"git cat-file: {' '.join(header)}")
+            sha, _, size = header
+            out[sha] = stdout.read(int(size))
+            stdout.read(1)  # trailing newline
+    finally:
+        writer.join()
+        stdout.close()
+        proc.wait()
+    return out
+
+
+def check_change(change: FrameChange, before: bytes, after: bytes, cache: Optional[ContentCache] = None) -> Dict[str, Any]:
+    """Report entry for one changed frame."""
+
+    e: Dict[str, Any] = {"path": change.path, "status": change.status}
+    if change.status == "renamed":
+        e["before_path"] = change.before_path
+    before_digest: Optional[StructuralDigest] = None
+    after_digest: Optional[StructuralDigest] = None
+    if change.status == "added":
+        violations: List[Violation] = []
+    elif change.status == "deleted":
+        violations = [Violation(code="frame_removed", frame_path=change.path, details="frame deleted")]
+    else:
+        violations, before_digest, after_digest = compare_sources(before, after, change.path, cache)
+    e["violations"] = [{"code": v.code, "details": v.details} for v in violations]
+    if before_digest is not None and after_digest is not None:
+        diff = diff_digests(before_digest, after_digest)
+        e["structure"] = {
+            "before": before_digest.root,
+            "after": after_digest.root,
+            "nodes_changed": sorted(set(diff.nodes_changed) | set(diff.nodes_added) | set(diff.nodes_removed)),
+        }
+    return e
+
+
+def compare_revisions(
+    root: Path, rev_a: str, rev_b: str, *, jobs: int, cache: Optional[ContentCache] = None
+) -> Dict[str, Any]:
+    commit_a = resolve_commit(root, rev_a)
+    commit_b = resolve_commit(root, rev_b)
+    changes = changed_frames(root, commit_a, commit_b)
+    blobs = cat_blobs(root, [sha for c in changes for sha in (c.before_sha, c.after_sha)])
+
+    args = [(c, blobs.get(c.before_sha, b""), blobs.get(c.after_sha, b""), cache) for c in changes]
+    if jobs > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            frames = list(ex.map(check_change, *zip(*args), chunksize=max(1, len(args) // (jobs * 4))))
+    else:
+        frames = [check_change(*a) for a in args]
+
+    return {
+        "tool": {"id": TOOL_ID, "version": TOOL_VERSION},
+        "rev_a": commit_a,
+        "rev_b": commit_b,
+        "ok": all(not f["violations"] for f in frames),
+        "frames": frames,
+    }
+
+
+def main_revisions(args: argparse.Namespace) -> int:
+    cache = None if args.no_cache else structure_cache(cache_root(REPO_ROOT))
+    report = compare_revisions(REPO_ROOT, args.rev_a, args.rev_b, jobs=args.jobs, cache=cache)
+    out_path = REPO_ROOT / "out" / TOOL_ID / "report.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    bad = [f for f in report["frames"] if f["violations"]]
+    if not bad:
+        if args.verbose:
+            print(f"✓ Semantic invariants preserved ({len(report['frames'])} changed frame(s))")
+        return 0
+
+    n = sum(len(f["violations"]) for f in bad)
+    print(f"✗ {n} semantic invariant violation(s) in {len(bad)} frame(s):", file=sys.stderr)
+    for f in bad:
+        for v in f["violations"]:
+            print(f"  {f['path']}: [{v['code']}] {v['details']}", file=sys.stderr)
+    return 1
 
 
 def main() -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--before", required=True)
-    ap.add_argument("--after", required=True)
+    ap.add_argument("--before")
+    ap.add_argument("--after")
+    ap.add_argument("--rev-a", help="base commit (revision mode)")
+    ap.add_argument("--rev-b", help="head commit (revision mode)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="check processes (revision mode)")
+    ap.add_argument("--no-cache", action="store_true", help="do not read or write structural digests (revision mode)")
     ap.add_argument("--verbose", action="store_true")
     args = ap.parse_args()
 
+    if args.rev_a or args.rev_b:
+        if not (args.rev_a and args.rev_b) or args.before or args.after:
+            ap.error("use --rev-a with --rev-b (and without --before/--after)")
+        if args.jobs < 1:
+            ap.error("--jobs must be >= 1")
+        return main_revisions(args)
+    if not (args.before and args.after):
+        ap.error("--before and --after are required (or --rev-a/--rev-b)")
+
     before_path = Path(args.before)
     after_path = Path(args.after)
 